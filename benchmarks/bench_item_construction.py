@@ -0,0 +1,47 @@
+"""
+Items per second wrapping server records, as get_all_purchase_order_items
+does, before (deepcopy of ITEM_TEMPLATE, then update) and after.
+
+    python benchmarks/bench_item_construction.py [number of records]
+"""
+import copy
+import sys
+import timeit
+
+from oclc_wrappers.acquisitions import Item
+from oclc_wrappers.constants import ITEM_TEMPLATE
+
+
+def server_record(number):
+    record = copy.deepcopy(ITEM_TEMPLATE)
+    record.update({'orderItemNumber': 'PO-2018-1_{}'.format(number), 'orderingPrice': 25.0, 'quantity': 1})
+    record['resource']['worldcatResource'].update({'oclcNumber': str(320842055 + number),
+                                                   'title': 'Beethoven', 'author': ['William Kinderman']})
+    record['copyConfigs']['copyConfig'][0]['booking'][0].update({'budgetAccountCode': 'MUSIC', 'percentage': 100})
+    return record
+
+
+def deepcopy_construction(auth, data):
+    # How Item.__init__ used to build its data
+    item = copy.deepcopy(ITEM_TEMPLATE)
+    item.update(data)
+    return item
+
+
+def rate(label, func, records, repeat=5):
+    best = min(timeit.repeat(func, number=1, repeat=repeat))
+    print('{:<40} {:>12,.0f} items/s'.format(label, len(records) / best))
+
+
+def main(count):
+    records = [server_record(n) for n in range(count)]
+    # fresh dicts per run, as they would come out of r.json()
+    copies = [[dict(record) for record in records] for _ in range(5)]
+    rate('before: deepcopy(ITEM_TEMPLATE) + update', lambda: [deepcopy_construction(None, r) for r in records], records)
+    rate('Item(auth, record)', lambda: [Item(None, r) for r in records], records)
+    if hasattr(Item, 'from_data'):
+        rate('Item.from_data(auth, record)', lambda: [Item.from_data(None, r) for r in copies.pop()], records, repeat=5)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000)
@@ -0,0 +1,45 @@
+"""
+Records per second summarizing raw MARCXML with worldcat.summarize, for
+1 worker process (parsing in this process) up to one per CPU.
+
+    python benchmarks/bench_parse_pool.py [number of records] [--marcxml FILE] [--workers 1,2,4,8]
+
+Scaling only shows with as many CPUs as workers, and with records big
+enough to outweigh sending them between processes; use --marcxml with a
+real collection, see corpus.py.
+"""
+import argparse
+import multiprocessing
+import time
+
+from corpus import add_arguments, corpus
+from oclc_wrappers.worldcat import summarize
+
+
+def worker_counts(cpus):
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    return counts
+
+
+def main(records, counts):
+    cpus = multiprocessing.cpu_count()
+    print('{} CPUs'.format(cpus))
+    baseline = None
+    for workers in counts:
+        start = time.time()
+        summarize(records, max_workers=workers)
+        rate = len(records) / (time.time() - start)
+        baseline = baseline or rate
+        print('{:>3} workers {:>10,.0f} records/s  {:.1f}x{}'.format(
+            workers, rate, rate / baseline, '  (more workers than CPUs)' if workers > cpus else ''))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    add_arguments(parser, 20000)
+    parser.add_argument('--workers', type=lambda value: [int(count) for count in value.split(',')],
+                        help='comma separated worker counts, default 1, 2, 4... up to the number of CPUs')
+    args = parser.parse_args()
+    main(corpus(args, 20000), args.workers or worker_counts(multiprocessing.cpu_count()))
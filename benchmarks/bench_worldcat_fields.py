@@ -0,0 +1,85 @@
+"""
+Records per second parsing WorldCat MARCXML and reading ten fields from
+each, before (one namespaced search of the whole tree per field) and after
+(fields indexed by tag at parse time).
+
+    python benchmarks/bench_worldcat_fields.py [number of records] [--marcxml FILE]
+
+Without --marcxml it runs on copies of the small sample record, see
+corpus.py. Fields a record lacks are read as None either way.
+"""
+import argparse
+import re
+import timeit
+import xml.etree.ElementTree as ET
+
+from corpus import add_arguments, corpus
+from oclc_wrappers.worldcat import WorldcatResource
+
+FIELDS = ('oclc_number', 'cataloging_language', 'control_field_008', 'publisher', 'publication_date',
+          'title', 'authors', 'isbn', 'isbn_10s', 'id_code')
+NS = '{http://www.loc.gov/MARC21/slim}'
+
+
+def before(xml):
+    # How WorldcatResource used to read its fields
+    root = ET.fromstring(xml)
+
+    def find(elem, parent=None):
+        if parent is not None:
+            return parent.find('./{ns}{elem}'.format(ns=NS, elem=elem))
+        return root.find('.//{ns}{elem}'.format(ns=NS, elem=elem))
+
+    def isbn_10s():
+        found = []
+        for field in root.findall('.//{ns}datafield[@tag="020"]'.format(ns=NS)):
+            try:
+                found.append(re.search(re.compile(r'^\d{10}$'), find('subfield[@code="a"]', field).text).group())
+            except AttributeError:
+                pass
+        return found
+
+    publisher = find('datafield[@tag="260"]')
+    if publisher is None:
+        publisher = find('datafield[@tag="264"]')
+    title = find('datafield[@tag="245"]')
+    return [missing_is_none(read) for read in (
+        lambda: find('controlfield[@tag="001"]').text,
+        lambda: find('subfield[@code="b"]', find('datafield[@tag="040"]')).text,
+        lambda: find('controlfield[@tag="008"]').text,
+        lambda: find('subfield[@code="b"]', publisher).text,
+        lambda: re.search(re.compile(r'\d+'), find('subfield[@code="c"]', publisher).text).group(),
+        lambda: find('subfield[@code="a"]', title).text,
+        lambda: find('subfield[@code="c"]', title).text,
+        lambda: isbn_10s()[:1],
+        isbn_10s,
+        lambda: isbn_10s()[:1])]
+
+
+def after(xml):
+    record = WorldcatResource(None, xml)
+    return [missing_is_none(lambda: getattr(record, name)) for name in FIELDS]
+
+
+def missing_is_none(read):
+    try:
+        return read()
+    except (AttributeError, TypeError):
+        return None
+
+
+def rate(label, func, records, repeat=3):
+    best = min(timeit.repeat(lambda: [func(record) for record in records], number=1, repeat=repeat))
+    print('{:<45} {:>10,.0f} records/s'.format(label, len(records) / best))
+
+
+def main(records):
+    rate('parse only', ET.fromstring, records)
+    rate('before: parse + 10 fields, tree search each', before, records)
+    rate('after: parse + 10 fields, tag index', after, records)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    add_arguments(parser, 5000)
+    main(corpus(parser.parse_args(), 5000))
@@ -0,0 +1,61 @@
+"""
+Records per second for each installed XML backend: parsing alone, parsing
+and reading ten fields through the tag index, and parsing and running path
+queries through WorldcatResource.find.
+
+    python benchmarks/bench_xml_backends.py [number of records] [--marcxml FILE]
+
+Without --marcxml it runs on copies of the small sample record, see
+corpus.py.
+"""
+import argparse
+import timeit
+
+from corpus import add_arguments, corpus
+from oclc_wrappers.worldcat import WorldcatResource
+from oclc_wrappers.xmlbackend import ElementTreeBackend, LxmlBackend, lxml_etree
+
+FIELDS = ('oclc_number', 'cataloging_language', 'control_field_008', 'publisher', 'publication_date',
+          'title', 'authors', 'isbn', 'isbn_10s', 'id_code')
+QUERIES = ('controlfield[@tag="001"]', 'controlfield[@tag="008"]', 'datafield[@tag="040"]',
+           'datafield[@tag="245"]', 'datafield[@tag="260"]', 'datafield[@tag="264"]', 'datafield[@tag="020"]')
+
+
+def fields(xml):
+    record = WorldcatResource(None, xml)
+    return [getattr(record, name, None) for name in FIELDS]
+
+
+def queries(xml):
+    record = WorldcatResource(None, xml)
+    return [record.find(query) for query in QUERIES]
+
+
+def run(func, records):
+    # Results are dropped straight away, as a streaming job would
+    for record in records:
+        func(record)
+
+
+def rate(label, func, records, repeat=5):
+    best = min(timeit.repeat(lambda: run(func, records), number=1, repeat=repeat))
+    print('{:<40} {:>10,.0f} records/s'.format(label, len(records) / best))
+
+
+def main(records):
+    backends = [ElementTreeBackend()]
+    if lxml_etree is not None:
+        backends.append(LxmlBackend())
+    else:
+        print('lxml is not installed, only ElementTree is measured')
+    for backend in backends:
+        WorldcatResource.backend = backend
+        rate('{}: parse'.format(backend.name), backend.fromstring, records)
+        rate('{}: parse + 10 fields'.format(backend.name), fields, records)
+        rate('{}: parse + 7 path queries'.format(backend.name), queries, records)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    add_arguments(parser, 5000)
+    main(corpus(parser.parse_args(), 5000))
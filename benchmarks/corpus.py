@@ -0,0 +1,58 @@
+"""
+Records for the benchmarks: those of a MARCXML file given with --marcxml,
+or numbered copies of the test suite's sample record.
+
+The sample record is small (about 11 KB, 50 fields) and every copy is
+alike, so figures measured on it say little about the large records real
+jobs parse. Quote numbers measured on a real collection, e.g. a saved
+WorldCat SRU response or a MARCXML export from the ILS.
+"""
+import itertools
+import os
+import re
+import xml.etree.ElementTree as ET
+
+SAMPLE = os.path.join(os.path.dirname(__file__), '..', 'oclc_wrappers', 'tests', 'resourceXml.xml')
+RECORD = '{http://www.loc.gov/MARC21/slim}record'
+FIELD = re.compile(br'<(?:\w+:)?(?:control|data)field\b')
+
+
+def add_arguments(parser, count):
+    parser.add_argument('count', nargs='?', type=int,
+                        help='number of records, default {} copies of the sample or every record in '
+                             'the file'.format(count))
+    parser.add_argument('--marcxml', metavar='FILE',
+                        help='a MARCXML collection (or any document holding MARC records) to use '
+                             'instead of the sample record')
+
+
+def marcxml_records(path):
+    """Every MARC record in a file, serialized on its own, in file order."""
+    records = []
+    for _, element in ET.iterparse(path):
+        if element.tag == RECORD:
+            records.append(ET.tostring(element))
+            element.clear()
+    return records
+
+
+def corpus(args, default_count):
+    """The records a benchmark runs on, described on stdout."""
+    if args.marcxml is not None:
+        records = marcxml_records(args.marcxml)
+        if not records:
+            raise SystemExit('No MARC records in {}'.format(args.marcxml))
+        if args.count is not None:
+            records = list(itertools.islice(itertools.cycle(records), args.count))
+        source = args.marcxml
+    else:
+        with open(SAMPLE, 'rb') as f:
+            sample = f.read()
+        records = [sample.replace(b'>320842055<', '>{}<'.format(320842055 + n).encode('ascii'))
+                   for n in range(args.count or default_count)]
+        source = 'copies of the sample record, not representative of large records'
+    size = sum(len(record) for record in records) / float(len(records))
+    fields = sum(len(FIELD.findall(record)) for record in records) / float(len(records))
+    print('{:,} records from {}'.format(len(records), source))
+    print('{:,.1f} KB and {:,.0f} fields per record on average\n'.format(size / 1024, fields))
+    return records
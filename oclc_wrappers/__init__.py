@@ -1,8 +1,20 @@
 import oclc_wrappers.acquisitions
 import oclc_wrappers.auth
+import oclc_wrappers.cache
+import oclc_wrappers.codec
 import oclc_wrappers.constants
+import oclc_wrappers.export
+import oclc_wrappers.fundtree
 import oclc_wrappers.kb
+import oclc_wrappers.localdb
 import oclc_wrappers.oclc_exceptions
+import oclc_wrappers.paging
+import oclc_wrappers.pipeline
+import oclc_wrappers.ratelimit
+import oclc_wrappers.recordstore
 import oclc_wrappers.requestor
+import oclc_wrappers.retry
 import oclc_wrappers.urlmanager
+import oclc_wrappers.validation
 import oclc_wrappers.worldcat
+import oclc_wrappers.xmlbackend
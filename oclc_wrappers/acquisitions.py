@@ -1,22 +1,128 @@
 import copy
+import pickle
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 
+from requests.exceptions import RequestException
+
+from .codec import compact
 from .oclc_exceptions import RequestError
+from .paging import prefetching
 from .requestor import HMACRequest
+from .validation import split_items
 from .constants import PO_TEMPLATE, ITEM_TEMPLATE, ITEM_FUND_FIELDS, PO_URLS, ITEM_URLS, FUND_URLS
 
+DEFAULT_PAGE_SIZE = 10
+# Pages fetched at once when listing PO items or searching funds
+PAGE_WORKERS = 4
+# Items posted at once by attach_items_to_order
+ATTACH_WORKERS = 4
 
-class PurchaseOrder(object):
 
-    def __init__(self, auth, *args, **kwargs):
-        self._data = copy.deepcopy(PO_TEMPLATE)
-        self._data.update(*args, **kwargs)
-        self.auth = auth
+def from_template(template, data):
+    """
+    Fill in the template's defaults for every key data doesn't have, in
+    place. Same result as deep copying the template and updating it with
+    data, but only the defaults actually used are copied.
+    """
+    for key, default in template.items():
+        if key not in data:
+            data[key] = copy.deepcopy(default) if isinstance(default, (dict, list)) else default
+    return data
+
+
+class Tracked(object):
+    """
+    Keep track of which top level fields of a server record have changed
+    since it was loaded, so saving an unchanged record can be skipped.
+
+    Subclasses declare a '_loaded' slot, holding None for records not loaded
+    yet, True for records untouched since they were loaded, or a pickled
+    snapshot of the data as the server last sent it. The snapshot is only
+    taken by _changing(), when the data is about to be changed or a part of
+    it that could be changed is handed out, so reading a record costs
+    nothing.
+    """
+
+    __slots__ = ()
 
     def __getitem__(self, item):
-        return self._data[item]
+        value = self._data[item]
+        if isinstance(value, (dict, list)):
+            self._changing()
+        return value
 
     def __setitem__(self, key, value):
-        self._data[key] = value
+        self._changing()[key] = value
+
+    @property
+    def changed_fields(self):
+        """Top level fields that differ from the server's copy, all of them if never loaded."""
+        if self._loaded is None:
+            return sorted(self._data)
+        if self._loaded is True:
+            return []
+        loaded = pickle.loads(self._loaded)
+        return sorted(key for key in set(loaded) | set(self._data)
+                      if loaded.get(key) != self._data.get(key))
+
+    @property
+    def is_dirty(self):
+        return bool(self.changed_fields)
+
+    def compact(self):
+        """The data with every empty field left out, as it is sent when created in WMS."""
+        return compact(self._data)
+
+    def mark_clean(self):
+        """Take the current data as the server's copy."""
+        self._loaded = True
+
+    def _changing(self):
+        """The data, for code about to change it, snapshotting the server's copy first."""
+        if self._loaded is True:
+            self._loaded = pickle.dumps(self._data, pickle.HIGHEST_PROTOCOL)
+        return self._data
+
+    def _replace_data(self, data):
+        """Swap in the server's copy of the record, or keep ours if the server sent none back."""
+        if data is not None and data is not self._data:
+            self._data.clear()
+            self._data.update(data)
+        self.mark_clean()
+
+
+class PurchaseOrder(Tracked):
+    """
+    Represent a purchase order as a Python object.
+
+    The order's items are downloaded on first use of po_items and kept,
+    attaching items through the order (attach_item, attach_items,
+    Item.attach_to_order(po)) forgets them again, as does refresh().
+
+    Changes are tracked against the server's copy, save() only sends the
+    order if something changed.
+
+    :arg auth - An Auth object that implements HMAC authentication
+    """
+
+    __slots__ = ('_data', 'auth', '_items', '_loaded')
+
+    def __init__(self, auth, *args, **kwargs):
+        self._data = from_template(PO_TEMPLATE, dict(*args, **kwargs))
+        self.auth = auth
+        self._items = None
+        self._loaded = None
+
+    @classmethod
+    def from_data(cls, auth, data):
+        """Wrap server data the caller hands over, e.g. parsed JSON, without copying it."""
+        po = cls.__new__(cls)
+        po._data = from_template(PO_TEMPLATE, data)
+        po.auth = auth
+        po._items = None
+        po.mark_clean()
+        return po
 
     @property
     def vendor_id(self):
@@ -24,7 +130,7 @@ class PurchaseOrder(object):
 
     @vendor_id.setter
     def vendor_id(self, val):
-        self._data['vendor']['vendorId'] = val
+        self._changing()['vendor']['vendorId'] = val
 
     @property
     def vendor_local_id(self):
@@ -32,7 +138,7 @@ class PurchaseOrder(object):
 
     @vendor_local_id.setter
     def vendor_local_id(self, val):
-        self._data['vendor']['localIdentifier'] = val
+        self._changing()['vendor']['localIdentifier'] = val
 
     @property
     def name(self):
@@ -40,7 +146,7 @@ class PurchaseOrder(object):
 
     @name.setter
     def name(self, val):
-        self._data['orderName'] = val
+        self._changing()['orderName'] = val
 
     @property
     def number(self):
@@ -48,18 +154,68 @@ class PurchaseOrder(object):
 
     @property
     def po_items(self):
-        return get_all_purchase_order_items(self.auth, self._data['purchaseOrderNumber'])
+        if self._items is None:
+            self._items = get_all_purchase_order_items(self.auth, self.number)
+        return self._items
+
+    def iter_items(self):
+        """
+        Yield the order's items, fetching pages only as they are reached.
+        A complete pass leaves po_items loaded.
+        """
+        if self._items is not None:
+            for item in self._items:
+                yield item
+            return
+        loaded = []
+        for item in iter_purchase_order_items(self.auth, self.number):
+            loaded.append(item)
+            yield item
+        self._items = loaded
+
+    def refresh(self):
+        """Forget the loaded items, the next use of po_items downloads them again."""
+        self._items = None
+
+    def attach_item(self, item):
+        """Attach an Item to this order, updating it with the server's copy."""
+        item.attach_to_order(self)
+
+    def attach_items(self, items, max_workers=ATTACH_WORKERS, validate=False):
+        """Attach many items to this order concurrently, see attach_items_to_order."""
+        result = attach_items_to_order(self.auth, self.number, items, max_workers=max_workers,
+                                       validate=validate)
+        self.refresh()
+        return result
 
     def create_in_wms(self):
         r = send_purchase_order(self.auth, self._data)
-        self._data.clear()
-        self._data.update(r.json())
+        self._replace_data(_decode(r))
+        self.refresh()
+
+    def save(self):
+        """
+        Send the order to WMS if it changed since it was loaded.
+
+        :return: True if it was sent, False if there was nothing to save
+        """
+        if not self.is_dirty:
+            return False
+        if self.number is None:
+            raise ValueError('Purchase order has not been created in WMS yet')
+        r = update_purchase_order(self.auth, self.number, self._data)
+        self._replace_data(_json_or(r, None))
+        return True
 
     def delete(self):
         delete_purchase_order(self.auth, self.number)
+        self.refresh()
 
+    def submit(self):
+        submit_purchase_order(self.auth, self.number)
 
-class Item(object):
+
+class Item(Tracked):
     """
     Represent a purchase order item as a Python object.
 
@@ -83,23 +239,31 @@ class Item(object):
     Price:
         self.price = self._data['orderingPrice']
 
+    Changes are tracked against the server's copy, save() only sends the
+    item if something changed.
+
     :arg auth - An Auth object that implements HMAC authentication
     """
 
+    __slots__ = ('_data', 'auth', '_loaded')
+
     def __init__(self, auth, *args, **kwargs):
-        self._data = copy.deepcopy(ITEM_TEMPLATE)
-        self._data.update(*args, **kwargs)
+        self._data = from_template(ITEM_TEMPLATE, dict(*args, **kwargs))
         self.auth = auth
+        self._loaded = None
 
-    def __getitem__(self, item):
-        return self._data[item]
-
-    def __setitem__(self, key, value):
-        self._data[key] = value
+    @classmethod
+    def from_data(cls, auth, data):
+        """Wrap server data the caller hands over, e.g. parsed JSON, without copying it."""
+        item = cls.__new__(cls)
+        item._data = from_template(ITEM_TEMPLATE, data)
+        item.auth = auth
+        item.mark_clean()
+        return item
 
     @property
     def copies(self):
-        return self._data['copyConfigs']['copyConfig']
+        return self._changing()['copyConfigs']['copyConfig']
 
     @property
     def first_copy(self):
@@ -111,7 +275,7 @@ class Item(object):
 
     @property
     def first_fund_code(self):
-        return self.first_fund['budgetAccountCode']
+        return _first_fund(self._data)['budgetAccountCode']
 
     @first_fund_code.setter
     def first_fund_code(self, val):
@@ -119,7 +283,7 @@ class Item(object):
 
     @property
     def first_percentage(self):
-        return self.first_fund['percentage']
+        return _first_fund(self._data)['percentage']
 
     @first_percentage.setter
     def first_percentage(self, val):
@@ -127,7 +291,7 @@ class Item(object):
 
     @property
     def first_copy_branch(self):
-        return self.first_copy['branchId']
+        return _copies(self._data)[0]['branchId']
 
     @first_copy_branch.setter
     def first_copy_branch(self, val):
@@ -135,7 +299,7 @@ class Item(object):
 
     @property
     def first_copy_shelving(self):
-        return self.first_copy['shelvingLocationId']
+        return _copies(self._data)[0]['shelvingLocationId']
 
     @first_copy_shelving.setter
     def first_copy_shelving(self, val):
@@ -147,15 +311,15 @@ class Item(object):
 
     @order_type.setter
     def order_type(self, val):
-        self._data['orderType'] = val
+        self._changing()['orderType'] = val
 
     @property
     def worldcat(self):
-        return self._data['resource']['worldcatResource']
+        return self._changing()['resource']['worldcatResource']
 
     @property
     def oclc_number(self):
-        return self.worldcat['oclcNumber']
+        return _worldcat(self._data)['oclcNumber']
 
     @oclc_number.setter
     def oclc_number(self, val):
@@ -167,15 +331,15 @@ class Item(object):
 
     @price.setter
     def price(self, val):
-        self._data['orderingPrice'] = val
+        self._changing()['orderingPrice'] = val
 
     @property
     def title(self):
-        return self.worldcat['title']
+        return _worldcat(self._data)['title']
 
     @property
     def author(self):
-        return ', '.join(x for x in self.worldcat['author'])
+        return ', '.join(x for x in _worldcat(self._data)['author'])
 
     @property
     def vendor_item_number(self):
@@ -183,7 +347,11 @@ class Item(object):
 
     @vendor_item_number.setter
     def vendor_item_number(self, val):
-        self._data['vendorOrderItemNumber'] = val
+        self._changing()['vendorOrderItemNumber'] = val
+
+    @property
+    def order_item_number(self):
+        return self._data['orderItemNumber']
 
     @property
     def notes(self):
@@ -191,21 +359,42 @@ class Item(object):
 
     @property
     def has_multiple_copies(self):
-        return len(self.copies) > 1
+        return len(_copies(self._data)) > 1
 
     def attach_to_order(self, order):
-        new_item = attach_item_to_order(self.auth, order, self._data)
-        self._data.clear()
-        self._data.update(new_item._data)
+        """
+        :param order: A purchase order number, or a PurchaseOrder whose
+            loaded items are then refreshed
+        """
+        number = getattr(order, 'number', order)
+        new_item = attach_item_to_order(self.auth, number, self._data)
+        self._replace_data(new_item._data)
+        if isinstance(order, PurchaseOrder):
+            order.refresh()
+
+    def save(self, order):
+        """
+        Send the item to WMS if it changed since it was loaded.
+
+        :param order: The number of the purchase order the item is on
+        :return: True if it was sent, False if there was nothing to save
+        """
+        if not self.is_dirty:
+            return False
+        if self.order_item_number is None:
+            raise ValueError('Item has not been attached to an order yet')
+        r = update_item(self.auth, getattr(order, 'number', order), self.order_item_number, self._data)
+        self._replace_data(_json_or(r, None))
+        return True
 
     def add_isbn(self, isbn):
         self.worldcat['isbn'].append(isbn)
 
     def add_note(self, note):
-        self._data['notes']['note'].append({'content': note, 'type': 'STAFF', 'alert': 'NONE'})
+        self._changing()['notes']['note'].append({'content': note, 'type': 'STAFF', 'alert': 'NONE'})
 
     def add_notes(self, *args):
-        self._data['notes']['note'] = [{'content': note, 'type': 'STAFF', 'alert': 'NONE'}
+        self._changing()['notes']['note'] = [{'content': note, 'type': 'STAFF', 'alert': 'NONE'}
                                        for note in args if note]
 
     def add_fund(self, copy_data=None, **kwargs):
@@ -223,19 +412,19 @@ class Item(object):
 
     def fund_index_by_code(self, code, copy_data=None):
         copy_index = self._get_copy_index(copy_data)
-        for index, fund in enumerate(self.copies[copy_index]['booking']):
+        for index, fund in enumerate(_copies(self._data)[copy_index]['booking']):
             if fund['budgetAccountCode'] == code:
                 return index
         raise KeyError
 
     def copy_index_by_number(self, number=None):
-        for index, copy_data in enumerate(self.copies):
+        for index, copy_data in enumerate(_copies(self._data)):
             if copy_data['copyConfigNumber'] == number:
                 return index
         raise KeyError
 
     def add_copy(self, **kwargs):
-        self._data['copyConfigs']['copyConfig'].append(self._new_copy(**kwargs))
+        self.copies.append(self._new_copy(**kwargs))
         return len(self.copies) - 1
 
     def all_copies_same_branch(self, branch_id):
@@ -279,8 +468,22 @@ class Item(object):
             raise KeyError
 
 
+def _copies(data):
+    return data['copyConfigs']['copyConfig']
+
+
+def _first_fund(data):
+    return _copies(data)[0]['booking'][0]
+
+
+def _worldcat(data):
+    return data['resource']['worldcatResource']
+
+
 class Budget(object):
 
+    __slots__ = ('_data',)
+
     def __init__(self, *args, **kwargs):
         self._data = dict(*args, **kwargs)
 
@@ -293,6 +496,8 @@ class Budget(object):
 
 class Fund(object):
 
+    __slots__ = ('_data', 'auth')
+
     def __init__(self, auth, *args, **kwargs):
         self._data = dict(*args, **kwargs)
         self.auth = auth
@@ -331,20 +536,24 @@ class Fund(object):
     def id(self):
         return self._data['allocation']['allocation']['id']
 
+    @property
+    def parent_id(self):
+        return self._data.get('parentFundId')
+
     def _get_price(self, price_type):
         return self._data['allocation']['allocation'][price_type]['priceSpecification']['price']
 
 
-def po_request(auth):
-    return HMACRequest(auth, PO_URLS)
+def po_request(auth, **kwargs):
+    return HMACRequest(auth, PO_URLS, **kwargs)
 
 
-def item_request(auth):
-    return HMACRequest(auth, ITEM_URLS)
+def item_request(auth, **kwargs):
+    return HMACRequest(auth, ITEM_URLS, **kwargs)
 
 
-def fund_request(auth):
-    return HMACRequest(auth, FUND_URLS)
+def fund_request(auth, **kwargs):
+    return HMACRequest(auth, FUND_URLS, **kwargs)
 
 
 def get_purchase_order(auth, po_number):
@@ -352,14 +561,23 @@ def get_purchase_order(auth, po_number):
     url_params = {'order': po_number}
     r = requestor.send_request('read', url_params=url_params)
     check_status_code(r, (200,))
-    return PurchaseOrder(auth, r.json())
+    return PurchaseOrder.from_data(auth, requestor.decode(r))
+
+
+def get_all_purchase_order_items(auth, po_number, page_size=DEFAULT_PAGE_SIZE, max_workers=PAGE_WORKERS):
+    requestor = item_request(auth)
+    url_params = {'order': po_number}
+    items = get_all_records(requestor, 'list', url_params=url_params,
+                            page_size=page_size, max_workers=max_workers)
+    return [Item.from_data(auth, item) for item in items]
 
 
-def get_all_purchase_order_items(auth, po_number):
+def iter_purchase_order_items(auth, po_number, page_size=DEFAULT_PAGE_SIZE):
+    """Yield every Item on a purchase order, one page in memory at a time."""
     requestor = item_request(auth)
     url_params = {'order': po_number}
-    items = get_all_records(requestor, 'list', url_params=url_params)
-    return [Item(auth, item) for item in items]
+    for item in iter_all_records(requestor, 'list', url_params=url_params, page_size=page_size):
+        yield Item.from_data(auth, item)
 
 
 def create_purchase_order(auth, name, vendor_id, **kwargs):
@@ -375,7 +593,7 @@ def create_purchase_order(auth, name, vendor_id, **kwargs):
 
 def send_purchase_order(auth, po):
     requestor = po_request(auth)
-    r = requestor.send_request('create', data=po)
+    r = requestor.send_request('create', data=compact(po))
     check_status_code(r, (201,), po)
     return r
 
@@ -386,17 +604,164 @@ def delete_purchase_order(auth, order):
     check_status_code(r, (200,))
 
 
-# TODO: Implement
-def update_purchase_order(auth, po_number):
-    pass
+def submit_purchase_order(auth, order):
+    requestor = po_request(auth)
+    r = requestor.send_request('submit', url_params={'order': order})
+    check_status_code(r, (200, 201, 204))
+
+
+def update_purchase_order(auth, po_number, po):
+    requestor = po_request(auth)
+    r = requestor.send_request('update', url_params={'order': po_number}, data=po)
+    check_status_code(r, (200, 204), po)
+    return r
+
+
+def update_item(auth, order, item_number, item):
+    requestor = item_request(auth)
+    r = requestor.send_request('update', url_params={'order': order, 'item': item_number}, data=item)
+    check_status_code(r, (200, 204), item)
+    return r
+
+
+def save_items(auth, order, items, max_workers=ATTACH_WORKERS):
+    """
+    Save the items that changed since they were loaded, concurrently.
+    Unchanged items cost no request and are listed in result.skipped; a
+    failing item is recorded in the result and never stops the rest. Items
+    never attached to an order fail with a ValueError without being sent.
+
+    :param auth: An Auth object that implements HMAC authentication
+    :param order: The purchase order number
+    :param items: An iterable of Item objects
+    :param max_workers: Number of items sent at once
+
+    :return: A BatchResult, with the saved items under created
+    """
+    result = BatchResult()
+    dirty = []
+    for index, item in enumerate(items):
+        if item.order_item_number is None:
+            result.failed.append(Failed(index, item, ValueError('Item has not been attached to an order yet')))
+        elif item.is_dirty:
+            dirty.append((index, item))
+        else:
+            result.skipped.append(Created(index, item))
+
+    def save(indexed_item):
+        index, item = indexed_item
+        try:
+            item.save(order)
+        except (RequestError, RequestException) as e:
+            return Failed(index, item, e)
+        return Created(index, item)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for outcome in pool.map(save, dirty):
+            if isinstance(outcome, Failed):
+                result.failed.append(outcome)
+            else:
+                result.created.append(outcome)
+    return result
+
+
+def _decode(response):
+    """Decode a body from a helper that only hands back the response, with the default codec."""
+    return HMACRequest.codec.decode(response.content)
+
+
+def _json_or(response, default):
+    """The decoded body, or default if there is none or it isn't JSON."""
+    if not response.content:
+        return default
+    try:
+        return _decode(response)
+    except ValueError:
+        return default
 
 
 def attach_item_to_order(auth, order, item):
     requestor = item_request(auth=auth)
     url_params = {'order': order}
-    r = requestor.send_request('create', url_params=url_params, data=item)
+    r = requestor.send_request('create', url_params=url_params, data=compact(item))
     check_status_code(r, (201,), item)
-    return Item(auth, r.json())
+    return Item.from_data(auth, requestor.decode(r))
+
+
+Created = namedtuple('Created', 'index item')
+Failed = namedtuple('Failed', 'index item error')
+
+
+class BatchResult(object):
+    """
+    The outcome of a bulk operation, in the order the items were given.
+
+    created: Created(index, item) for every success, item being the
+        server's copy with its new orderItemNumber
+    failed: Failed(index, item, error) for every failure, error being the
+        RequestError (or connection error) it raised, or the
+        ValidationError (or ValueError) for items rejected before sending
+    skipped: Created(index, item) for items that needed no request
+    """
+
+    def __init__(self):
+        self.created = []
+        self.failed = []
+        self.skipped = []
+
+    @property
+    def ok(self):
+        return not self.failed
+
+    @property
+    def order_item_numbers(self):
+        return [created.item.order_item_number for created in self.created]
+
+    def __repr__(self):
+        return '<BatchResult created={} failed={}>'.format(len(self.created), len(self.failed))
+
+
+def attach_items_to_order(auth, order, items, max_workers=ATTACH_WORKERS, validate=False):
+    """
+    Attach many items to a purchase order concurrently. A failing item is
+    recorded in the result and never stops the rest of the batch.
+
+    Item objects are updated in place with the server's copy, like
+    Item.attach_to_order.
+
+    :param auth: An Auth object that implements HMAC authentication
+    :param order: The purchase order number
+    :param items: An iterable of Item objects or item dicts
+    :param max_workers: Number of items posted at once
+    :param validate: Check every item locally first; items WMS would
+        reject fail with a ValidationError and are never sent
+
+    :return: A BatchResult
+    """
+    def attach(indexed_item):
+        index, item = indexed_item
+        try:
+            new_item = attach_item_to_order(auth, order, getattr(item, '_data', item))
+        except (RequestError, RequestException) as e:
+            return Failed(index, item, e)
+        if isinstance(item, Item):
+            item._replace_data(new_item._data)
+            new_item = item
+        return Created(index, new_item)
+
+    result = BatchResult()
+    if validate:
+        items, invalid = split_items(items)
+        result.failed.extend(Failed(*reject) for reject in invalid)
+    else:
+        items = enumerate(items)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for outcome in pool.map(attach, items):
+            if isinstance(outcome, Failed):
+                result.failed.append(outcome)
+            else:
+                result.created.append(outcome)
+    return result
 
 
 def get_fund(auth, inst_id, fund, budget=None):
@@ -407,17 +772,28 @@ def get_fund(auth, inst_id, fund, budget=None):
     url_params = {'inst_id': inst_id, 'fund': fund, 'budget': budget}
     r = requestor.send_request(action, url_params=url_params)
     check_status_code(r, (200,))
-    return Fund(auth, r.json())
+    return Fund(auth, requestor.decode(r))
 
 
-def search_funds(auth, inst_id, budget=None, parent=None):
+def search_funds(auth, inst_id, budget=None, parent=None, page_size=DEFAULT_PAGE_SIZE, max_workers=PAGE_WORKERS):
     requestor = fund_request(auth)
     query_params = _set_fund_query(budget, parent)
     url_params = {'inst_id': inst_id}
-    funds = get_all_records(requestor, 'search', url_params=url_params, query_params=query_params)
+    funds = get_all_records(requestor, 'search', url_params=url_params, query_params=query_params,
+                            page_size=page_size, max_workers=max_workers)
     return [Fund(auth, fund) for fund in funds]
 
 
+def iter_funds(auth, inst_id, budget=None, parent=None, page_size=DEFAULT_PAGE_SIZE):
+    """Yield every Fund matching a search, one page in memory at a time."""
+    requestor = fund_request(auth)
+    query_params = _set_fund_query(budget, parent)
+    url_params = {'inst_id': inst_id}
+    for fund in iter_all_records(requestor, 'search', url_params=url_params, query_params=query_params,
+                                 page_size=page_size):
+        yield Fund(auth, fund)
+
+
 def _set_fund_query(budget, parent):
     if budget is not None:
         return {'q': 'budgetPeriod:{budget}'.format(budget=budget)}
@@ -431,22 +807,93 @@ def all_records_retrieved(total_records, starting_index):
     return total_records < starting_index
 
 
-def get_all_records(requestor, action, url_params=None, query_params=None):
+def get_all_records(requestor, action, url_params=None, query_params=None,
+                    page_size=DEFAULT_PAGE_SIZE, max_workers=1):
+    """
+    Page through every record for a search or list action.
+
+    The first page's totalResults decides which pages are left, and with
+    max_workers above 1 those are fetched concurrently on a thread pool.
+    Records are always returned in page order.
+
+    :param requestor: A Requestor set up with the action's URLs
+    :param action: Action corresponding to URLs in OCLC's web service documentation
+    :param url_params: Parameters to be filled in in the base URL
+    :param query_params: Parameters to add to a query string
+    :param page_size: Number of records to ask for per page
+    :param max_workers: Number of pages to fetch at once
+
+    :return: A list of record dicts
+    """
     if query_params is None:
         query_params = {}
-    query_params.update({'startIndex': 1})
-    all_items = []
-    while True:
-        r = requestor.send_request(action, url_params=url_params, query_params=query_params)
-        check_status_code(r, (200,))
-        elems = r.json()
-        all_items.extend(elems['entry'])
-        query_params['startIndex'] += 10
-        if all_records_retrieved(int(elems['totalResults']), query_params['startIndex']):
-            break
+    first_page = _get_page(requestor, action, url_params, query_params, 1, page_size)
+    all_items = list(first_page['entry'])
+    start_indexes = remaining_page_starts(int(first_page['totalResults']),
+                                          len(first_page['entry']) or page_size)
+
+    def get_page(start_index):
+        return _get_page(requestor, action, url_params, query_params, start_index, page_size)
+
+    if max_workers > 1 and len(start_indexes) > 1:
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            pages = list(pool.map(get_page, start_indexes))
+    else:
+        pages = (get_page(start_index) for start_index in start_indexes)
+    for page in pages:
+        all_items.extend(page['entry'])
     return all_items
 
 
+def iter_all_records(requestor, action, url_params=None, query_params=None,
+                     page_size=DEFAULT_PAGE_SIZE, prefetch=True):
+    """
+    Yield every record for a search or list action page by page, so a
+    result set of any size can be processed in constant memory.
+
+    Takes the same arguments as get_all_records. With prefetch, the next
+    page is requested in the background while the current one is consumed.
+    """
+    if query_params is None:
+        query_params = {}
+    pages = _iter_pages(requestor, action, url_params, query_params, page_size)
+    if prefetch:
+        pages = prefetching(pages)
+    for page in pages:
+        for record in page:
+            yield record
+
+
+def _iter_pages(requestor, action, url_params, query_params, page_size):
+    first_page = _get_page(requestor, action, url_params, query_params, 1, page_size)
+    start_indexes = remaining_page_starts(int(first_page['totalResults']),
+                                          len(first_page['entry']) or page_size)
+    yield first_page['entry']
+    del first_page
+    for start_index in start_indexes:
+        yield _get_page(requestor, action, url_params, query_params, start_index, page_size)['entry']
+
+
+def remaining_page_starts(total_records, page_size):
+    """
+    The startIndex of every page after the first. The step is what the
+    server actually returned on the first page, in case it capped page_size.
+    """
+    start_indexes = []
+    start_index = 1 + page_size
+    while not all_records_retrieved(total_records, start_index):
+        start_indexes.append(start_index)
+        start_index += page_size
+    return start_indexes
+
+
+def _get_page(requestor, action, url_params, query_params, start_index, page_size):
+    params = dict(query_params, startIndex=start_index, itemsPerPage=page_size)
+    r = requestor.send_request(action, url_params=url_params, query_params=params)
+    check_status_code(r, (200,))
+    return requestor.decode(r)
+
+
 def check_status_code(request, correct_codes, attempt=None):
     if request.status_code not in correct_codes:
         raise RequestError(request.content, attempt=attempt)
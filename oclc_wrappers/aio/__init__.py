@@ -0,0 +1,8 @@
+"""
+Asyncio counterparts of the requestors and helpers, requires Python 3.5+
+and aiohttp (pip install oclc-wrappers[async]).
+"""
+import oclc_wrappers.aio.acquisitions
+import oclc_wrappers.aio.kb
+import oclc_wrappers.aio.requestor
+import oclc_wrappers.aio.worldcat
@@ -0,0 +1,113 @@
+import asyncio
+
+from ..acquisitions import (PurchaseOrder, Item, Fund, DEFAULT_PAGE_SIZE, check_status_code,
+                            remaining_page_starts, _set_fund_query)
+from ..codec import compact
+from ..constants import PO_URLS, ITEM_URLS, FUND_URLS
+from .requestor import AsyncHMACRequest
+
+
+def po_request(auth, **kwargs):
+    return AsyncHMACRequest(auth, PO_URLS, **kwargs)
+
+
+def item_request(auth, **kwargs):
+    return AsyncHMACRequest(auth, ITEM_URLS, **kwargs)
+
+
+def fund_request(auth, **kwargs):
+    return AsyncHMACRequest(auth, FUND_URLS, **kwargs)
+
+
+async def get_purchase_order(auth, po_number, transport=None):
+    requestor = po_request(auth, transport=transport)
+    url_params = {'order': po_number}
+    r = await requestor.send_request('read', url_params=url_params)
+    check_status_code(r, (200,))
+    return PurchaseOrder.from_data(auth, requestor.decode(r))
+
+
+async def get_all_purchase_order_items(auth, po_number, transport=None):
+    requestor = item_request(auth, transport=transport)
+    url_params = {'order': po_number}
+    items = await get_all_records(requestor, 'list', url_params=url_params)
+    return [Item.from_data(auth, item) for item in items]
+
+
+async def create_purchase_order(auth, name, vendor_id, transport=None, **kwargs):
+    po = PurchaseOrder(auth)
+    po.name = name
+    po.vendor_id = vendor_id
+    if kwargs:
+        for key, val in kwargs.items():
+            po[key] = val
+    r = await send_purchase_order(auth, po._data, transport=transport)
+    po._replace_data(AsyncHMACRequest.codec.decode(r.content))
+    return po
+
+
+async def send_purchase_order(auth, po, transport=None):
+    requestor = po_request(auth, transport=transport)
+    r = await requestor.send_request('create', data=compact(po))
+    check_status_code(r, (201,), po)
+    return r
+
+
+async def delete_purchase_order(auth, order, transport=None):
+    requestor = po_request(auth, transport=transport)
+    r = await requestor.send_request('delete', url_params={'order': order})
+    check_status_code(r, (200,))
+
+
+async def attach_item_to_order(auth, order, item, transport=None):
+    requestor = item_request(auth, transport=transport)
+    url_params = {'order': order}
+    r = await requestor.send_request('create', url_params=url_params, data=compact(item))
+    check_status_code(r, (201,), item)
+    return Item.from_data(auth, requestor.decode(r))
+
+
+async def get_fund(auth, inst_id, fund, budget=None, transport=None):
+    action = 'read'
+    if budget is not None:
+        action = 'by_fund_number'
+    requestor = fund_request(auth, transport=transport)
+    url_params = {'inst_id': inst_id, 'fund': fund, 'budget': budget}
+    r = await requestor.send_request(action, url_params=url_params)
+    check_status_code(r, (200,))
+    return Fund(auth, requestor.decode(r))
+
+
+async def search_funds(auth, inst_id, budget=None, parent=None, transport=None):
+    requestor = fund_request(auth, transport=transport)
+    query_params = _set_fund_query(budget, parent)
+    url_params = {'inst_id': inst_id}
+    funds = await get_all_records(requestor, 'search', url_params=url_params, query_params=query_params)
+    return [Fund(auth, fund) for fund in funds]
+
+
+async def get_all_records(requestor, action, url_params=None, query_params=None,
+                          page_size=DEFAULT_PAGE_SIZE):
+    """
+    Fetch the first page, then every remaining page concurrently (bounded by
+    the transport's concurrency cap), returning the records in order.
+    """
+    if query_params is None:
+        query_params = {}
+    first_page = await _get_page(requestor, action, url_params, query_params, 1, page_size)
+    start_indexes = remaining_page_starts(int(first_page['totalResults']),
+                                          len(first_page['entry']) or page_size)
+    pages = await asyncio.gather(*[_get_page(requestor, action, url_params, query_params,
+                                             start_index, page_size)
+                                   for start_index in start_indexes])
+    all_items = list(first_page['entry'])
+    for page in pages:
+        all_items.extend(page['entry'])
+    return all_items
+
+
+async def _get_page(requestor, action, url_params, query_params, start_index, page_size):
+    params = dict(query_params, startIndex=start_index, itemsPerPage=page_size)
+    r = await requestor.send_request(action, url_params=url_params, query_params=params)
+    check_status_code(r, (200,))
+    return requestor.decode(r)
@@ -0,0 +1,158 @@
+import asyncio
+import collections
+
+from .. import kb
+from ..oclc_exceptions import CollectionNotFound, NoKbart
+from .requestor import get_default_transport
+
+
+class KB(kb.KB):
+    """
+    Read and represent data from OCLC's knowledge base without blocking.
+
+    Same API as kb.KB, but every method that talks to OCLC is a coroutine.
+    """
+    def __init__(self, wskey, transport=None):
+        """
+        Set the default parameters for KB API requests.
+
+        Args:
+            wskey: WSKey to send with every request
+            transport: An aio.requestor.AsyncTransport to send requests
+                through, defaults to the shared one
+        """
+        self._defaults = {'alt': 'json', 'wskey': wskey}
+        self._transport = transport
+
+    @property
+    def transport(self):
+        if self._transport is None:
+            return get_default_transport()
+        return self._transport
+
+    async def search_collections(self, search_term, options=None):
+        """
+        Search the knowledge base for a specific collection.
+
+        Args:
+            search_term: Main search term to search by
+            options: Dict of secondary options
+
+        Returns:
+            A dict containing the search results
+        """
+        payload = self._get_payload(options)
+        payload['q'] = search_term
+
+        r = await self.transport.get(self.collection_search_url, params=payload)
+        return r.json()
+
+    async def get_collection(self, collection_id, options=None):
+        """
+        Return a dict representing a knowledge base collection.
+
+        Args:
+            collection_id: OCLC collection id as a string
+            options: Dict of secondary options
+        Returns:
+            Dict representing the collection
+        Raises:
+            CollectionNotFound: If no collection with collection_id exists
+        """
+        payload = self._get_payload(options)
+        url = '{0}{1}'.format(self.collection_base_url, collection_id)
+        r = await self.transport.get(url, params=payload)
+        if r.status_code == 200:
+            return r.json()
+        else:
+            raise CollectionNotFound
+
+    async def get_all_entries(self, collection_id, options=None):
+        """
+        Retrieve all entries from a given collection.
+        'collection_uid' and 'itemsPerPage' are set automatically,
+        adjusting through in the options dict is not advises.
+        Args:
+            collection_id: OCLC collection id as a string
+            options: Dict of secondary options
+        Returns:
+            A list of dicts of the collection entries
+        """
+        records = []
+        async for entry in self.iter_entries(collection_id, options, prefetch=False):
+            records.append(entry)
+        return records
+
+    def iter_entries(self, collection_id, options=None, prefetch=True):
+        """
+        Iterate with async for over every entry from a given collection,
+        holding one page at a time so collections of any size can be
+        processed in constant memory.
+        Args:
+            collection_id: OCLC collection id as a string
+            options: Dict of secondary options
+            prefetch: Fetch the next page in the background while the
+                current one is being consumed
+        Returns:
+            An asynchronous iterator of dicts of the collection entries
+        """
+        return _Entries(self, collection_id, options, prefetch)
+
+    async def download_collection_kbart(self,
+                                        collection_id,
+                                        filename):
+        """
+        Download a copy of a collection's KBART file.
+        Files will (should) be saved as a UTF-8 encoded tsv file.
+        Args:
+            collection_id: OCLC collection id as a string
+            filename: Path and name with which to save the file
+        Raises:
+            NoKbart: If a link to the KBART file is not found
+        """
+        collection = await self.get_collection(collection_id)
+        for link in collection['links']:
+            if link['rel'] == 'enclosure':
+                url = link['href']
+                break
+        else:
+            raise NoKbart
+        await self.transport.download(url, filename, params=self._defaults)
+
+
+class _Entries(object):
+    """The entries of a collection, fetched a page at a time as async for asks for them."""
+
+    def __init__(self, kb, collection_id, options, prefetch):
+        self._kb = kb
+        self._payload = kb._get_payload(options)
+        self._payload.update({'collection_uid': collection_id,
+                              'itemsPerPage': 50})
+        self._prefetch = prefetch
+        self._start_index = 1
+        self._entries = collections.deque()
+        self._next_page = None
+        self._done = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._entries:
+            if self._done:
+                raise StopAsyncIteration
+            if self._next_page is not None:
+                page, self._next_page = await self._next_page, None
+            else:
+                page = await self._fetch(self._start_index)
+            self._entries.extend(page)
+            self._start_index += 50
+            self._done = len(page) < 50
+            if self._prefetch and not self._done:
+                self._next_page = asyncio.ensure_future(self._fetch(self._start_index))
+        return self._entries.popleft()
+
+    async def _fetch(self, start_index):
+        params = dict(self._payload, startIndex=start_index)
+        r = await self._kb.transport.get(self._kb.entry_search_url, params=params)
+        return r.json()['entries']
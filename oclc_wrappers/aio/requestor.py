@@ -0,0 +1,220 @@
+import asyncio
+import json
+
+import aiohttp
+
+from ..codec import default_codec
+from ..urlmanager import Urls
+
+
+class Response(object):
+    """
+    A fully read response, exposing the parts of a Requests response the
+    rest of the library relies on (status_code, headers, content, json()).
+    """
+
+    def __init__(self, status_code, headers, content, url):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+        self.url = url
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class AsyncTransport(object):
+    """
+    A pooled aiohttp session plus a cap on how many requests are in flight,
+    shared between every async requestor given it.
+
+    The session is created on first use, from inside a coroutine, so a
+    transport can be built outside of a running event loop. It then belongs
+    to that loop.
+    """
+
+    def __init__(self, max_concurrency=10, limit_per_host=10, keep_alive=True):
+        """
+        :param max_concurrency: Maximum number of requests in flight at once
+        :param limit_per_host: Maximum number of open connections per host
+        :param keep_alive: Reuse connections between requests
+        """
+        self.max_concurrency = max_concurrency
+        self.limit_per_host = limit_per_host
+        self.keep_alive = keep_alive
+        self.loop = None
+        self._session = None
+        self._semaphore = None
+
+    @property
+    def closed(self):
+        return self._session is not None and self._session.closed
+
+    @property
+    def session(self):
+        if self._session is None:
+            self.loop = _running_loop()
+            connector = aiohttp.TCPConnector(limit_per_host=self.limit_per_host,
+                                             force_close=not self.keep_alive)
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def request(self, http_verb, url, **kwargs):
+        """Send a request and read its body, returning a Response."""
+        session = self.session
+        async with self._semaphore:
+            async with session.request(http_verb, url, **kwargs) as r:
+                content = await r.read()
+                return Response(r.status, r.headers, content, str(r.url))
+
+    async def get(self, url, **kwargs):
+        return await self.request('GET', url, **kwargs)
+
+    async def download(self, url, filename, params=None, chunk_size=1024):
+        """Stream the body of a GET request into a file."""
+        session = self.session
+        async with self._semaphore:
+            async with session.get(url, params=params) as r:
+                with open(filename, 'wb') as f:
+                    async for chunk in r.content.iter_chunked(chunk_size):
+                        f.write(chunk)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+_default_transport = None
+
+
+def _running_loop():
+    # get_event_loop() outside of a running loop is deprecated, and
+    # get_running_loop() only exists from 3.7
+    get_running_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+    return get_running_loop()
+
+
+def get_default_transport():
+    """
+    Return the async transport shared by requestors that weren't given one.
+    A new one is made if the previous one was closed or belongs to another
+    event loop. Call it from a coroutine, requestors do so when they send.
+    """
+    global _default_transport
+    loop = _running_loop()
+    if (_default_transport is None or _default_transport.closed or
+            _default_transport.loop not in (None, loop)):
+        _default_transport = AsyncTransport()
+    return _default_transport
+
+
+def set_default_transport(transport):
+    """Replace the shared async transport, e.g. with a higher concurrency cap."""
+    global _default_transport
+    _default_transport = transport
+
+
+class AsyncRequestor(object):
+    """
+    Base for async requestors. Without a transport of their own they send
+    through the shared one for the event loop they're used in, looked up
+    when a request is sent, so they can be built outside of a running loop.
+    """
+
+    codec = default_codec()
+
+    def __init__(self, auth, urls, transport=None, codec=None):
+        self.auth = auth
+        self.url = Urls(urls)
+        self._transport = transport
+        if codec is not None:
+            self.codec = codec
+
+    @property
+    def transport(self):
+        if self._transport is None:
+            return get_default_transport()
+        return self._transport
+
+    async def send_request(self, action, url_params=None, query_params=None, data=None):
+        raise NotImplementedError
+
+    def decode(self, response):
+        """Decode a JSON response body with the requestor's codec."""
+        return self.codec.decode(response.content)
+
+
+class AsyncHMACRequest(AsyncRequestor):
+
+    def __init__(self, auth, urls, transport=None, codec=None):
+        """
+        :param auth: An authorization object built from auth.py
+        :param urls: A dict of urls with a url and verb property, see constants.py
+        :param transport: An AsyncTransport to send requests through, defaults
+            to the shared one from get_default_transport
+        :param codec: A codec.JSONCodec or codec.OrjsonCodec, defaults to
+            AsyncRequestor.codec
+        """
+        super(AsyncHMACRequest, self).__init__(auth, urls, transport=transport, codec=codec)
+
+    async def send_request(self, action, url_params=None, query_params=None, data=None):
+        """
+        Send a request to a specified OCLC Web Service.
+
+        :param action: Action corresponding to URLs in OCLC's web service documentation
+        :param url_params: Parameters to be filled in in the base URL
+        :param query_params: Parameters to add to a query string
+        :param data: Any data that needs to be sent in the body of the request
+
+        :return: A Response object
+        """
+        url = self.url.get_url(action,
+                               url_params,
+                               params=query_params)
+        http_verb = self.url.get_http_verb(action)
+        r = await self.transport.request(http_verb,
+                                         url,
+                                         data=self.codec.encode(data) if data is not None else None,
+                                         headers=self.auth.get_header(http_verb, url))
+        self.auth.set_etag(r)
+        return r
+
+
+class AsyncWSKeyLiteRequest(AsyncRequestor):
+
+    def __init__(self, auth, urls, transport=None):
+        """
+        :param auth: An authorization object built from auth.py
+        :param urls: A dict of urls with a url and verb property, see constants.py
+        :param transport: An AsyncTransport to send requests through, defaults
+            to the shared one from get_default_transport
+        """
+        super(AsyncWSKeyLiteRequest, self).__init__(auth, urls, transport=transport)
+
+    async def send_request(self, action, url_params=None, query_params=None, data=None):
+        """
+        Send a request to a specified OCLC Web Service.
+
+        :param action: Action corresponding to URLs in OCLC's web service documentation
+        :param url_params: Parameters to be filled in in the base URL
+        :param query_params: Parameters to add to a query string
+        :param data: Any data that needs to be sent in the body of the request
+
+        :return: A Response object
+        """
+        if query_params is None:
+            query_params = {}
+        query_params.update({'wskey': self.auth.key})
+        url = self.url.get_url(action, url_params, params=query_params)
+        return await self.transport.get(url)
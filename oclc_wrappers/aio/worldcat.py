@@ -0,0 +1,59 @@
+import asyncio
+
+from ..constants import WORLDCAT_RESOURCE_URLS, WORLDCAT_LIBRARY_URLS
+from ..worldcat import WorldcatResource, WorldcatHoldings
+from .requestor import AsyncWSKeyLiteRequest
+
+
+def worldcat_request(auth, **kwargs):
+    return AsyncWSKeyLiteRequest(auth, WORLDCAT_RESOURCE_URLS, **kwargs)
+
+
+def worldcat_library_request(auth, **kwargs):
+    return AsyncWSKeyLiteRequest(auth, WORLDCAT_LIBRARY_URLS, **kwargs)
+
+
+async def get_resource_by_isbn(auth, isbn, query_params=None, transport=None):
+    if query_params is None:
+        query_params = {}
+    query_params.update({'servicelevel': 'full'})
+    url_params = {'number': isbn}
+    requestor = worldcat_request(auth, transport=transport)
+    r = await requestor.send_request('isbn', url_params=url_params, query_params=query_params)
+    return WorldcatResource(auth, r.content)
+
+
+async def check_holdings_by_oclc_number(auth, oclc_number, oclc_symbol, query_params=None, transport=None):
+    if query_params is None:
+        query_params = {}
+    query_params.update({'servicelevel': 'full', 'oclcsymbol': oclc_symbol})
+    url_params = {'number': oclc_number}
+    requestor = worldcat_library_request(auth, transport=transport)
+    r = await requestor.send_request('oclc', url_params=url_params, query_params=query_params)
+    holdings = WorldcatHoldings(r.content)
+    return holdings.has_holdings
+
+
+async def check_holdings_by_isbn(auth, isbn, oclc_symbol, query_params=None, transport=None):
+    if query_params is None:
+        query_params = {}
+    query_params.update({'servicelevel': 'full', 'oclcsymbol': oclc_symbol})
+    url_params = {'number': isbn}
+    requestor = worldcat_library_request(auth, transport=transport)
+    r = await requestor.send_request('isbn', url_params=url_params, query_params=query_params)
+    holdings = WorldcatHoldings(r.content)
+    return holdings.has_holdings
+
+
+async def get_resources_by_isbns(auth, isbns, query_params=None, transport=None):
+    """Look up many ISBNs at once, returning WorldcatResources in the same order."""
+    return await asyncio.gather(*[get_resource_by_isbn(auth, isbn, dict(query_params or {}), transport)
+                                  for isbn in isbns])
+
+
+async def check_holdings_by_isbns(auth, isbns, oclc_symbol, query_params=None, transport=None):
+    """Check holdings for many ISBNs at once, returning a dict of ISBN to bool."""
+    results = await asyncio.gather(*[check_holdings_by_isbn(auth, isbn, oclc_symbol,
+                                                            dict(query_params or {}), transport)
+                                     for isbn in isbns])
+    return dict(zip(isbns, results))
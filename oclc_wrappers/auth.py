@@ -1,16 +1,84 @@
+import calendar
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import six
 from authliboclc import user, wskey
 
+from .oclc_exceptions import RequestError
+from .requestor import get_default_transport
+
+
+class ETagRegistry(object):
+    """
+    The latest ETag seen for each resource, keyed by URL without its query
+    string. Safe to share between threads, so requests for different
+    resources can run interleaved without sending each other's If-Match.
+    """
+
+    def __init__(self, max_entries=10000):
+        """
+        :param max_entries: Number of resources remembered before the least
+            recently used is forgotten
+        """
+        self.max_entries = max_entries
+        self._etags = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        key = resource_key(url)
+        with self._lock:
+            etag = self._etags.pop(key, None)
+            if etag is not None:
+                self._etags[key] = etag
+            return etag
+
+    def set(self, url, etag):
+        key = resource_key(url)
+        with self._lock:
+            self._etags.pop(key, None)
+            self._etags[key] = etag
+            while len(self._etags) > self.max_entries:
+                self._etags.popitem(last=False)
+
+    def discard(self, url):
+        with self._lock:
+            self._etags.pop(resource_key(url), None)
+
+    def __len__(self):
+        return len(self._etags)
 
-class Auth:
 
-    def __init__(self, params, options=None):
+def resource_key(url):
+    """A URL reduced to the resource it names: no query string, fragment or trailing slash."""
+    parts = six.moves.urllib.parse.urlsplit(url)
+    return six.moves.urllib.parse.urlunsplit((parts.scheme, parts.netloc.lower(),
+                                              parts.path.rstrip('/'), '', ''))
+
+
+class Auth(object):
+
+    def __init__(self, params, options=None, rate_limiter=None):
+        """
+        :param params: Dict of key, secret, principleId, principleIDNS and institutionId
+        :param options: Options passed through to authliboclc's Wskey
+        :param rate_limiter: A ratelimit.RateLimiter every request made with
+            this key waits on
+        """
         self.key = params.get('key')
         self.secret = params.get('secret')
         self.principleId = params.get('principleId')
         self.principleIDNS = params.get('principleIDNS')
         self.institutionId = params.get('institutionId')
         self.options = options
+        # Latest ETag seen on any resource, kept for compatibility, If-Match
+        # headers come from self.etags
         self.etag = None
+        self.etags = ETagRegistry()
+        self.rate_limiter = rate_limiter
 
         self.user = user.User(
             authenticating_institution_id=self.institutionId,
@@ -31,14 +99,155 @@ class Auth:
     def get_header(self, http_verb, url):
         headers = {'Authorization': self.get_signature(http_verb, url),
                    'Accept': 'application/json'}
-        if self.etag and http_verb == 'PUT':
-            headers.update({'If-Match': self.etag})
+        if http_verb == 'PUT':
+            etag = self.etags.get(url)
+            if etag:
+                headers.update({'If-Match': etag})
         if http_verb == 'POST' or http_verb == 'PUT':
             headers.update({'Content-Type': 'application/json'})
         return headers
 
     def set_etag(self, request):
+        """
+        Remember a response's ETag for the resource it came from, which for
+        a 201 Created is the new resource in the Location header.
+        """
         try:
-            self.etag = request.headers['ETag']
+            etag = request.headers['ETag']
         except KeyError:
+            return
+        url = request.url
+        if request.status_code == 201:
+            url = request.headers.get('Location', url)
+        self.etags.set(url, etag)
+        self.etag = etag
+
+
+class AccessTokenAuth(Auth):
+    """
+    Authenticate with an OAuth access token from OCLC's client credentials
+    grant instead of signing every request.
+
+    The token is fetched with an HMAC signed request, cached in memory (and
+    in token_file if given) and refreshed refresh_margin seconds before it
+    expires, on a background timer unless background_refresh is False.
+    Concurrent refreshes are collapsed into one request, so any number of
+    threads can share one token.
+    """
+
+    token_url = 'https://authn.sd00.worldcat.org/oauth2/accessToken'
+
+    def __init__(self, params, scope, options=None, rate_limiter=None, token_file=None,
+                 refresh_margin=60, background_refresh=True, transport=None):
+        """
+        :param params: Dict of key, secret, principleId, principleIDNS and institutionId
+        :param scope: Space separated OCLC service scopes, e.g. 'WMS_ACQ'
+        :param options: Options passed through to authliboclc's Wskey
+        :param rate_limiter: A ratelimit.RateLimiter every request made with
+            this key waits on
+        :param token_file: Path to keep the token in between runs
+        :param refresh_margin: Seconds before expiry to fetch a new token
+        :param background_refresh: Refresh on a timer rather than on the
+            first request after the margin is reached
+        :param transport: A requestor.Transport for token requests
+        """
+        super(AccessTokenAuth, self).__init__(params, options=options, rate_limiter=rate_limiter)
+        self.scope = scope
+        self.token_file = token_file
+        self.refresh_margin = refresh_margin
+        self.background_refresh = background_refresh
+        self.transport = transport if transport is not None else get_default_transport()
+        self.access_token = None
+        self.expires_at = 0
+        self._refresh_lock = threading.Lock()
+        self._timer = None
+        self._load_token()
+
+    @property
+    def token_is_fresh(self):
+        return self.access_token is not None and time.time() < self.expires_at - self.refresh_margin
+
+    def get_signature(self, http_verb, url):
+        return 'Bearer {}'.format(self.token())
+
+    def token(self):
+        """Return a fresh access token, fetching one if needed."""
+        if not self.token_is_fresh:
+            self.refresh()
+        return self.access_token
+
+    def refresh(self, force=False):
+        """
+        Fetch a new access token. Threads arriving while a refresh is in
+        flight wait for it and use its token instead of fetching their own.
+
+        :param force: Fetch even if the current token still looks fresh,
+            e.g. after it was rejected with a 401
+        """
+        stale_token = self.access_token
+        with self._refresh_lock:
+            if self.token_is_fresh and not (force and self.access_token == stale_token):
+                return
+            url = '{url}?{query}'.format(url=self.token_url, query=six.moves.urllib.parse.urlencode(
+                [('grant_type', 'client_credentials'),
+                 ('authenticatingInstitutionId', self.institutionId),
+                 ('contextInstitutionId', self.institutionId),
+                 ('scope', self.scope)]))
+            r = self.transport.request('POST', url, headers={
+                'Authorization': super(AccessTokenAuth, self).get_signature('POST', url),
+                'Accept': 'application/json'})
+            if r.status_code != 200:
+                raise RequestError(r.content, attempt='access token')
+            self._set_token(r.json())
+            self._save_token()
+        self._schedule_refresh()
+
+    def close(self):
+        """Stop the background refresh timer."""
+        if self._timer is not None:
+            self._timer.cancel()
+
+    def _set_token(self, data):
+        self.access_token = data['access_token']
+        if 'expires_in' in data:
+            self.expires_at = time.time() + int(data['expires_in'])
+        else:
+            self.expires_at = calendar.timegm(time.strptime(data['expires_at'], '%Y-%m-%d %H:%M:%SZ'))
+
+    def _schedule_refresh(self):
+        if not self.background_refresh:
+            return
+        self.close()
+        delay = max(0, self.expires_at - self.refresh_margin - time.time())
+        self._timer = threading.Timer(delay, self._refresh_in_background)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        except Exception:
+            # The next request will try again in the foreground
             pass
+
+    def _load_token(self):
+        if self.token_file is None or not os.path.exists(self.token_file):
+            return
+        try:
+            with open(self.token_file) as f:
+                data = json.load(f)
+        except ValueError:
+            return
+        if data.get('key') == self.key and data.get('scope') == self.scope:
+            self.access_token = data['access_token']
+            self.expires_at = data['expires_at']
+            if self.token_is_fresh:
+                self._schedule_refresh()
+
+    def _save_token(self):
+        if self.token_file is None:
+            return
+        fd = os.open(self.token_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'key': self.key, 'scope': self.scope,
+                       'access_token': self.access_token, 'expires_at': self.expires_at}, f)
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import OrderedDict
+
+import six
+
+
+class ResponseCache(object):
+    """
+    An in-memory cache of successful responses with a time to live and least
+    recently used eviction, safe to share between threads.
+
+    Give one to a WSKeyLiteRequest (or set WSKeyLiteRequest.cache) so repeat
+    WorldCat lookups skip the network. self.hits and self.misses count lookups.
+    """
+
+    def __init__(self, ttl=300, max_entries=1024, clock=time.time):
+        """
+        :param ttl: Seconds an entry stays fresh, None to keep until evicted
+        :param max_entries: Number of entries kept before the least recently
+            used is dropped
+        :param clock: Function returning the current time in seconds
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the fresh entry for key, or None."""
+        with self._lock:
+            try:
+                expires, value = self._entries.pop(key)
+            except KeyError:
+                self.misses += 1
+                return None
+            if expires is not None and expires <= self.clock():
+                self.misses += 1
+                return None
+            self._entries[key] = (expires, value)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        expires = None if self.ttl is None else self.clock() + self.ttl
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (expires, value)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def cache_key(url, ignore=('wskey',)):
+    """
+    Normalize a URL for use as a cache key: query parameters are sorted and
+    credentials like the wskey are dropped, so the key is the same for
+    every caller.
+    """
+    parts = six.moves.urllib.parse.urlsplit(url)
+    query = sorted((name, val) for name, val in six.moves.urllib.parse.parse_qsl(parts.query)
+                   if name not in ignore)
+    return six.moves.urllib.parse.urlunsplit((parts.scheme, parts.netloc.lower(), parts.path,
+                                              six.moves.urllib.parse.urlencode(query), ''))
@@ -0,0 +1,52 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONCodec(object):
+    """Encode request bodies and decode responses with the standard library's json."""
+
+    def encode(self, data):
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+    def decode(self, content):
+        if isinstance(content, bytes):
+            content = content.decode('utf-8')
+        return json.loads(content)
+
+
+class OrjsonCodec(object):
+    """The same with orjson, several times faster both ways. Needs pip install orjson."""
+
+    def encode(self, data):
+        return orjson.dumps(data)
+
+    def decode(self, content):
+        return orjson.loads(content)
+
+
+def default_codec():
+    """The fastest codec installed."""
+    return OrjsonCodec() if orjson is not None else JSONCodec()
+
+
+def compact(data):
+    """
+    A copy of data without the fields that carry nothing: None, and lists
+    and objects that are empty once compacted themselves. Zero, False and
+    empty strings are kept.
+    """
+    if isinstance(data, dict):
+        compacted = {}
+        for key, value in data.items():
+            value = compact(value)
+            if value is not None and value != [] and value != {}:
+                compacted[key] = value
+        return compacted
+    if isinstance(data, list):
+        return [value for value in (compact(element) for element in data)
+                if value is not None and value != [] and value != {}]
+    return data
@@ -0,0 +1,171 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .acquisitions import DEFAULT_PAGE_SIZE, PAGE_WORKERS, iter_funds, iter_purchase_order_items
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow
+except ImportError:
+    pyarrow = None
+
+BOOKING_COLUMNS = ('po_number', 'order_item_number', 'oclc_number', 'title', 'order_type', 'ordering_price',
+                   'copy_number', 'copy_count', 'branch_id', 'shelving_location_id', 'fund_code', 'fund_name',
+                   'percentage', 'amount')
+BOOKING_NUMERIC = ('ordering_price', 'copy_count', 'percentage', 'amount')
+
+FUND_COLUMNS = ('fund_id', 'code', 'name', 'parent_id', 'allocation', 'expended', 'encumbered', 'remaining')
+FUND_NUMERIC = ('allocation', 'expended', 'encumbered', 'remaining')
+
+
+class ColumnTable(object):
+    """
+    Rows kept as one list per column, ready to hand to NumPy or Arrow.
+
+    Numeric columns hold floats, with None for missing values; everything
+    else is kept as it came from the API.
+    """
+
+    def __init__(self, names, numeric=()):
+        self.names = tuple(names)
+        self.numeric = frozenset(numeric)
+        self.columns = OrderedDict((name, []) for name in self.names)
+        self._appends = [column.append for column in self.columns.values()]
+
+    def append(self, row):
+        """Add a row given as a tuple in column order."""
+        for append, value in zip(self._appends, row):
+            append(value)
+
+    def extend(self, rows):
+        for row in rows:
+            self.append(row)
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __len__(self):
+        return len(self.columns[self.names[0]]) if self.names else 0
+
+    def rows(self):
+        return zip(*self.columns.values())
+
+    def to_numpy(self):
+        """
+        A dict of NumPy arrays, float64 (NaN for missing) for numeric
+        columns and object otherwise. Needs pip install numpy.
+        """
+        _require(numpy, 'numpy')
+        return OrderedDict((name, self._array(name)) for name in self.names)
+
+    def to_arrow(self):
+        """A pyarrow.Table of the columns. Needs pip install pyarrow."""
+        _require(pyarrow, 'pyarrow')
+        return pyarrow.table(OrderedDict(
+            (name, pyarrow.array(column, type=pyarrow.float64() if name in self.numeric else None))
+            for name, column in self.columns.items()))
+
+    def group_sum(self, by, value):
+        """
+        Total a numeric column per distinct value of another, e.g.
+        group_sum('fund_code', 'amount') for spend per fund. Missing values
+        count as zero. The sums run in NumPy when it's installed.
+
+        :return: An OrderedDict of group to total, in order of first appearance
+        """
+        codes = {}
+        group_of = [codes.setdefault(key, len(codes)) for key in self.columns[by]]
+        if numpy is not None:
+            weights = numpy.nan_to_num(self._array(value))
+            totals = numpy.bincount(numpy.asarray(group_of, dtype=numpy.intp), weights=weights,
+                                    minlength=len(codes)).tolist()
+        else:
+            totals = [0.0] * len(codes)
+            for group, amount in zip(group_of, self.columns[value]):
+                if amount is not None:
+                    totals[group] += amount
+        return OrderedDict((key, totals[code]) for key, code in codes.items())
+
+    def _array(self, name):
+        column = self.columns[name]
+        if name in self.numeric:
+            return numpy.array([numpy.nan if value is None else value for value in column], dtype=numpy.float64)
+        array = numpy.empty(len(column), dtype=object)
+        array[:] = column
+        return array
+
+
+def booking_rows(po_number, item):
+    """
+    Flatten an item to one row per fund booking of each copy, in
+    BOOKING_COLUMNS order. A booking without an amount is given its
+    percentage of the item's ordering price.
+    """
+    data = getattr(item, '_data', item)
+    resource = (data.get('resource') or {}).get('worldcatResource') or {}
+    price = _float(data.get('orderingPrice'))
+    head = (po_number, data.get('orderItemNumber'), resource.get('oclcNumber'), resource.get('title'),
+            data.get('orderType'), price)
+    for copy_config in (data.get('copyConfigs') or {}).get('copyConfig') or ():
+        copy_part = (copy_config.get('copyConfigNumber'), _float(copy_config.get('copyCount')),
+                     copy_config.get('branchId'), copy_config.get('shelvingLocationId'))
+        for booking in copy_config.get('booking') or ():
+            percentage = _float(booking.get('percentage'))
+            amount = _float(booking.get('amount'))
+            if amount is None and price is not None and percentage is not None:
+                amount = price * percentage / 100
+            yield head + copy_part + (booking.get('budgetAccountCode'), booking.get('budgetAccountName'),
+                                      percentage, amount)
+
+
+def fund_row(fund):
+    """A fund as a row in FUND_COLUMNS order."""
+    amounts = []
+    for name in FUND_NUMERIC:
+        try:
+            amounts.append(_float(getattr(fund, name)))
+        except (KeyError, TypeError):
+            amounts.append(None)
+    return (fund.id, fund.code, fund.name, fund.parent_id) + tuple(amounts)
+
+
+def export_bookings(auth, po_numbers, page_size=DEFAULT_PAGE_SIZE, max_workers=PAGE_WORKERS):
+    """
+    Every fund booking of every item on the given purchase orders, as a
+    ColumnTable of BOOKING_COLUMNS. Orders are read max_workers at a time,
+    each page by page, and only the flattened rows are kept.
+    """
+    def order_rows(po_number):
+        rows = []
+        for item in iter_purchase_order_items(auth, po_number, page_size=page_size):
+            rows.extend(booking_rows(po_number, item))
+        return rows
+
+    table = ColumnTable(BOOKING_COLUMNS, BOOKING_NUMERIC)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for rows in pool.map(order_rows, po_numbers):
+            table.extend(rows)
+    return table
+
+
+def export_funds(auth, inst_id, budget=None, parent=None, page_size=DEFAULT_PAGE_SIZE):
+    """Every fund matching a search, as for search_funds, as a ColumnTable of FUND_COLUMNS."""
+    table = ColumnTable(FUND_COLUMNS, FUND_NUMERIC)
+    table.extend(fund_row(fund) for fund in iter_funds(auth, inst_id, budget=budget, parent=parent,
+                                                        page_size=page_size))
+    return table
+
+
+def _float(value):
+    if value is None or value == '':
+        return None
+    return float(value)
+
+
+def _require(module, name):
+    if module is None:
+        raise ImportError('{name} is needed for this, pip install {name}'.format(name=name))
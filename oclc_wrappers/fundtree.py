@@ -0,0 +1,172 @@
+import threading
+import time
+from collections import namedtuple
+from decimal import Decimal
+
+from .acquisitions import DEFAULT_PAGE_SIZE, PAGE_WORKERS, search_funds
+
+Rollup = namedtuple('Rollup', 'allocation expended encumbered remaining')
+
+AMOUNTS = Rollup._fields
+ZERO = Rollup(*(Decimal(0),) * len(AMOUNTS))
+
+
+class FundTree(object):
+    """
+    Every fund in a budget period, loaded with a single budgetPeriod search
+    and indexed by id, code and parent, with each fund's amounts rolled up
+    over all of its descendants.
+
+    Lookups are answered locally; the funds are searched again once they are
+    older than ttl seconds, or when refresh(force=True) is called. Safe to
+    share between threads.
+    """
+
+    def __init__(self, auth, inst_id, budget, ttl=300, page_size=DEFAULT_PAGE_SIZE,
+                 max_workers=PAGE_WORKERS, clock=time.time):
+        """
+        :param auth: An Auth object that implements HMAC authentication
+        :param inst_id: The institution's registry id
+        :param budget: The budget period, as for search_funds
+        :param ttl: Seconds the loaded funds stay fresh, None to keep until
+            refreshed by hand
+        :param page_size: Number of funds requested per page
+        :param max_workers: Number of pages fetched at once
+        :param clock: Function returning the current time in seconds
+        """
+        self.auth = auth
+        self.inst_id = inst_id
+        self.budget = budget
+        self.ttl = ttl
+        self.page_size = page_size
+        self.max_workers = max_workers
+        self.clock = clock
+        self.loaded = None
+        self._index = None
+        self._lock = threading.Lock()
+
+    def refresh(self, force=False):
+        """Search the budget period again if the funds are stale, or always with force."""
+        with self._lock:
+            if force or self._stale():
+                funds = search_funds(self.auth, self.inst_id, budget=self.budget,
+                                     page_size=self.page_size, max_workers=self.max_workers)
+                self._index = _FundIndex(funds)
+                self.loaded = self.clock()
+            return self._index
+
+    def get(self, fund_id):
+        """The Fund with this id, or None."""
+        return self._current().by_id.get(fund_id)
+
+    def by_code(self, code):
+        """The Fund with this code, or None."""
+        return self._current().by_code.get(code)
+
+    def children(self, fund_id=None):
+        """The funds directly under fund_id, or the top level funds if it is None."""
+        return list(self._current().children.get(fund_id, ()))
+
+    def roots(self):
+        return self.children(None)
+
+    def descendants(self, fund_id):
+        """Every fund below fund_id, parents before their children."""
+        index = self._current()
+        found = []
+        seen = set([fund_id])
+        stack = list(reversed(index.children.get(fund_id, ())))
+        while stack:
+            fund = stack.pop()
+            if fund.id in seen:
+                continue
+            seen.add(fund.id)
+            found.append(fund)
+            stack.extend(reversed(index.children.get(fund.id, ())))
+        return found
+
+    def rollup(self, fund_id):
+        """
+        A Rollup of Decimal allocation, expended, encumbered and remaining
+        amounts for a fund and everything below it, or None for an unknown id.
+        """
+        return self._current().rollups.get(fund_id)
+
+    def totals(self):
+        """A Rollup of the whole budget period."""
+        index = self._current()
+        return _add(index.rollups[fund.id] for fund in index.children.get(None, ()))
+
+    def _current(self):
+        index = self._index
+        if index is None or self._stale():
+            index = self.refresh()
+        return index
+
+    def _stale(self):
+        if self.loaded is None:
+            return True
+        return self.ttl is not None and self.loaded + self.ttl <= self.clock()
+
+    def __len__(self):
+        return len(self._current().by_id)
+
+    def __iter__(self):
+        return iter(list(self._current().by_id.values()))
+
+    def __contains__(self, fund_id):
+        return fund_id in self._current().by_id
+
+
+class _FundIndex(object):
+    """An immutable snapshot of one load, swapped in whole on refresh."""
+
+    def __init__(self, funds):
+        self.by_id = {}
+        self.by_code = {}
+        self.children = {}
+        for fund in funds:
+            self.by_id[fund.id] = fund
+            self.by_code[fund.code] = fund
+        for fund in self.by_id.values():
+            parent = fund.parent_id if fund.parent_id in self.by_id else None
+            self.children.setdefault(parent, []).append(fund)
+        self.rollups = self._roll_up()
+
+    def _roll_up(self):
+        own = dict((fund_id, fund_amounts(fund)) for fund_id, fund in self.by_id.items())
+        rollups = {}
+        # Post-order without recursion, so deep trees can't hit the recursion limit.
+        stack = [(fund, False) for fund in self.children.get(None, ())]
+        while stack:
+            fund, visited = stack.pop()
+            kids = self.children.get(fund.id, ())
+            if visited:
+                rollups[fund.id] = _add([own[fund.id]] + [rollups[kid.id] for kid in kids])
+            else:
+                stack.append((fund, True))
+                stack.extend((kid, False) for kid in kids)
+        # Funds caught in a parent cycle are never reached from the top; they only count themselves.
+        for fund_id in own:
+            rollups.setdefault(fund_id, own[fund_id])
+        return rollups
+
+
+def fund_amounts(fund):
+    """A Rollup of one fund's own amounts as Decimals, missing amounts counting as zero."""
+    return Rollup(*(_decimal(fund, name) for name in AMOUNTS))
+
+
+def _decimal(fund, name):
+    try:
+        value = getattr(fund, name)
+    except (KeyError, TypeError):
+        return Decimal(0)
+    return Decimal(str(value)) if value is not None else Decimal(0)
+
+
+def _add(rollups):
+    total = ZERO
+    for rollup in rollups:
+        total = Rollup(*(a + b for a, b in zip(total, rollup)))
+    return total
@@ -3,9 +3,9 @@
 from __future__ import (absolute_import,
     division, print_function, unicode_literals)
 
-import requests
-
 from .oclc_exceptions import CollectionNotFound, NoKbart
+from .paging import prefetching
+from .requestor import get_default_transport
 
 
 class KB:
@@ -19,9 +19,17 @@ class KB:
     Documentation for OCLC Developer Tools:
     https://www.oclc.org/developer/develop.en.html
     """
-    def __init__(self, wskey):
-        """Set the default parameters for KB API requests."""
+    def __init__(self, wskey, transport=None):
+        """
+        Set the default parameters for KB API requests.
+
+        Args:
+            wskey: WSKey to send with every request
+            transport: A requestor.Transport to send requests through,
+                defaults to the shared one
+        """
         self._defaults = {'alt': 'json', 'wskey': wskey}
+        self.transport = transport if transport is not None else get_default_transport()
 
     @property
     def collection_search_url(self):
@@ -53,7 +61,7 @@ class KB:
         payload = self._get_payload(options)
         payload['q'] = search_term
 
-        return requests.get(self.collection_search_url, params=payload).json()
+        return self.transport.get(self.collection_search_url, params=payload).json()
 
     def get_collection(self, collection_id, options=None):
         """
@@ -69,7 +77,7 @@ class KB:
         """
         payload = self._get_payload(options)
         url = '{0}{1}'.format(self.collection_base_url, collection_id)
-        r = requests.get(url, params=payload)
+        r = self.transport.get(url, params=payload)
         if r.status_code == 200:
             return r.json()
         else:
@@ -86,23 +94,41 @@ class KB:
         Returns:
             A list of dicts of the collection entries
         """
+        return list(self.iter_entries(collection_id, options, prefetch=False))
+
+    def iter_entries(self, collection_id, options=None, prefetch=True):
+        """
+        Yield every entry from a given collection, holding one page at a time
+        so collections of any size can be processed in constant memory.
+        Args:
+            collection_id: OCLC collection id as a string
+            options: Dict of secondary options
+            prefetch: Fetch the next page in the background while the
+                current one is being consumed
+        Yields:
+            Dicts of the collection entries
+        """
+        pages = self._entry_pages(collection_id, options)
+        if prefetch:
+            pages = prefetching(pages)
+        for page in pages:
+            for entry in page:
+                yield entry
+
+    def _entry_pages(self, collection_id, options):
         start_index = 1
-        records = []
         payload = self._get_payload(options)
         payload.update({'collection_uid': collection_id,
                         'itemsPerPage': 50})
         while True:
             payload.update({'startIndex': start_index})
-            r = requests.get(self.entry_search_url, params=payload).json()
-            for entry in r['entries']:
-                records.append(entry)
+            entries = self.transport.get(self.entry_search_url, params=payload).json()['entries']
+            yield entries
 
-            if len(r['entries']) < 50:
+            if len(entries) < 50:
                 break
             start_index += 50
 
-        return records
-
     def download_collection_kbart(self,
                                   collection_id,
                                   filename):
@@ -122,7 +148,7 @@ class KB:
                 break
         else:
             raise NoKbart
-        kbart_file = requests.get(url, params=self._defaults, stream=True)
+        kbart_file = self.transport.get(url, params=self._defaults, stream=True)
         with open(filename, 'wb') as f:
             for chunk in kbart_file.iter_content(chunk_size=1024):
                 if chunk:
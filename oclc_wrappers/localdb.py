@@ -0,0 +1,42 @@
+import os
+import sqlite3
+import threading
+
+
+class LocalDB(object):
+    """
+    Hands out a SQLite connection per thread and per process for a local
+    database file, since sqlite3 connections can't cross threads or survive
+    a fork. Connections are in autocommit mode, use BEGIN for transactions.
+    """
+
+    def __init__(self, path, timeout=30, schema=()):
+        """
+        :param path: Location of the SQLite file, created if missing
+        :param timeout: Seconds to wait for another process's lock
+        :param schema: SQL statements run once to set up the tables
+        """
+        self.path = path
+        self.timeout = timeout
+        self._local = threading.local()
+        conn = self.connection()
+        conn.execute('PRAGMA journal_mode=WAL')
+        for statement in schema:
+            conn.execute(statement)
+
+    def connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def transaction(self):
+        """
+        Start an immediate (write locked) transaction, for use as
+        `with db.transaction() as conn:`.
+        """
+        conn = self.connection()
+        conn.execute('BEGIN IMMEDIATE')
+        return conn
@@ -19,3 +19,12 @@ class RequestError(Exception):
 
     def __str__(self):
         return '{} - {}'.format(self.r, self.attempt)
+
+
+class ValidationError(Exception):
+
+    def __init__(self, problems):
+        self.problems = problems
+
+    def __str__(self):
+        return '; '.join('{}: {}'.format(field, message) for field, message in self.problems)
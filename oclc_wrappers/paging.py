@@ -0,0 +1,23 @@
+from concurrent.futures import ThreadPoolExecutor
+
+_DONE = object()
+
+
+def prefetching(pages):
+    """
+    Iterate over pages while the next one is fetched on a background thread.
+
+    Only one page is ever read ahead, so memory stays bounded by two pages
+    however long the result set is.
+
+    :param pages: An iterable that does the (slow) work of fetching each page
+    """
+    pages = iter(pages)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        next_page = pool.submit(next, pages, _DONE)
+        while True:
+            page = next_page.result()
+            if page is _DONE:
+                return
+            next_page = pool.submit(next, pages, _DONE)
+            yield page
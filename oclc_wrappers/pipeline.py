@@ -0,0 +1,207 @@
+import hashlib
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from requests.exceptions import RequestException
+
+from .acquisitions import (ATTACH_WORKERS, BatchResult, Created, Failed, attach_item_to_order,
+                           create_purchase_order, iter_purchase_order_items, submit_purchase_order)
+from .localdb import LocalDB
+from .oclc_exceptions import RequestError
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS jobs (job TEXT PRIMARY KEY, po_number TEXT, '
+    'submitted INTEGER DEFAULT 0, updated REAL)',
+    'CREATE TABLE IF NOT EXISTS items (job TEXT, key TEXT, state TEXT, order_item_number TEXT, '
+    'error TEXT, updated REAL, PRIMARY KEY (job, key))',
+]
+
+PENDING = 'pending'
+CREATED = 'created'
+FAILED = 'failed'
+
+
+class ImportResult(BatchResult):
+    """
+    A BatchResult for one run of an OrderImport, plus the purchase order
+    number, the items skipped because an earlier run created them, and
+    whether the order has been submitted.
+    """
+
+    def __init__(self, po_number):
+        super(ImportResult, self).__init__()
+        self.po_number = po_number
+        self.submitted = False
+
+    def __repr__(self):
+        return '<ImportResult {} created={} skipped={} failed={} submitted={}>'.format(
+            self.po_number, len(self.created), len(self.skipped), len(self.failed), self.submitted)
+
+
+class OrderImport(object):
+    """
+    Turn a selection list into a purchase order with its items, recording
+    every confirmed step in a local SQLite journal so a crashed or timed out
+    run can simply be run again.
+
+    A rerun reuses the journaled purchase order, skips items already
+    created, retries items that failed and only then submits the order.
+    Items are journaled as pending before they're posted; if a run dies
+    between the post and the journal write, the rerun matches pending items
+    against the items on the order by OCLC number and vendor item number
+    instead of posting them twice. An item whose post ends in a connection
+    error or timeout may have been created all the same, so it stays
+    pending and is matched the same way; only items WMS rejected are
+    journaled as failed.
+    """
+
+    def __init__(self, auth, journal_path, job):
+        """
+        :param auth: An Auth object that implements HMAC authentication
+        :param journal_path: Location of the SQLite journal, created if missing
+        :param job: A name for this import that stays the same between runs,
+            e.g. the selection list's file name
+        """
+        self.auth = auth
+        self.job = job
+        self.db = LocalDB(journal_path, schema=SCHEMA)
+
+    @property
+    def po_number(self):
+        row = self.db.connection().execute('SELECT po_number FROM jobs WHERE job = ?', (self.job,)).fetchone()
+        return row[0] if row is not None else None
+
+    @property
+    def submitted(self):
+        row = self.db.connection().execute('SELECT submitted FROM jobs WHERE job = ?', (self.job,)).fetchone()
+        return bool(row and row[0])
+
+    def run(self, name, vendor_id, items, key=None, submit=True, max_workers=ATTACH_WORKERS, **po_fields):
+        """
+        Create (or resume) the purchase order, attach every item not yet
+        created and submit the order once all items are in.
+
+        :param name: Name of the purchase order
+        :param vendor_id: Vendor of the purchase order
+        :param items: An iterable of Item objects
+        :param key: Function giving each item an identifier that is unique
+            in the selection and stable between runs, defaults to the item's
+            position and a hash of its data
+        :param submit: Submit the order once every item has been created
+        :param max_workers: Number of items posted at once
+        :param po_fields: Other purchase order fields, as for create_purchase_order
+
+        :return: An ImportResult
+        :raises ValueError: If key gives two items the same identifier
+        """
+        keyed = []
+        seen = set()
+        for index, item in enumerate(items):
+            item_id = item_key(item, index) if key is None else key(item)
+            if item_id in seen:
+                raise ValueError('Item {} has the same key as an earlier item, {!r}; pass a key function that '
+                                 'tells them apart'.format(index, item_id))
+            seen.add(item_id)
+            keyed.append((index, item_id, item))
+
+        po_number = self.po_number
+        if po_number is None:
+            po_number = create_purchase_order(self.auth, name, vendor_id, **po_fields).number
+            self._set_job(po_number=po_number)
+
+        result = ImportResult(po_number)
+        journal = self._journal()
+        todo = []
+        for index, item_id, item in keyed:
+            state, order_item_number = journal.get(item_id, (None, None))
+            if state == CREATED:
+                item['orderItemNumber'] = order_item_number
+                result.skipped.append(Created(index, item))
+            else:
+                todo.append((index, item_id, item, state == PENDING))
+
+        if any(pending for _, _, _, pending in todo):
+            todo = self._reconcile(po_number, todo, result)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for outcome in pool.map(lambda task: self._attach(po_number, *task[:3]), todo):
+                if isinstance(outcome, Failed):
+                    result.failed.append(outcome)
+                else:
+                    result.created.append(outcome)
+
+        if submit and result.ok and not self.submitted:
+            submit_purchase_order(self.auth, po_number)
+            self._set_job(submitted=1)
+        result.submitted = self.submitted
+        return result
+
+    def _attach(self, po_number, index, item_id, item):
+        self._set_item(item_id, PENDING)
+        try:
+            new_item = attach_item_to_order(self.auth, po_number, item._data)
+        except RequestError as e:
+            self._set_item(item_id, FAILED, error=str(e))
+            return Failed(index, item, e)
+        except RequestException as e:
+            # The post may have reached WMS, leave it for the next run to reconcile
+            self._set_item(item_id, PENDING, error=str(e))
+            return Failed(index, item, e)
+        self._set_item(item_id, CREATED, order_item_number=new_item.order_item_number)
+        item._replace_data(new_item._data)
+        return Created(index, item)
+
+    def _reconcile(self, po_number, todo, result):
+        """Claim items already on the order for pending items, return what is left to post."""
+        journaled = set(number for _, number in self._journal().values() if number)
+        on_order = {}
+        for server_item in iter_purchase_order_items(self.auth, po_number):
+            if server_item.order_item_number not in journaled:
+                on_order.setdefault(item_signature(server_item), []).append(server_item.order_item_number)
+
+        remaining = []
+        for index, item_id, item, pending in todo:
+            matches = on_order.get(item_signature(item)) if pending else None
+            if matches:
+                order_item_number = matches.pop(0)
+                self._set_item(item_id, CREATED, order_item_number=order_item_number)
+                item['orderItemNumber'] = order_item_number
+                result.skipped.append(Created(index, item))
+            else:
+                remaining.append((index, item_id, item, pending))
+        return remaining
+
+    def _journal(self):
+        rows = self.db.connection().execute(
+            'SELECT key, state, order_item_number FROM items WHERE job = ?', (self.job,))
+        return dict((item_id, (state, number)) for item_id, state, number in rows)
+
+    def _set_job(self, **fields):
+        with self.db.transaction() as conn:
+            conn.execute('INSERT OR IGNORE INTO jobs (job, updated) VALUES (?, ?)', (self.job, time.time()))
+            for column, value in fields.items():
+                conn.execute('UPDATE jobs SET {} = ?, updated = ? WHERE job = ?'.format(column),
+                             (value, time.time(), self.job))
+
+    def _set_item(self, item_id, state, order_item_number=None, error=None):
+        with self.db.transaction() as conn:
+            conn.execute('INSERT OR IGNORE INTO items (job, key) VALUES (?, ?)', (self.job, item_id))
+            conn.execute('UPDATE items SET state = ?, order_item_number = COALESCE(?, order_item_number), '
+                         'error = ?, updated = ? WHERE job = ? AND key = ?',
+                         (state, order_item_number, error, time.time(), self.job, item_id))
+
+
+def item_key(item, index=None):
+    """
+    A stable identifier for an item: a hash of its data, after its position
+    in the selection if given so that identical lines are told apart.
+    """
+    data = json.dumps(getattr(item, '_data', item), sort_keys=True, default=str)
+    digest = hashlib.sha1(data.encode('utf-8')).hexdigest()
+    return digest if index is None else '{}:{}'.format(index, digest)
+
+
+def item_signature(item):
+    """What an item is recognised by on the server: OCLC number and vendor item number."""
+    return '{}|{}'.format(item.oclc_number, item.vendor_item_number)
@@ -0,0 +1,100 @@
+import threading
+import time
+
+import six
+
+from .localdb import LocalDB
+
+
+class MemoryBuckets(object):
+    """Token buckets kept in this process, safe to share between threads."""
+
+    def __init__(self, clock=time.time):
+        self.clock = clock
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, name, rate, capacity):
+        """
+        Take a token from the named bucket, returning how many seconds the
+        caller has to wait before it is actually available.
+        """
+        with self._lock:
+            now = self.clock()
+            tokens, updated = self._buckets.get(name, (capacity, now))
+            tokens, wait = _take(tokens, updated, now, rate, capacity)
+            self._buckets[name] = (tokens, now)
+        return wait
+
+
+class SQLiteBuckets(object):
+    """
+    Token buckets kept in a SQLite file, so every process on the machine
+    pointed at the same path draws from the same buckets.
+    """
+
+    def __init__(self, path, clock=time.time, timeout=30):
+        """
+        :param path: Location of the SQLite file, created if missing
+        :param timeout: Seconds to wait for another process's lock
+        """
+        self.clock = clock
+        self.db = LocalDB(path, timeout=timeout,
+                          schema=['CREATE TABLE IF NOT EXISTS buckets '
+                                  '(name TEXT PRIMARY KEY, tokens REAL, updated REAL)'])
+
+    def reserve(self, name, rate, capacity):
+        """
+        Take a token from the named bucket, returning how many seconds the
+        caller has to wait before it is actually available.
+        """
+        with self.db.transaction() as conn:
+            row = conn.execute('SELECT tokens, updated FROM buckets WHERE name = ?', (name,)).fetchone()
+            now = self.clock()
+            tokens, updated = row if row is not None else (capacity, now)
+            tokens, wait = _take(tokens, updated, now, rate, capacity)
+            conn.execute('INSERT OR REPLACE INTO buckets (name, tokens, updated) VALUES (?, ?, ?)',
+                         (name, tokens, now))
+        return wait
+
+
+def _take(tokens, updated, now, rate, capacity):
+    tokens = min(capacity, tokens + (now - updated) * rate) - 1
+    wait = -tokens / rate if tokens < 0 else 0
+    return tokens, wait
+
+
+class RateLimiter(object):
+    """
+    Cap requests per second per WSKey and per host with token buckets.
+
+    Attach one to an Auth (Auth(params, rate_limiter=...)) to throttle every
+    request made with that key, or to a requestor. Give it a path to share
+    the buckets with other processes through a local SQLite file.
+    """
+
+    def __init__(self, per_key=None, per_host=None, burst=1, path=None, sleep=time.sleep):
+        """
+        :param per_key: Requests per second allowed for each WSKey, or None
+        :param per_host: Requests per second allowed for each host, or None
+        :param burst: Requests allowed back to back before the rate applies
+        :param path: SQLite file to coordinate through, in memory if None
+        :param sleep: Function used to wait for a token
+        """
+        self.per_key = per_key
+        self.per_host = per_host
+        self.burst = burst
+        self.sleep = sleep
+        self.buckets = SQLiteBuckets(path) if path is not None else MemoryBuckets()
+
+    def acquire(self, key=None, url=None):
+        """Block until a request with this key to this URL's host may be sent."""
+        wait = 0
+        if self.per_key and key is not None:
+            wait = self.buckets.reserve('key:{}'.format(key), self.per_key, self.burst)
+        if self.per_host and url is not None:
+            host = six.moves.urllib.parse.urlparse(url).netloc
+            wait = max(wait, self.buckets.reserve('host:{}'.format(host), self.per_host, self.burst))
+        if wait > 0:
+            self.sleep(wait)
+        return wait
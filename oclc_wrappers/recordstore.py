@@ -0,0 +1,211 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .localdb import LocalDB
+from .worldcat import WorldcatResource, WorldcatHoldings, worldcat_request, worldcat_library_request
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS records (kind TEXT, identifier TEXT, body BLOB, '
+    'stored REAL, accessed REAL, size INTEGER, PRIMARY KEY (kind, identifier))',
+    'CREATE INDEX IF NOT EXISTS records_accessed ON records (accessed)',
+]
+# Running totals of the records table, kept by triggers so bounds are checked without a scan.
+# Made after any upgrade of a store from before the size column.
+STATS_SCHEMA = [
+    'CREATE INDEX IF NOT EXISTS records_stored ON records (stored)',
+    'CREATE TABLE IF NOT EXISTS stats (id INTEGER PRIMARY KEY CHECK (id = 0), entries INTEGER, bytes INTEGER)',
+    'CREATE TRIGGER IF NOT EXISTS records_added AFTER INSERT ON records BEGIN '
+    'UPDATE stats SET entries = entries + 1, bytes = bytes + NEW.size; END',
+    'CREATE TRIGGER IF NOT EXISTS records_removed AFTER DELETE ON records BEGIN '
+    'UPDATE stats SET entries = entries - 1, bytes = bytes - OLD.size; END',
+]
+
+
+class RecordStore(object):
+    """
+    A local SQLite store of raw WorldCat XML that survives restarts and can
+    be shared by every worker process on a machine.
+
+    Bibliographic records are kept by the WORLDCAT_RESOURCE_URLS action used
+    to fetch them ('isbn' or 'oclc_number'), holdings by symbol and the
+    WORLDCAT_LIBRARY_URLS action ('oclc' or 'isbn'). Only successful
+    responses are stored.
+    """
+
+    def __init__(self, path, ttl=None, max_entries=None, max_bytes=None, timeout=30, touch_after=60,
+                 clock=time.time):
+        """
+        :param path: Location of the SQLite file, created if missing
+        :param ttl: Seconds a record stays fresh, None to keep until evicted
+        :param max_entries: Number of records kept before the least recently
+            read are dropped
+        :param max_bytes: Total size of stored XML kept before the least
+            recently read are dropped
+        :param timeout: Seconds to wait for another process's lock
+        :param touch_after: Seconds before a read record's last read time is
+            updated again, so most reads don't write; records read within
+            this long of each other count as equally recent
+        :param clock: Function returning the current time in seconds
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.touch_after = touch_after
+        self.clock = clock
+        self.db = LocalDB(path, timeout=timeout, schema=SCHEMA)
+        self._prepare_stats()
+
+    def get(self, kind, identifier):
+        """Return the stored body for an identifier, or None if missing or stale."""
+        conn = self.db.connection()
+        row = conn.execute('SELECT body, stored, accessed FROM records WHERE kind = ? AND identifier = ?',
+                           (kind, identifier)).fetchone()
+        now = self.clock()
+        if row is None or self._expired(row[1], now):
+            return None
+        if now - row[2] >= self.touch_after:
+            conn.execute('UPDATE records SET accessed = ? WHERE kind = ? AND identifier = ?',
+                         (now, kind, identifier))
+        return bytes(row[0])
+
+    def put(self, kind, identifier, body):
+        now = self.clock()
+        with self.db.transaction() as conn:
+            # Delete and insert rather than INSERT OR REPLACE, which wouldn't fire the delete trigger
+            conn.execute('DELETE FROM records WHERE kind = ? AND identifier = ?', (kind, identifier))
+            conn.execute('INSERT INTO records (kind, identifier, body, stored, accessed, size) '
+                         'VALUES (?, ?, ?, ?, ?, ?)', (kind, identifier, body, now, now, len(body)))
+            self._evict(conn, now)
+
+    def delete(self, kind, identifier):
+        self.db.connection().execute('DELETE FROM records WHERE kind = ? AND identifier = ?',
+                                     (kind, identifier))
+
+    def missing(self, kind, identifiers):
+        """The identifiers with no fresh record stored, in the order given."""
+        conn = self.db.connection()
+        identifiers = list(identifiers)
+        now = self.clock()
+        present = set()
+        for start in range(0, len(identifiers), 500):
+            chunk = identifiers[start:start + 500]
+            rows = conn.execute('SELECT identifier, stored FROM records WHERE kind = ? AND identifier IN ({})'
+                                .format(', '.join('?' * len(chunk))), [kind] + chunk)
+            present.update(identifier for identifier, stored in rows if not self._expired(stored, now))
+        return [identifier for identifier in identifiers if identifier not in present]
+
+    def get_resource(self, auth, isbn=None, oclc_number=None, **kwargs):
+        """
+        Return a WorldcatResource for an ISBN or OCLC number, reading it from
+        the store if possible and fetching and storing it otherwise.
+        Records fetched by ISBN are also stored under their OCLC number.
+        """
+        kind, identifier = ('isbn', isbn) if isbn is not None else ('oclc_number', oclc_number)
+        body = self.get(kind, identifier)
+        if body is None:
+            body = self._fetch_resource(auth, kind, identifier, **kwargs)
+        return WorldcatResource(auth, body)
+
+    def check_holdings(self, auth, number, oclc_symbol, by='oclc', **kwargs):
+        """
+        Check whether oclc_symbol holds a title, by OCLC number (by='oclc')
+        or ISBN (by='isbn'), reading the holdings from the store if possible.
+        """
+        kind = holdings_kind(by, oclc_symbol)
+        body = self.get(kind, number)
+        if body is None:
+            body = self._fetch_holdings(auth, by, number, oclc_symbol, **kwargs)
+        return WorldcatHoldings(body).has_holdings
+
+    def warm(self, auth, identifiers, kind='isbn', oclc_symbol=None, max_workers=4, **kwargs):
+        """
+        Fetch and store every identifier that isn't stored yet.
+
+        :param identifiers: ISBNs or OCLC numbers
+        :param kind: 'isbn' or 'oclc_number' for records, or with oclc_symbol
+            'isbn' or 'oclc' for that symbol's holdings
+        :param oclc_symbol: Warm holdings for this symbol instead of records
+        :param max_workers: Number of records fetched at once
+
+        :return: The number of identifiers fetched
+        """
+        if oclc_symbol is None:
+            missing = self.missing(kind, identifiers)
+
+            def fetch(identifier):
+                self._fetch_resource(auth, kind, identifier, **kwargs)
+        else:
+            missing = self.missing(holdings_kind(kind, oclc_symbol), identifiers)
+
+            def fetch(identifier):
+                self._fetch_holdings(auth, kind, identifier, oclc_symbol, **kwargs)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            list(pool.map(fetch, missing))
+        return len(missing)
+
+    def _fetch_resource(self, auth, kind, identifier, **kwargs):
+        requestor = worldcat_request(auth, **kwargs)
+        r = requestor.send_request(kind, url_params={'number': identifier},
+                                   query_params={'servicelevel': 'full'})
+        if r.status_code == 200:
+            self.put(kind, identifier, r.content)
+            if kind == 'isbn':
+                try:
+                    self.put('oclc_number', WorldcatResource(auth, r.content).oclc_number, r.content)
+                except AttributeError:
+                    pass
+        return r.content
+
+    def _fetch_holdings(self, auth, by, number, oclc_symbol, **kwargs):
+        requestor = worldcat_library_request(auth, **kwargs)
+        r = requestor.send_request(by, url_params={'number': number},
+                                   query_params={'servicelevel': 'full', 'oclcsymbol': oclc_symbol})
+        if r.status_code == 200:
+            self.put(holdings_kind(by, oclc_symbol), number, r.content)
+        return r.content
+
+    def _expired(self, stored, now):
+        return self.ttl is not None and stored + self.ttl <= now
+
+    def _evict(self, conn, now):
+        """Drop expired records, then the least recently read until both bounds hold."""
+        if self.ttl is not None:
+            conn.execute('DELETE FROM records WHERE stored <= ?', (now - self.ttl,))
+        if self.max_entries is None and self.max_bytes is None:
+            return
+        entries, total = conn.execute('SELECT entries, bytes FROM stats').fetchone()
+
+        def over():
+            return ((self.max_entries is not None and entries > self.max_entries) or
+                    (self.max_bytes is not None and total > self.max_bytes))
+
+        if not over():
+            return
+        doomed = []
+        for rowid, size in conn.execute('SELECT rowid, size FROM records ORDER BY accessed'):
+            if not over():
+                break
+            doomed.append((rowid,))
+            entries -= 1
+            total -= size
+        conn.executemany('DELETE FROM records WHERE rowid = ?', doomed)
+
+    def _prepare_stats(self):
+        """Set up the running totals, sizing the records of a store made before they existed."""
+        with self.db.transaction() as conn:
+            if 'size' not in [column[1] for column in conn.execute('PRAGMA table_info(records)')]:
+                conn.execute('ALTER TABLE records ADD COLUMN size INTEGER')
+                conn.execute('UPDATE records SET size = LENGTH(body)')
+            for statement in STATS_SCHEMA:
+                conn.execute(statement)
+            if conn.execute('SELECT COUNT(*) FROM stats').fetchone()[0] == 0:
+                conn.execute('INSERT INTO stats (id, entries, bytes) '
+                             'SELECT 0, COUNT(*), COALESCE(SUM(size), 0) FROM records')
+
+    def __len__(self):
+        return self.db.connection().execute('SELECT entries FROM stats').fetchone()[0]
+
+
+def holdings_kind(by, oclc_symbol):
+    return 'holdings:{by}:{symbol}'.format(by=by, symbol=oclc_symbol)
@@ -1,26 +1,224 @@
+import threading
+
 import requests
+from requests.adapters import HTTPAdapter
 
+from .cache import cache_key
+from .codec import default_codec
 from .urlmanager import Urls
 
 
+class Transport(object):
+    """
+    A pooled, keep-alive HTTP session that can be shared between requestors.
+
+    Connections are kept open and reused per host, so only the first request
+    to e.g. acq.sd00.worldcat.org pays for the TCP and TLS handshakes.
+    """
+
+    def __init__(self, pool_connections=10, pool_maxsize=10, keep_alive=True, session=None):
+        """
+        :param pool_connections: Number of hosts to keep a connection pool for
+        :param pool_maxsize: Maximum number of open connections kept per host
+        :param keep_alive: Reuse connections between requests, if False every
+            connection is closed once its response has been read
+        :param session: An existing requests.Session to send through, the
+            pool settings are left alone if one is given
+        """
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_connections,
+                                  pool_maxsize=pool_maxsize)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+        if not keep_alive:
+            session.headers['Connection'] = 'close'
+        self.session = session
+        self.closed = False
+
+    def request(self, http_verb, url, **kwargs):
+        """Send a request through the pooled session, returning a Requests response."""
+        return self.session.request(http_verb, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def close(self):
+        """Close every pooled connection."""
+        self.session.close()
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+_default_transport = None
+_default_transport_lock = threading.Lock()
+
+
+def get_default_transport():
+    """
+    Return the transport shared by every requestor that wasn't given one,
+    creating it on first use or after it has been closed.
+    """
+    global _default_transport
+    with _default_transport_lock:
+        if _default_transport is None or _default_transport.closed:
+            _default_transport = Transport()
+        return _default_transport
+
+
+def set_default_transport(transport):
+    """Replace the shared transport, e.g. with one that has a bigger pool."""
+    global _default_transport
+    with _default_transport_lock:
+        _default_transport = transport
+
+
+def close_default_transport():
+    """
+    Close the shared transport's connections, e.g. at exit. Requestors
+    never do this themselves; the next one to be made opens a new one.
+    """
+    with _default_transport_lock:
+        if _default_transport is not None:
+            _default_transport.close()
+
+
 class Requestor(object):
+    """
+    Base for requestors. Class attributes hold defaults for every requestor
+    that isn't given its own, e.g. Requestor.retry_policy = RetryPolicy()
+    retries requests made by all of the module level helpers.
+
+    codec encodes JSON request bodies and decodes JSON responses (see
+    codec.py), the fastest one installed unless replaced.
+    """
+
+    retry_policy = None
+    rate_limiter = None
+    conditional_cache = None
+    codec = default_codec()
 
-    def __init__(self, auth, urls):
+    def __init__(self, auth, urls, transport=None, retry_policy=None, rate_limiter=None,
+                 conditional_cache=None, codec=None):
         self.auth = auth
         self.url = Urls(urls)
+        # A transport handed over is the requestor's to close, the shared one is left alone
+        self._owns_transport = transport is not None
+        self.transport = transport if transport is not None else get_default_transport()
+        if retry_policy is not None:
+            self.retry_policy = retry_policy
+        if rate_limiter is not None:
+            self.rate_limiter = rate_limiter
+        if conditional_cache is not None:
+            self.conditional_cache = conditional_cache
+        if codec is not None:
+            self.codec = codec
 
     def send_request(self, action, url_params=None, query_params=None, data=None):
         raise NotImplementedError
 
+    def decode(self, response):
+        """Decode a JSON response body with the requestor's codec."""
+        return self.codec.decode(response.content)
+
+    def _send(self, http_verb, url, **kwargs):
+        """
+        Send a request, revalidating GETs against the conditional cache if
+        there is one: the ETag and Last-Modified of the response held for
+        the URL are sent as If-None-Match and If-Modified-Since, and a 304
+        is answered with the held response.
+        """
+        if http_verb != 'GET' or self.conditional_cache is None:
+            return self._send_attempts(http_verb, url, **kwargs)
+
+        key = cache_key(url)
+        held = self.conditional_cache.get(key)
+        headers = kwargs.pop('headers', None)
+
+        def conditional_headers():
+            merged = dict((headers() if callable(headers) else headers) or {})
+            merged.update(validators(held))
+            return merged
+
+        r = self._send_attempts(http_verb, url, headers=conditional_headers, **kwargs)
+        if r.status_code == 304 and held is not None:
+            return held
+        if r.status_code == 200 and validators(r):
+            self.conditional_cache.set(key, r)
+        return r
+
+    def _send_attempts(self, http_verb, url, **kwargs):
+        """
+        Send through the transport, waiting on the requestor's and the auth's
+        rate limiters before every attempt and retrying per the retry policy
+        if there is one. A callable headers kwarg is called anew per attempt.
+        """
+        headers = kwargs.pop('headers', None)
+        limiters = [limiter for limiter in (self.rate_limiter, getattr(self.auth, 'rate_limiter', None))
+                    if limiter is not None]
+
+        def send():
+            for limiter in limiters:
+                limiter.acquire(key=getattr(self.auth, 'key', None), url=url)
+            return self.transport.request(http_verb, url,
+                                          headers=headers() if callable(headers) else headers,
+                                          **kwargs)
+
+        if self.retry_policy is None:
+            return send()
+        return self.retry_policy.call(http_verb, url, send)
+
+    def close(self):
+        """
+        Close the transport the requestor was given. The shared transport
+        stays open for other requestors, see close_default_transport.
+        """
+        if self._owns_transport:
+            self.transport.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+def validators(response):
+    """The conditional request headers that revalidate a held response."""
+    headers = {}
+    if response is None:
+        return headers
+    if 'ETag' in response.headers:
+        headers['If-None-Match'] = response.headers['ETag']
+    if 'Last-Modified' in response.headers:
+        headers['If-Modified-Since'] = response.headers['Last-Modified']
+    return headers
+
 
 class HMACRequest(Requestor):
 
-    def __init__(self, auth, urls):
+    def __init__(self, auth, urls, transport=None, retry_policy=None, rate_limiter=None,
+                 conditional_cache=None, codec=None):
         """
         :param auth: An authorization object built from auth.py
         :param urls: A dict of urls with a url and verb property, see constants.py
+        :param transport: A Transport to send requests through, defaults to
+            the shared one from get_default_transport
+        :param retry_policy: A retry.RetryPolicy, defaults to Requestor.retry_policy
+        :param rate_limiter: A ratelimit.RateLimiter, defaults to Requestor.rate_limiter
+        :param conditional_cache: A cache.ResponseCache of GET responses to
+            revalidate, defaults to Requestor.conditional_cache
+        :param codec: A codec.JSONCodec or codec.OrjsonCodec, defaults to
+            Requestor.codec
         """
-        super(HMACRequest, self).__init__(auth, urls)
+        super(HMACRequest, self).__init__(auth, urls, transport=transport,
+                                          retry_policy=retry_policy, rate_limiter=rate_limiter,
+                                          conditional_cache=conditional_cache, codec=codec)
 
     def send_request(self, action, url_params=None, query_params=None, data=None):
         """
@@ -37,22 +235,52 @@ class HMACRequest(Requestor):
                                url_params,
                                params=query_params)
         http_verb = self.url.get_http_verb(action)
-        r = requests.request(http_verb,
-                             url,
-                             json=data,
-                             headers=self.auth.get_header(http_verb, url))
+        r = self._send(http_verb,
+                       url,
+                       data=self.codec.encode(data) if data is not None else None,
+                       headers=lambda: self.auth.get_header(http_verb, url))
         self.auth.set_etag(r)
         return r
 
 
+class AccessTokenRequest(HMACRequest):
+    """
+    Send requests authorized by an auth.AccessTokenAuth. A request rejected
+    with a 401 is sent once more after forcing a token refresh, in case the
+    token was revoked or expired early.
+    """
+
+    def send_request(self, action, url_params=None, query_params=None, data=None):
+        r = super(AccessTokenRequest, self).send_request(action, url_params, query_params, data)
+        if r.status_code == 401:
+            self.auth.refresh(force=True)
+            r = super(AccessTokenRequest, self).send_request(action, url_params, query_params, data)
+        return r
+
+
 class WSKeyLiteRequest(Requestor):
 
-    def __init__(self, auth, urls):
+    cache = None
+
+    def __init__(self, auth, urls, transport=None, retry_policy=None, rate_limiter=None,
+                 conditional_cache=None, cache=None):
         """
         :param auth: An authorization object built from auth.py
         :param urls: A dict of urls with a url and verb property, see constants.py
+        :param transport: A Transport to send requests through, defaults to
+            the shared one from get_default_transport
+        :param retry_policy: A retry.RetryPolicy, defaults to Requestor.retry_policy
+        :param rate_limiter: A ratelimit.RateLimiter, defaults to Requestor.rate_limiter
+        :param conditional_cache: A cache.ResponseCache of GET responses to
+            revalidate, defaults to Requestor.conditional_cache
+        :param cache: A cache.ResponseCache for successful responses, defaults
+            to WSKeyLiteRequest.cache
         """
-        super(WSKeyLiteRequest, self).__init__(auth, urls)
+        super(WSKeyLiteRequest, self).__init__(auth, urls, transport=transport,
+                                               retry_policy=retry_policy, rate_limiter=rate_limiter,
+                                               conditional_cache=conditional_cache)
+        if cache is not None:
+            self.cache = cache
 
     def send_request(self, action, url_params=None, query_params=None, data=None):
         """
@@ -69,4 +297,13 @@ class WSKeyLiteRequest(Requestor):
             query_params = {}
         query_params.update({'wskey': self.auth.key})
         url = self.url.get_url(action, url_params, params=query_params)
-        return requests.get(url)
+        if self.cache is None:
+            return self._send('GET', url)
+
+        key = cache_key(url)
+        r = self.cache.get(key)
+        if r is None:
+            r = self._send('GET', url)
+            if r.status_code == 200:
+                self.cache.set(key, r)
+        return r
@@ -0,0 +1,124 @@
+import email.utils
+import random
+import threading
+import time
+from collections import deque, namedtuple
+
+from requests.exceptions import ConnectionError, ConnectTimeout, Timeout
+
+IDEMPOTENT_VERBS = frozenset(['GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'])
+
+Attempt = namedtuple('Attempt', 'http_verb url number status_code error elapsed wait')
+
+
+class RetryPolicy(object):
+    """
+    Retry throttled or failed requests with exponential backoff and full jitter.
+
+    Only idempotent verbs are retried on 5xx responses and dropped
+    connections. A POST (e.g. attach_item_to_order) could already have been
+    processed, so it is only retried when the server says it wasn't: a 429
+    or a connection that was never established.
+
+    Every attempt is recorded as an Attempt in self.history and passed to
+    on_attempt, if given. self.retries counts attempts that were followed by
+    another, self.giveups requests that were still failing when it stopped.
+    """
+
+    def __init__(self, max_attempts=5, backoff_factor=0.5, max_backoff=30, max_retry_after=120,
+                 retry_statuses=(429, 500, 502, 503, 504), retry_non_idempotent=False,
+                 on_attempt=None, history_size=1000, sleep=time.sleep):
+        """
+        :param max_attempts: Total number of tries, including the first
+        :param backoff_factor: Base delay in seconds, doubled after each attempt
+        :param max_backoff: Upper bound for a computed delay
+        :param max_retry_after: Upper bound for a delay asked for by Retry-After
+        :param retry_statuses: Status codes that are worth another try
+        :param retry_non_idempotent: Retry POSTs like any other verb
+        :param on_attempt: Callable given an Attempt after every try
+        :param history_size: How many Attempts to keep in self.history
+        :param sleep: Function used to wait between attempts
+        """
+        self.max_attempts = max_attempts
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = frozenset(retry_statuses)
+        self.retry_non_idempotent = retry_non_idempotent
+        self.on_attempt = on_attempt
+        self.sleep = sleep
+        self.history = deque(maxlen=history_size)
+        self.retries = 0
+        self.giveups = 0
+        self._lock = threading.Lock()
+
+    def call(self, http_verb, url, send):
+        """
+        Call send until it returns a response that needn't be retried or
+        attempts run out, returning the last response.
+
+        :param http_verb: The request's verb, to decide if it is safe to replay
+        :param url: The request's URL, for the attempt metrics
+        :param send: A callable that sends the request and returns a response,
+            called again for every attempt so e.g. signatures are fresh
+        """
+        number = 0
+        while True:
+            number += 1
+            started = time.time()
+            try:
+                response, error = send(), None
+            except (ConnectionError, Timeout) as e:
+                response, error = None, e
+            elapsed = time.time() - started
+
+            retry = number < self.max_attempts and self._should_retry(http_verb, response, error)
+            wait = self.backoff(number, response) if retry else 0
+            self._record(Attempt(http_verb, url, number,
+                                 getattr(response, 'status_code', None), error, elapsed, wait), retry)
+            if not retry:
+                if error is not None:
+                    raise error
+                return response
+            self.sleep(wait)
+
+    def backoff(self, number, response=None):
+        """Seconds to wait after attempt number, preferring the server's Retry-After."""
+        retry_after = parse_retry_after(response)
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        ceiling = min(self.max_backoff, self.backoff_factor * (2 ** (number - 1)))
+        return random.uniform(0, ceiling)
+
+    def _should_retry(self, http_verb, response, error):
+        idempotent = self.retry_non_idempotent or http_verb.upper() in IDEMPOTENT_VERBS
+        if error is not None:
+            return idempotent or isinstance(error, ConnectTimeout)
+        if response.status_code not in self.retry_statuses:
+            return False
+        return idempotent or response.status_code == 429
+
+    def _record(self, attempt, retrying):
+        with self._lock:
+            self.history.append(attempt)
+            if retrying:
+                self.retries += 1
+            elif attempt.error is not None or attempt.status_code in self.retry_statuses:
+                self.giveups += 1
+        if self.on_attempt is not None:
+            self.on_attempt(attempt)
+
+
+def parse_retry_after(response):
+    """Seconds asked for by a Retry-After header, given as seconds or an HTTP date."""
+    try:
+        value = response.headers['Retry-After']
+    except (AttributeError, KeyError, TypeError):
+        return None
+    try:
+        return max(0, float(value))
+    except ValueError:
+        parsed = email.utils.parsedate_tz(value)
+        if parsed is None:
+            return None
+        return max(0, email.utils.mktime_tz(parsed) - time.time())
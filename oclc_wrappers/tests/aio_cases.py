@@ -0,0 +1,243 @@
+"""The tests of oclc_wrappers.aio, imported by test_aio.py on Python 3.5 and later."""
+import asyncio
+import json
+import unittest
+import warnings
+from unittest import mock
+
+from six.moves.urllib.parse import parse_qs, urlparse
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from oclc_wrappers.auth import Auth
+from oclc_wrappers.constants import ITEM_URLS, PO_URLS
+from oclc_wrappers.tests.configTest import config_object
+
+if aiohttp is not None:
+    from oclc_wrappers.aio import requestor
+    from oclc_wrappers.aio.acquisitions import get_all_records, item_request
+    from oclc_wrappers.aio.kb import KB
+
+
+def run(coroutine):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coroutine)
+    finally:
+        loop.close()
+
+
+class FakeResponse(object):
+
+    def __init__(self, session, method, url, kwargs):
+        self.session = session
+        self.request = (method, url, kwargs)
+        self.url = url
+        self.headers = {}
+
+    async def __aenter__(self):
+        self.session.in_flight += 1
+        self.session.most_in_flight = max(self.session.most_in_flight, self.session.in_flight)
+        # Let every other request that is allowed to start do so
+        for _ in range(3):
+            await asyncio.sleep(0)
+        self.session.sent.append(self.request)
+        self.status, self._body = self.session.handler(*self.request)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.session.in_flight -= 1
+
+    async def read(self):
+        return self._body
+
+
+class FakeSession(object):
+    """Stands in for aiohttp.ClientSession, answering every request with handler(method, url, kwargs)."""
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.sent = []
+        self.in_flight = 0
+        self.most_in_flight = 0
+        self.closed = False
+        self.made = 0
+
+    def __call__(self, connector=None):
+        self.made += 1
+        self.closed = False
+        return self
+
+    def request(self, method, url, **kwargs):
+        return FakeResponse(self, method, url, kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    async def close(self):
+        self.closed = True
+
+
+class SigningAuth(Auth):
+    """An Auth whose signatures are predictable, recording what it signed."""
+
+    def __init__(self, *args, **kwargs):
+        super(SigningAuth, self).__init__(*args, **kwargs)
+        self.signed = []
+
+    def get_signature(self, http_verb, url):
+        self.signed.append((http_verb, url))
+        return 'signature {}'.format(len(self.signed))
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp is not installed')
+class AsyncTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.session = FakeSession(self.answer)
+        patches = [mock.patch.object(aiohttp, 'ClientSession', self.session),
+                   mock.patch.object(aiohttp, 'TCPConnector'),
+                   mock.patch.object(requestor, '_default_transport', None)]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    def answer(self, method, url, kwargs):
+        return 200, b'{}'
+
+
+class TestAsyncHMACRequest(AsyncTestCase):
+
+    def test_requests_are_signed_for_the_url_and_verb_sent(self):
+        auth = SigningAuth(config_object)
+        po_requestor = requestor.AsyncHMACRequest(auth, PO_URLS)
+        items_requestor = requestor.AsyncHMACRequest(auth, ITEM_URLS)
+
+        async def send():
+            await po_requestor.send_request('create', data={'orderName': 'Firm order'})
+            await items_requestor.send_request('list', url_params={'order': 'PO-1'},
+                                               query_params={'startIndex': 11})
+        run(send())
+
+        self.assertEqual([(method, url) for method, url, _ in self.session.sent], auth.signed)
+        (_, _, post), (_, list_url, get) = self.session.sent
+        self.assertEqual('signature 1', post['headers']['Authorization'])
+        self.assertEqual('application/json', post['headers']['Content-Type'])
+        self.assertEqual({'orderName': 'Firm order'}, json.loads(post['data'].decode('utf-8')))
+        self.assertEqual('signature 2', get['headers']['Authorization'])
+        self.assertEqual(['11'], parse_qs(urlparse(list_url).query)['startIndex'])
+
+
+class TestAsyncGetAllRecords(AsyncTestCase):
+
+    def answer(self, method, url, kwargs):
+        start = int(parse_qs(urlparse(url).query)['startIndex'][0])
+        return 200, json.dumps({'totalResults': 35, 'entry': [{'n': n} for n in range(start, min(start + 10, 36))]}
+                               ).encode('utf-8')
+
+    def test_every_page_is_fetched_once_and_kept_in_order(self):
+        async def fetch():
+            return await get_all_records(item_request(Auth(config_object)), 'list', url_params={'order': 'PO-1'})
+        records = run(fetch())
+
+        self.assertEqual(list(range(1, 36)), [record['n'] for record in records])
+        starts = [parse_qs(urlparse(url).query)['startIndex'][0] for _, url, _ in self.session.sent]
+        self.assertEqual('1', starts[0])
+        self.assertEqual(['11', '21', '31'], sorted(starts[1:]))
+
+    def test_remaining_pages_are_fetched_concurrently_up_to_the_cap(self):
+        transport = requestor.AsyncTransport(max_concurrency=2)
+
+        async def fetch():
+            return await get_all_records(item_request(Auth(config_object), transport=transport), 'list',
+                                         url_params={'order': 'PO-1'})
+        run(fetch())
+        self.assertEqual(2, self.session.most_in_flight)
+
+
+class TestAsyncKBEntries(AsyncTestCase):
+
+    def answer(self, method, url, kwargs):
+        start = kwargs['params']['startIndex']
+        return 200, json.dumps({'entries': [{'n': n} for n in range(start, min(start + 50, 121))]}
+                               ).encode('utf-8')
+
+    def starts(self):
+        return [kwargs['params']['startIndex'] for _, _, kwargs in self.session.sent]
+
+    def test_entries_are_iterated_a_page_at_a_time(self):
+        async def fetch():
+            entries = []
+            async for entry in KB('hipHipHooray').iter_entries('abc'):
+                entries.append(entry)
+            return entries
+        entries = run(fetch())
+
+        self.assertEqual(list(range(1, 121)), [entry['n'] for entry in entries])
+        self.assertEqual([1, 51, 101], self.starts())
+
+    def test_all_entries_are_gathered_into_a_list(self):
+        entries = run(KB('hipHipHooray').get_all_entries('abc'))
+
+        self.assertEqual(list(range(1, 121)), [entry['n'] for entry in entries])
+        self.assertEqual([1, 51, 101], self.starts())
+
+    def test_next_page_is_fetched_while_the_current_one_is_consumed(self):
+        async def first_entry(prefetch):
+            entries = KB('hipHipHooray').iter_entries('abc', prefetch=prefetch)
+            entry = await entries.__anext__()
+            for _ in range(10):
+                await asyncio.sleep(0)
+            return entry
+
+        self.assertEqual({'n': 1}, run(first_entry(prefetch=True)))
+        self.assertEqual([1, 51], self.starts())
+        del self.session.sent[:]
+        run(first_entry(prefetch=False))
+        self.assertEqual([1], self.starts())
+
+
+class TestAsyncTransport(AsyncTestCase):
+
+    def test_leaving_the_context_closes_the_session(self):
+        async def use():
+            async with requestor.AsyncTransport() as transport:
+                await transport.get('https://worldcat.org/webservices/kb/rest/collections/1')
+            return transport
+        transport = run(use())
+        self.assertTrue(self.session.closed)
+        self.assertTrue(transport.closed)
+
+    def test_requestors_can_be_made_outside_of_an_event_loop(self):
+        # As on Python 3.14, where there is no implicit event loop any more
+        no_loop = mock.patch.object(asyncio, 'get_event_loop', side_effect=RuntimeError('no current event loop'))
+        with warnings.catch_warnings(), no_loop:
+            warnings.simplefilter('error')
+            kb_requestor = requestor.AsyncWSKeyLiteRequest(Auth(config_object), PO_URLS)
+            kb = KB('hipHipHooray')
+        self.assertEqual(0, self.session.made)
+
+        async def use():
+            await kb_requestor.send_request('read', url_params={'order': 'PO-1'})
+            await kb.get_collection('1')
+            return kb_requestor.transport, kb.transport
+        first, second = run(use())
+        self.assertIs(first, second)
+        self.assertEqual(1, self.session.made)
+
+    def test_closed_default_transport_is_replaced(self):
+        async def use():
+            transport = requestor.get_default_transport()
+            await transport.get('https://worldcat.org/webservices/kb/rest/collections/1')
+            await transport.close()
+            return transport, requestor.get_default_transport()
+        closed, replacement = run(use())
+        self.assertTrue(closed.closed)
+        self.assertIsNot(closed, replacement)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import unittest
+
+from httmock import HTTMock, response, urlmatch
+from six.moves.urllib.parse import parse_qs
+
+from oclc_wrappers.acquisitions import (Item, attach_items_to_order, get_all_records, item_request,
+                                        iter_all_records, remaining_page_starts)
+from oclc_wrappers.auth import Auth
+from oclc_wrappers.oclc_exceptions import ValidationError
+from oclc_wrappers.tests.configTest import config_object
+
+
+@urlmatch(netloc=r'acq\.sd00\.worldcat\.org$', path=r'.*/items$')
+def items_mock(url, request):
+    query = parse_qs(url.query)
+    start = int(query['startIndex'][0])
+    per_page = int(query['itemsPerPage'][0])
+    end = min(start + per_page, 36)
+    return json.dumps({'totalResults': 35,
+                       'entry': [{'orderItemNumber': str(i)} for i in range(start, end)]})
+
+
+class TestGetAllRecords(unittest.TestCase):
+
+    def setUp(self):
+        self.requestor = item_request(Auth(config_object))
+
+    def test_remaining_page_starts(self):
+        self.assertEqual([11, 21, 31], remaining_page_starts(35, 10))
+        self.assertEqual([], remaining_page_starts(10, 10))
+
+    def test_records_in_order_one_page_at_a_time(self):
+        with HTTMock(items_mock):
+            records = get_all_records(self.requestor, 'list', url_params={'order': 'PO-1'})
+        self.assertEqual([str(i) for i in range(1, 36)],
+                         [record['orderItemNumber'] for record in records])
+
+    def test_records_in_order_with_workers_and_page_size(self):
+        with HTTMock(items_mock):
+            records = get_all_records(self.requestor, 'list', url_params={'order': 'PO-1'},
+                                      page_size=4, max_workers=4)
+        self.assertEqual([str(i) for i in range(1, 36)],
+                         [record['orderItemNumber'] for record in records])
+
+    def test_iterating_over_records_with_prefetch(self):
+        with HTTMock(items_mock):
+            records = iter_all_records(self.requestor, 'list', url_params={'order': 'PO-1'}, page_size=8)
+            self.assertEqual({'orderItemNumber': '1'}, next(records))
+            remaining = list(records)
+        self.assertEqual([str(i) for i in range(2, 36)],
+                         [record['orderItemNumber'] for record in remaining])
+
+
+class TestAttachItemsToOrder(unittest.TestCase):
+
+    def test_failures_are_reported_without_stopping_the_batch(self):
+        @urlmatch(netloc=r'acq\.sd00\.worldcat\.org$', method='POST')
+        def create_mock(url, request):
+            item = json.loads(request.body)
+            if item.get('orderingPrice') is None:
+                return response(400, b'{"message": "orderingPrice is required"}', request=request)
+            item['orderItemNumber'] = 'PO-1_{}'.format(item['orderingPrice'])
+            return response(201, json.dumps(item).encode('utf-8'), request=request)
+
+        auth = Auth(config_object)
+        items = [Item(auth, orderingPrice=price) for price in (10, None, 30)]
+        with HTTMock(create_mock):
+            result = attach_items_to_order(auth, 'PO-1', items, max_workers=3)
+        self.assertFalse(result.ok)
+        self.assertEqual(['PO-1_10', 'PO-1_30'], result.order_item_numbers)
+        self.assertEqual('PO-1_10', items[0].order_item_number)
+        self.assertEqual(1, result.failed[0].index)
+        self.assertIn(b'orderingPrice', result.failed[0].error.r)
+
+    def test_invalid_items_are_rejected_without_a_request(self):
+        posted = []
+
+        @urlmatch(netloc=r'acq\.sd00\.worldcat\.org$', method='POST')
+        def create_mock(url, request):
+            posted.append(request.body)
+            return response(201, request.body, request=request)
+
+        auth = Auth(config_object)
+        items = [Item(auth, orderingPrice=10), Item(auth, orderingPrice=20)]
+        with HTTMock(create_mock):
+            result = attach_items_to_order(auth, 'PO-1', items, validate=True)
+        self.assertEqual([], posted)
+        self.assertEqual([0, 1], [failed.index for failed in result.failed])
+        self.assertIsInstance(result.failed[0].error, ValidationError)
+
+
+if __name__ == '__main__':
+    unittest.main()
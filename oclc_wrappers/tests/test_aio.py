@@ -0,0 +1,13 @@
+import sys
+import unittest
+
+# The async tests use syntax Python 2 and 3.4 can't even import
+if sys.version_info >= (3, 5):
+    from oclc_wrappers.tests.aio_cases import (TestAsyncGetAllRecords, TestAsyncHMACRequest, TestAsyncKBEntries,
+                                               TestAsyncTransport)
+
+    __all__ = ['TestAsyncGetAllRecords', 'TestAsyncHMACRequest', 'TestAsyncKBEntries', 'TestAsyncTransport']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from httmock import HTTMock, all_requests, response, urlmatch
+
+from oclc_wrappers.acquisitions import po_request
+from oclc_wrappers.auth import AccessTokenAuth, Auth, ETagRegistry
+from oclc_wrappers.constants import PO_URLS
+from oclc_wrappers.requestor import AccessTokenRequest
+from oclc_wrappers.tests.configTest import config_object
+
+PO_URL = 'https://acq.sd00.worldcat.org/purchaseorders/{}'
+
+
+class TestETags(unittest.TestCase):
+
+    def setUp(self):
+        self.auth = Auth(config_object)
+
+    def test_registry_ignores_query_strings(self):
+        registry = ETagRegistry()
+        registry.set(PO_URL.format('PO-1') + '?startIndex=1', '"a"')
+        self.assertEqual('"a"', registry.get(PO_URL.format('PO-1')))
+        self.assertIsNone(registry.get(PO_URL.format('PO-2')))
+
+    def test_put_sends_the_etag_of_its_own_resource(self):
+        sent = {}
+
+        @all_requests
+        def po_mock(url, request):
+            order = url.path.split('/')[-1]
+            if request.method == 'PUT':
+                sent[order] = request.headers.get('If-Match')
+            return response(200, b'{}', headers={'ETag': '"{}"'.format(order)}, request=request)
+
+        requestor = po_request(self.auth)
+        with HTTMock(po_mock):
+            requestor.send_request('read', url_params={'order': 'PO-A'})
+            requestor.send_request('read', url_params={'order': 'PO-B'})
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                list(pool.map(lambda order: requestor.send_request('update', url_params={'order': order}, data={}),
+                              ['PO-A', 'PO-B']))
+        self.assertEqual({'PO-A': '"PO-A"', 'PO-B': '"PO-B"'}, sent)
+
+
+class TestAccessTokenAuth(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.token_file = os.path.join(self.directory, 'token.json')
+        self.tokens_issued = 0
+        self.seen = []
+
+        @urlmatch(netloc=r'authn\.sd00\.worldcat\.org$')
+        def token_mock(url, request):
+            self.tokens_issued += 1
+            return json.dumps({'access_token': 'tk_{}'.format(self.tokens_issued), 'expires_in': 1199})
+
+        @urlmatch(netloc=r'acq\.sd00\.worldcat\.org$')
+        def acq_mock(url, request):
+            self.seen.append(request.headers['Authorization'])
+            return '{}'
+
+        self.token_mock = token_mock
+        self.acq_mock = acq_mock
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def make_auth(self):
+        return AccessTokenAuth(config_object, 'WMS_ACQ', token_file=self.token_file, background_refresh=False)
+
+    def test_one_token_is_shared_by_concurrent_requests(self):
+        auth = self.make_auth()
+        with HTTMock(self.token_mock, self.acq_mock):
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                list(pool.map(lambda order: po_request(auth).send_request('read', url_params={'order': order}),
+                              range(8)))
+        self.assertEqual(1, self.tokens_issued)
+        self.assertEqual(['Bearer tk_1'] * 8, self.seen)
+
+    def test_token_is_reused_from_the_token_file(self):
+        with HTTMock(self.token_mock):
+            self.make_auth().token()
+            self.assertEqual('tk_1', self.make_auth().token())
+        self.assertEqual(1, self.tokens_issued)
+
+    def test_rejected_token_is_refreshed_once(self):
+        @urlmatch(netloc=r'acq\.sd00\.worldcat\.org$')
+        def revoked_mock(url, request):
+            self.seen.append(request.headers['Authorization'])
+            if request.headers['Authorization'] == 'Bearer tk_1':
+                return response(401, b'', request=request)
+            return response(200, b'{}', request=request)
+
+        requestor = AccessTokenRequest(self.make_auth(), PO_URLS)
+        with HTTMock(self.token_mock, revoked_mock):
+            r = requestor.send_request('read', url_params={'order': 'PO-1'})
+        self.assertEqual(200, r.status_code)
+        self.assertEqual(['Bearer tk_1', 'Bearer tk_2'], self.seen)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import unittest
+
+from httmock import HTTMock, urlmatch
+
+from oclc_wrappers.auth import Auth
+from oclc_wrappers.cache import ResponseCache, cache_key
+from oclc_wrappers.tests.configTest import config_object
+from oclc_wrappers.worldcat import get_resource_by_isbn
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ResponseCache(ttl=60, max_entries=2, clock=self.clock)
+
+    def test_entries_expire(self):
+        self.cache.set('a', 1)
+        self.assertEqual(1, self.cache.get('a'))
+        self.clock.now += 61
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual((1, 1), (self.cache.hits, self.cache.misses))
+
+    def test_least_recently_used_is_evicted(self):
+        self.cache.set('a', 1)
+        self.cache.set('b', 2)
+        self.cache.get('a')
+        self.cache.set('c', 3)
+        self.assertIsNone(self.cache.get('b'))
+        self.assertEqual(1, self.cache.get('a'))
+
+    def test_cache_key_drops_wskey_and_sorts_query(self):
+        self.assertEqual(cache_key('http://www.worldcat.org/content/isbn/1?servicelevel=full&wskey=abc'),
+                         cache_key('http://www.worldcat.org/content/isbn/1?wskey=xyz&servicelevel=full'))
+
+
+class TestCachedLookups(unittest.TestCase):
+
+    def test_repeat_lookup_skips_the_network(self):
+        calls = []
+
+        @urlmatch(netloc=r'(.*\.)?worldcat\.org$')
+        def resource_mock(url, request):
+            calls.append(url)
+            path = os.path.join(os.path.dirname(__file__), 'resourceXml.xml')
+            with open(path, 'rb') as data:
+                return data.read()
+
+        cache = ResponseCache()
+        auth = Auth(config_object)
+        with HTTMock(resource_mock):
+            first = get_resource_by_isbn(auth, '9780195325959', cache=cache)
+            second = get_resource_by_isbn(auth, '9780195325959', cache=cache)
+        self.assertEqual(first.oclc_number, second.oclc_number)
+        self.assertEqual(1, len(calls))
+        self.assertEqual(1, cache.hits)
+
+
+if __name__ == '__main__':
+    unittest.main()
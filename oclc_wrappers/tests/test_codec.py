@@ -0,0 +1,71 @@
+import json
+import unittest
+
+from httmock import HTTMock, response, urlmatch
+
+from oclc_wrappers.acquisitions import Item, attach_item_to_order, item_request
+from oclc_wrappers.auth import Auth
+from oclc_wrappers.codec import JSONCodec, compact, default_codec, orjson
+from oclc_wrappers.tests.configTest import config_object
+
+
+class TestCompact(unittest.TestCase):
+
+    def test_empty_fields_are_dropped_recursively(self):
+        data = {'a': None, 'b': [], 'c': {'d': None, 'e': [{}]}, 'f': 0, 'g': False, 'h': '',
+                'i': [1, None, {'j': 2, 'k': None}]}
+        self.assertEqual({'f': 0, 'g': False, 'h': '', 'i': [1, {'j': 2}]}, compact(data))
+
+    def test_new_item_keeps_only_populated_fields(self):
+        item = Item(Auth(config_object), orderingPrice=10)
+        item.oclc_number = '123'
+        item.first_percentage = 100
+        self.assertEqual({'orderType': 'FIRM_ORDER', 'orderingPrice': 10,
+                          'resource': {'worldcatResource': {'oclcNumber': '123'}},
+                          'copyConfigs': {'copyConfig': [{'booking': [{'percentage': 100}]}]}},
+                         item.compact())
+
+
+class TestCodecs(unittest.TestCase):
+
+    def test_codecs_round_trip(self):
+        data = {'name': u'caf\xe9', 'numbers': [1, 2.5], 'nested': {'ok': True}}
+        codecs = [JSONCodec(), default_codec()]
+        for codec in codecs:
+            self.assertEqual(data, codec.decode(codec.encode(data)))
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_fastest_codec_is_the_default(self):
+        self.assertEqual('OrjsonCodec', type(default_codec()).__name__)
+
+    def test_bodies_are_compact_and_use_the_requestors_codec(self):
+        bodies = []
+
+        @urlmatch(netloc=r'acq\.sd00\.worldcat\.org$', method='POST')
+        def create_mock(url, request):
+            bodies.append(request.body)
+            item = json.loads(request.body)
+            item['orderItemNumber'] = 'PO-1_1'
+            return response(201, json.dumps(item).encode('utf-8'), request=request)
+
+        class CountingCodec(JSONCodec):
+            decoded = 0
+
+            def decode(self, content):
+                CountingCodec.decoded += 1
+                return super(CountingCodec, self).decode(content)
+
+        auth = Auth(config_object)
+        item = Item(auth, orderingPrice=10)
+        with HTTMock(create_mock):
+            new_item = attach_item_to_order(auth, 'PO-1', item._data)
+            requestor = item_request(auth, codec=CountingCodec())
+            requestor.decode(requestor.send_request('create', url_params={'order': 'PO-1'}, data={'a': 1}))
+        self.assertEqual('PO-1_1', new_item.order_item_number)
+        self.assertNotIn(b'null', bodies[0])
+        self.assertLess(len(bodies[0]), len(json.dumps(item._data)) / 4)
+        self.assertEqual(1, CountingCodec.decoded)
+
+
+if __name__ == '__main__':
+    unittest.main()
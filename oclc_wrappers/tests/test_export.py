@@ -0,0 +1,72 @@
+import json
+import unittest
+
+from httmock import HTTMock, urlmatch
+
+from oclc_wrappers import export
+from oclc_wrappers.auth import Auth
+from oclc_wrappers.export import booking_rows, export_bookings
+from oclc_wrappers.tests.configTest import config_object
+
+
+def item(number, price, bookings, branch='MAIN'):
+    return {'orderItemNumber': number, 'orderingPrice': price, 'orderType': 'FIRM_ORDER',
+            'resource': {'worldcatResource': {'oclcNumber': '1', 'title': 'A title'}},
+            'copyConfigs': {'copyConfig': [{'branchId': branch, 'copyCount': 1,
+                                            'booking': [{'budgetAccountCode': code, 'percentage': percentage,
+                                                         'amount': None}
+                                                        for code, percentage in bookings]}]}}
+
+
+ORDERS = {
+    'PO-1': [item('PO-1_1', 40, [('BOOKS', 75), ('GIFTS', 25)]), item('PO-1_2', 10, [('BOOKS', 100)])],
+    'PO-2': [item('PO-2_1', 20, [('SERIALS', 100)], branch='LAW')],
+}
+
+
+@urlmatch(netloc=r'acq\.sd00\.worldcat\.org$', path=r'.*/items$')
+def items_mock(url, request):
+    entries = ORDERS[url.path.split('/')[-2]]
+    return json.dumps({'totalResults': len(entries), 'entry': entries})
+
+
+class TestExport(unittest.TestCase):
+
+    def setUp(self):
+        with HTTMock(items_mock):
+            self.table = export_bookings(Auth(config_object), ['PO-1', 'PO-2'])
+
+    def test_one_row_per_booking_in_order(self):
+        self.assertEqual(4, len(self.table))
+        self.assertEqual(['PO-1', 'PO-1', 'PO-1', 'PO-2'], self.table['po_number'])
+        self.assertEqual(['BOOKS', 'GIFTS', 'BOOKS', 'SERIALS'], self.table['fund_code'])
+        self.assertEqual([30.0, 10.0, 10.0, 20.0], self.table['amount'])
+
+    def test_booking_amounts_are_kept_when_given(self):
+        data = item('PO-1_1', 40, [('BOOKS', 100)])
+        data['copyConfigs']['copyConfig'][0]['booking'][0]['amount'] = 35
+        self.assertEqual(35.0, list(booking_rows('PO-1', data))[0][-1])
+
+    def test_group_sums(self):
+        self.assertEqual({'BOOKS': 40.0, 'GIFTS': 10.0, 'SERIALS': 20.0},
+                         dict(self.table.group_sum('fund_code', 'amount')))
+        self.assertEqual({'MAIN': 50.0, 'LAW': 20.0}, dict(self.table.group_sum('branch_id', 'amount')))
+
+    @unittest.skipIf(export.numpy is None, 'numpy is not installed')
+    def test_numpy_columns(self):
+        arrays = self.table.to_numpy()
+        self.assertEqual('float64', str(arrays['amount'].dtype))
+        self.assertEqual(70.0, arrays['amount'].sum())
+
+    @unittest.skipIf(export.pyarrow is None, 'pyarrow is not installed')
+    def test_arrow_table(self):
+        self.assertEqual(4, self.table.to_arrow().num_rows)
+
+    @unittest.skipIf(export.numpy is not None, 'numpy is installed')
+    def test_missing_numpy_is_explained(self):
+        with self.assertRaises(ImportError):
+            self.table.to_numpy()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import json
+import unittest
+from decimal import Decimal
+
+from httmock import HTTMock, urlmatch
+from six.moves.urllib.parse import parse_qs
+
+from oclc_wrappers.auth import Auth
+from oclc_wrappers.fundtree import FundTree, Rollup
+from oclc_wrappers.tests.configTest import config_object
+
+
+def fund(fund_id, code, budgeted, expended, parent=None):
+    amounts = {'amountBudgeted': budgeted, 'amountExpended': expended,
+               'amountEncumbered': 0, 'amountRemaining': budgeted - expended}
+    allocation = dict((name, {'priceSpecification': {'price': price}}) for name, price in amounts.items())
+    allocation['id'] = fund_id
+    data = {'name': code.title(), 'code': code, 'allocation': {'allocation': allocation}}
+    if parent is not None:
+        data['parentFundId'] = parent
+    return data
+
+
+FUNDS = [
+    fund('1', 'books', 1000, 100),
+    fund('2', 'fiction', 300, 50.1, parent='1'),
+    fund('3', 'poetry', 200, 25.2, parent='2'),
+    fund('4', 'serials', 500, 0),
+]
+
+
+class TestFundTree(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0
+        self.searches = []
+
+        @urlmatch(netloc=r'.*\.share\.worldcat\.org$', path=r'.*/fund/search$')
+        def search_mock(url, request):
+            self.searches.append(parse_qs(url.query)['q'][0])
+            return json.dumps({'totalResults': len(FUNDS), 'entry': FUNDS})
+
+        self.mock = search_mock
+        self.tree = FundTree(Auth(config_object), '128807', '2019', ttl=60, clock=lambda: self.now)
+
+    def test_one_search_answers_every_lookup(self):
+        with HTTMock(self.mock):
+            self.assertEqual('fiction', self.tree.get('2').code)
+            self.assertEqual('3', self.tree.by_code('poetry').id)
+            self.assertEqual(['1', '4'], sorted(f.id for f in self.tree.roots()))
+            self.assertEqual(['2', '3'], [f.id for f in self.tree.descendants('1')])
+            self.assertEqual(4, len(self.tree))
+        self.assertEqual(['budgetPeriod:2019'], self.searches)
+
+    def test_rollups_are_exact_sums_over_descendants(self):
+        with HTTMock(self.mock):
+            self.assertEqual(Decimal('175.3'), self.tree.rollup('1').expended)
+            self.assertEqual(Rollup(Decimal(500), Decimal('75.3'), Decimal(0), Decimal('424.7')),
+                             self.tree.rollup('2'))
+            self.assertEqual(Decimal(2000), self.tree.totals().allocation)
+
+    def test_funds_are_searched_again_once_stale(self):
+        with HTTMock(self.mock):
+            self.tree.get('1')
+            self.now = 59
+            self.tree.get('1')
+            self.assertEqual(1, len(self.searches))
+            self.now = 60
+            self.tree.get('1')
+            self.tree.refresh(force=True)
+        self.assertEqual(3, len(self.searches))
+
+
+if __name__ == '__main__':
+    unittest.main()
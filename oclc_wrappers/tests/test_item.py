@@ -1,6 +1,11 @@
 import unittest
 
-from oclc_wrappers.acquisitions import Item
+from httmock import HTTMock, response, urlmatch
+
+from oclc_wrappers.acquisitions import Item, save_items
+from oclc_wrappers.auth import Auth
+from oclc_wrappers.codec import JSONCodec, OrjsonCodec, orjson
+from oclc_wrappers.requestor import Requestor
 from oclc_wrappers.tests.configTest import config_object
 
 
@@ -11,5 +16,108 @@ class TestItem(unittest.TestCase):
         item.add_fund()
         self.assertEqual(2, len(item.copies[0]['booking']))
 
+    def test_template_defaults_are_not_shared(self):
+        first = Item(config_object)
+        first.add_isbn('9780195325959')
+        self.assertEqual([], Item(config_object).worldcat['isbn'])
+
+    def test_wrapping_server_data_fills_in_missing_fields(self):
+        data = {'orderItemNumber': 'PO-1_1', 'orderingPrice': 12.5}
+        item = Item.from_data(config_object, data)
+        self.assertIs(data, item._data)
+        self.assertEqual('FIRM_ORDER', item.order_type)
+        self.assertIsNone(item.first_fund_code)
+
+class TestItemChanges(unittest.TestCase):
+
+    def setUp(self):
+        self.auth = Auth(config_object)
+        self.items = [Item.from_data(self.auth, {'orderItemNumber': 'PO-1_{}'.format(i), 'orderingPrice': 10})
+                      for i in range(1, 4)]
+        self.sent = []
+
+        @urlmatch(netloc=r'acq\.sd00\.worldcat\.org$', method='PUT')
+        def update_mock(url, request):
+            self.sent.append(url.path)
+            return request.body
+
+        self.mock = update_mock
+
+    def test_loaded_item_is_clean_until_changed(self):
+        item = self.items[0]
+        self.assertFalse(item.is_dirty)
+        item.first_copy_branch = 'MAIN'
+        item.price = 12
+        self.assertEqual(['copyConfigs', 'orderingPrice'], item.changed_fields)
+
+    def test_reading_a_loaded_item_takes_no_snapshot(self):
+        item = self.items[0]
+        item.price, item.first_fund_code, item.oclc_number, item.has_multiple_copies
+        self.assertIs(True, item._loaded)
+        self.assertEqual([], item.changed_fields)
+
+    def test_changes_through_handed_out_parts_are_tracked(self):
+        self.items[0]['copyConfigs']['copyConfig'][0]['branchId'] = 'MAIN'
+        self.items[1].first_fund['percentage'] = 50
+        self.items[2].add_isbn('9780195325959')
+        self.assertEqual([['copyConfigs'], ['copyConfigs'], ['resource']],
+                         [item.changed_fields for item in self.items])
+
+    def test_saving_an_unchanged_item_sends_nothing(self):
+        with HTTMock(self.mock):
+            self.assertFalse(self.items[0].save('PO-1'))
+        self.assertEqual([], self.sent)
+
+    def test_bulk_save_only_sends_changed_items(self):
+        self.items[1].price = 15
+        with HTTMock(self.mock):
+            result = save_items(self.auth, 'PO-1', self.items)
+        self.assertEqual(['/purchaseorders/PO-1/items/PO-1_2'], self.sent)
+        self.assertEqual(2, len(result.skipped))
+        self.assertFalse(self.items[1].is_dirty)
+
+    def test_saving_keeps_the_item_when_the_server_sends_no_body(self):
+        for codec in codecs():
+            for status, body in ((204, None), (200, b'')):
+                @urlmatch(netloc=r'acq\.sd00\.worldcat\.org$', method='PUT')
+                def empty_mock(url, request):
+                    return response(status, body, request=request)
+
+                item = Item.from_data(self.auth, {'orderItemNumber': 'PO-1_1', 'orderingPrice': 10})
+                item.price = 20
+                with HTTMock(empty_mock), using_codec(codec):
+                    self.assertTrue(item.save('PO-1'))
+                self.assertEqual('PO-1_1', item.order_item_number)
+                self.assertEqual(20, item.price)
+                self.assertFalse(item.is_dirty)
+
+    def test_bulk_save_fails_unattached_items_and_sends_the_rest(self):
+        self.items[1].price = 15
+        unattached = Item(self.auth)
+        with HTTMock(self.mock):
+            result = save_items(self.auth, 'PO-1', [unattached, self.items[1]])
+        self.assertEqual(['/purchaseorders/PO-1/items/PO-1_2'], self.sent)
+        self.assertEqual([1], [created.index for created in result.created])
+        self.assertEqual([0], [failed.index for failed in result.failed])
+        self.assertIsInstance(result.failed[0].error, ValueError)
+
+
+def codecs():
+    return [JSONCodec()] + ([OrjsonCodec()] if orjson is not None else [])
+
+
+class using_codec(object):
+    """Make every requestor decode with codec for the duration of a with block."""
+
+    def __init__(self, codec):
+        self.codec = codec
+
+    def __enter__(self):
+        self.default, Requestor.codec = Requestor.codec, self.codec
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        Requestor.codec = self.default
+
+
 if __name__ == '__main__':
     unittest.main()
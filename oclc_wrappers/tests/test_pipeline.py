@@ -0,0 +1,134 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+
+from httmock import HTTMock, response, urlmatch
+from requests.exceptions import ReadTimeout
+
+from oclc_wrappers.acquisitions import Item
+from oclc_wrappers.auth import Auth
+from oclc_wrappers.pipeline import OrderImport, item_key
+from oclc_wrappers.tests.configTest import config_object
+
+
+class FakeWMS(object):
+    """Just enough of the acquisitions API to create, list and submit one order."""
+
+    def __init__(self):
+        self.orders = 0
+        self.items = []
+        self.submitted = False
+        self.reject = set()
+        self.time_out = set()
+        self.lock = threading.Lock()
+
+    def mock(self):
+        @urlmatch(netloc=r'acq\.sd00\.worldcat\.org$')
+        def wms_mock(url, request):
+            if url.path == '/purchaseorders':
+                self.orders += 1
+                return response(201, json.dumps({'purchaseOrderNumber': 'PO-1'}).encode('utf-8'), request=request)
+            if url.path.endswith('/submissions'):
+                self.submitted = True
+                return response(201, b'{}', request=request)
+            if request.method == 'GET':
+                return json.dumps({'totalResults': len(self.items), 'entry': self.items})
+            item = json.loads(request.body)
+            if item['resource']['worldcatResource']['oclcNumber'] in self.reject:
+                return response(400, b'{"message": "bad item"}', request=request)
+            with self.lock:
+                item['orderItemNumber'] = 'PO-1_{}'.format(len(self.items) + 1)
+                self.items.append(item)
+            if item['resource']['worldcatResource']['oclcNumber'] in self.time_out:
+                raise ReadTimeout('created, but the response never came')
+            return response(201, json.dumps(item).encode('utf-8'), request=request)
+        return wms_mock
+
+
+class TestOrderImport(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.journal = os.path.join(self.directory, 'journal.sqlite')
+        self.auth = Auth(config_object)
+        self.wms = FakeWMS()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def selection(self):
+        items = []
+        for number in ('111', '222', '333'):
+            item = Item(self.auth)
+            item.oclc_number = number
+            items.append(item)
+        return items
+
+    def run_import(self):
+        with HTTMock(self.wms.mock()):
+            return OrderImport(self.auth, self.journal, 'selection.csv').run('Firm order', 'V1', self.selection())
+
+    def test_rerun_skips_created_items_and_then_submits(self):
+        self.wms.reject.add('222')
+        first = self.run_import()
+        self.assertEqual((2, 1, False), (len(first.created), len(first.failed), first.submitted))
+
+        self.wms.reject.clear()
+        second = self.run_import()
+        self.assertEqual((1, 2, True), (len(second.created), len(second.skipped), second.submitted))
+        self.assertEqual(1, self.wms.orders)
+        posted = [item['resource']['worldcatResource']['oclcNumber'] for item in self.wms.items]
+        self.assertEqual((['111', '333'], '222'), (sorted(posted[:2]), posted[2]))
+
+    def test_pending_item_already_on_the_order_is_not_posted_again(self):
+        job = OrderImport(self.auth, self.journal, 'selection.csv')
+        job._set_job(po_number='PO-1')
+        crashed = self.selection()[0]
+        job._set_item(item_key(crashed, 0), 'pending')
+        self.wms.items.append(dict(crashed._data, orderItemNumber='PO-1_1'))
+
+        result = self.run_import()
+        self.assertEqual(3, len(self.wms.items))
+        self.assertEqual('PO-1_1', result.skipped[0].item.order_item_number)
+        self.assertTrue(result.submitted)
+
+    def test_identical_lines_are_each_posted_after_a_crash(self):
+        selection = self.selection()
+        selection[2].oclc_number = '111'
+        job = OrderImport(self.auth, self.journal, 'selection.csv')
+        job._set_job(po_number='PO-1')
+        job._set_item(item_key(selection[0], 0), 'created', order_item_number='PO-1_1')
+        self.wms.items.append(dict(selection[0]._data, orderItemNumber='PO-1_1'))
+
+        with HTTMock(self.wms.mock()):
+            result = job.run('Firm order', 'V1', selection)
+        self.assertEqual(['111', '222', '111'],
+                         [item['resource']['worldcatResource']['oclcNumber'] for item in self.wms.items])
+        self.assertEqual((2, 1, True), (len(result.created), len(result.skipped), result.submitted))
+
+    def test_key_shared_by_two_items_is_rejected_before_anything_is_sent(self):
+        with HTTMock(self.wms.mock()), self.assertRaises(ValueError):
+            OrderImport(self.auth, self.journal, 'selection.csv').run(
+                'Firm order', 'V1', self.selection(), key=lambda item: 'same')
+        self.assertEqual(0, self.wms.orders)
+
+    def test_item_that_timed_out_is_not_posted_again(self):
+        self.wms.time_out.add('222')
+        first = self.run_import()
+        self.assertEqual((2, 1, False), (len(first.created), len(first.failed), first.submitted))
+        self.assertEqual('pending', OrderImport(self.auth, self.journal, 'selection.csv')._journal()[
+            item_key(first.failed[0].item, first.failed[0].index)][0])
+
+        self.wms.time_out.clear()
+        second = self.run_import()
+        self.assertEqual(3, len(self.wms.items))
+        self.assertEqual(['PO-1_{}'.format(n) for n in range(1, 4)], sorted(
+            created.item.order_item_number for created in second.skipped))
+        self.assertTrue(second.submitted)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,32 @@
+import json
 import unittest
 
-from httmock import HTTMock, urlmatch
+from httmock import HTTMock, response, urlmatch
 
-from oclc_wrappers.acquisitions import PurchaseOrder
+from oclc_wrappers.acquisitions import Item, PurchaseOrder
+from oclc_wrappers.auth import Auth
 from oclc_wrappers.tests.configTest import config_object
+from oclc_wrappers.tests.test_item import codecs, using_codec
+
+
+class FakeOrder(object):
+
+    def __init__(self, count):
+        self.items = [{'orderItemNumber': 'PO-1_{}'.format(i)} for i in range(1, count + 1)]
+        self.pages_served = 0
+
+    def mock(self):
+        @urlmatch(netloc=r'acq\.sd00\.worldcat\.org$', path=r'/purchaseorders/PO-1/items$')
+        def items_mock(url, request):
+            if request.method == 'POST':
+                item = json.loads(request.body)
+                item['orderItemNumber'] = 'PO-1_{}'.format(len(self.items) + 1)
+                self.items.append(item)
+                return response(201, json.dumps(item).encode('utf-8'), request=request)
+            self.pages_served += 1
+            start = int(dict(part.split('=') for part in url.query.split('&'))['startIndex'])
+            return json.dumps({'totalResults': len(self.items), 'entry': self.items[start - 1:start + 9]})
+        return items_mock
 
 
 class TestPurchaseOrder(unittest.TestCase):
@@ -18,5 +41,51 @@ class TestPurchaseOrder(unittest.TestCase):
         blank_po['orderName'] = 'superCool'
 
 
+class TestPurchaseOrderSave(unittest.TestCase):
+
+    def test_saving_keeps_the_order_when_the_server_sends_no_body(self):
+        for codec in codecs():
+            for status, body in ((204, None), (200, b'')):
+                @urlmatch(netloc=r'acq\.sd00\.worldcat\.org$', path=r'/purchaseorders/PO-1$', method='PUT')
+                def empty_mock(url, request):
+                    return response(status, body, request=request)
+
+                po = PurchaseOrder.from_data(Auth(config_object), {'purchaseOrderNumber': 'PO-1',
+                                                                   'orderName': 'Old'})
+                po.name = 'New'
+                with HTTMock(empty_mock), using_codec(codec):
+                    self.assertTrue(po.save())
+                self.assertEqual('PO-1', po.number)
+                self.assertEqual('New', po.name)
+                self.assertFalse(po.is_dirty)
+
+
+class TestPurchaseOrderItems(unittest.TestCase):
+
+    def setUp(self):
+        self.auth = Auth(config_object)
+        self.po = PurchaseOrder(self.auth, purchaseOrderNumber='PO-1')
+        self.order = FakeOrder(25)
+
+    def test_items_are_downloaded_once(self):
+        with HTTMock(self.order.mock()):
+            self.assertEqual(25, len(self.po.po_items))
+            self.assertEqual(25, len([item for item in self.po.po_items]))
+        self.assertEqual(3, self.order.pages_served)
+
+    def test_attaching_through_the_order_refreshes_items(self):
+        with HTTMock(self.order.mock()):
+            self.po.po_items
+            self.po.attach_item(Item(self.auth))
+            self.assertEqual('PO-1_26', self.po.po_items[-1].order_item_number)
+
+    def test_iterating_only_fetches_pages_reached(self):
+        with HTTMock(self.order.mock()):
+            for item in self.po.iter_items():
+                break
+        # the first page, plus at most the one prefetched behind it
+        self.assertLess(self.order.pages_served, 3)
+
+
 if __name__ == '__main__':
     unittest.main()
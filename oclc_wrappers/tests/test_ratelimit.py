@@ -0,0 +1,73 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from httmock import HTTMock, all_requests
+
+from oclc_wrappers.acquisitions import po_request
+from oclc_wrappers.auth import Auth
+from oclc_wrappers.ratelimit import MemoryBuckets, RateLimiter, SQLiteBuckets
+from oclc_wrappers.tests.configTest import config_object
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@all_requests
+def ok_mock(url, request):
+    return '{}'
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def setUp(self):
+        self.waits = []
+        self.limiter = RateLimiter(per_key=2, per_host=1, sleep=self.waits.append)
+        self.clock = FakeClock()
+        self.limiter.buckets = MemoryBuckets(clock=self.clock)
+
+    def test_slowest_bucket_decides_the_wait(self):
+        self.limiter.acquire(key='abc', url='https://acq.sd00.worldcat.org/purchaseorders')
+        self.limiter.acquire(key='abc', url='https://acq.sd00.worldcat.org/purchaseorders')
+        self.assertEqual([1.0], self.waits)
+
+    def test_hosts_are_limited_separately(self):
+        self.limiter.acquire(key='abc', url='https://acq.sd00.worldcat.org/purchaseorders')
+        self.clock.now += 0.5
+        self.limiter.acquire(key='abc', url='http://www.worldcat.org/webservices')
+        self.assertEqual([], self.waits)
+
+    def test_limiter_attached_to_auth_throttles_requests(self):
+        auth = Auth(config_object, rate_limiter=self.limiter)
+        with HTTMock(ok_mock):
+            for _ in range(3):
+                po_request(auth).send_request('read', url_params={'order': 'PO-1'})
+        self.assertEqual([1.0, 2.0], self.waits)
+
+
+class TestSQLiteBuckets(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'buckets.sqlite')
+        self.clock = FakeClock()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_buckets_are_shared_through_the_file(self):
+        first = SQLiteBuckets(self.path, clock=self.clock)
+        second = SQLiteBuckets(self.path, clock=self.clock)
+        self.assertEqual(0, first.reserve('key:abc', 4, 1))
+        self.assertEqual(0.25, second.reserve('key:abc', 4, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from httmock import HTTMock, urlmatch
+
+from oclc_wrappers.auth import Auth
+from oclc_wrappers.recordstore import RecordStore
+from oclc_wrappers.tests.configTest import config_object
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def fixture(name):
+    with open(os.path.join(os.path.dirname(__file__), name), 'rb') as f:
+        return f.read()
+
+
+class TestRecordStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'records.sqlite')
+        self.clock = FakeClock()
+        self.store = RecordStore(self.path, ttl=60, max_entries=2, touch_after=1, clock=self.clock)
+        self.auth = Auth(config_object)
+        self.calls = []
+
+        @urlmatch(netloc=r'(.*\.)?worldcat\.org$')
+        def worldcat_mock(url, request):
+            self.calls.append(url.path)
+            if '/libraries/' in url.path:
+                return fixture('worldcatholdings.xml')
+            return fixture('resourceXml.xml')
+
+        self.mock = worldcat_mock
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_records_expire(self):
+        self.store.put('isbn', '1', b'<a/>')
+        self.assertEqual(b'<a/>', self.store.get('isbn', '1'))
+        self.clock.now += 61
+        self.assertIsNone(self.store.get('isbn', '1'))
+
+    def test_least_recently_read_is_evicted(self):
+        self.store.put('isbn', '1', b'<a/>')
+        self.clock.now += 1
+        self.store.put('isbn', '2', b'<b/>')
+        self.clock.now += 1
+        self.store.get('isbn', '1')
+        self.store.put('isbn', '3', b'<c/>')
+        self.assertEqual(['2'], self.store.missing('isbn', ['1', '2', '3']))
+
+    def test_size_bound_keeps_running_totals(self):
+        store = RecordStore(os.path.join(self.directory, 'sized.sqlite'), max_bytes=10, clock=self.clock)
+        for identifier in '1234':
+            self.clock.now += 1
+            store.put('isbn', identifier, b'<abcd/>')
+        store.put('isbn', '4', b'<ab/>')
+        store.delete('isbn', '3')
+        self.assertEqual(['1', '2', '3'], store.missing('isbn', ['1', '2', '3', '4']))
+        self.assertEqual(1, len(store))
+        self.assertEqual((1, 5), store.db.connection().execute('SELECT entries, bytes FROM stats').fetchone())
+
+    def test_reads_only_write_once_touch_after_has_passed(self):
+        self.store.put('isbn', '1', b'<a/>')
+        accessed = 'SELECT accessed FROM records'
+        self.clock.now += 0.5
+        self.store.get('isbn', '1')
+        self.assertEqual(1000.0, self.store.db.connection().execute(accessed).fetchone()[0])
+        self.clock.now += 0.5
+        self.store.get('isbn', '1')
+        self.assertEqual(1001.0, self.store.db.connection().execute(accessed).fetchone()[0])
+
+    def test_store_from_before_running_totals_is_upgraded(self):
+        path = os.path.join(self.directory, 'old.sqlite')
+        conn = sqlite3.connect(path)
+        conn.execute('CREATE TABLE records (kind TEXT, identifier TEXT, body BLOB, '
+                     'stored REAL, accessed REAL, PRIMARY KEY (kind, identifier))')
+        conn.executemany('INSERT INTO records VALUES (?, ?, ?, ?, ?)',
+                         [('isbn', '1', b'<a/>', 1000.0, 1000.0), ('isbn', '2', b'<bb/>', 1000.0, 1001.0)])
+        conn.commit()
+        conn.close()
+
+        store = RecordStore(path, max_bytes=6, clock=self.clock)
+        self.assertEqual(2, len(store))
+        self.clock.now += 10
+        store.put('isbn', '3', b'<c/>')
+        self.assertEqual(['1', '2'], store.missing('isbn', ['1', '2', '3']))
+
+    def test_records_survive_a_new_store(self):
+        with HTTMock(self.mock):
+            self.store.get_resource(self.auth, isbn='9780195325959')
+            record = RecordStore(self.path, clock=self.clock).get_resource(self.auth, oclc_number='320842055')
+        self.assertEqual('Beethoven', record.title)
+        self.assertEqual(1, len(self.calls))
+
+    def test_warm_only_fetches_what_is_missing(self):
+        with HTTMock(self.mock):
+            self.assertTrue(self.store.check_holdings(self.auth, '320842055', 'WFS'))
+            fetched = self.store.warm(self.auth, ['320842055', '1234'], kind='oclc', oclc_symbol='WFS')
+        self.assertEqual(1, fetched)
+        self.assertEqual(2, len(self.calls))
+
+
+if __name__ == '__main__':
+    unittest.main()
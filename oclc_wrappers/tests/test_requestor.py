@@ -1,9 +1,13 @@
 import os
 import unittest
 
-from httmock import HTTMock, urlmatch
+from httmock import HTTMock, all_requests, response, urlmatch
 
+from oclc_wrappers.acquisitions import po_request
 from oclc_wrappers.auth import Auth
+from oclc_wrappers.cache import ResponseCache
+from oclc_wrappers.constants import WORLDCAT_RESOURCE_URLS
+from oclc_wrappers.requestor import Transport, WSKeyLiteRequest, close_default_transport, get_default_transport
 from oclc_wrappers.tests.configTest import config_object
 
 # TODO: Implement
@@ -13,5 +17,72 @@ def oclc_mock(url, request):
     with open(path, 'rb') as data:
         return data.read()
 
+
+@urlmatch(netloc=r'(.*\.)?worldcat\.org$')
+def resource_mock(url, request):
+    path = os.path.join(os.path.dirname(__file__), 'resourceXml.xml')
+    with open(path, 'rb') as data:
+        return data.read()
+
+
+class TestTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.auth = Auth(config_object)
+
+    def test_requestors_share_the_default_transport(self):
+        first = WSKeyLiteRequest(self.auth, WORLDCAT_RESOURCE_URLS)
+        second = WSKeyLiteRequest(self.auth, WORLDCAT_RESOURCE_URLS)
+        self.assertIs(first.transport, second.transport)
+        self.assertIs(get_default_transport(), first.transport)
+
+    def test_requests_go_through_the_given_transport(self):
+        with Transport(pool_maxsize=2) as transport:
+            requestor = WSKeyLiteRequest(self.auth, WORLDCAT_RESOURCE_URLS, transport=transport)
+            with HTTMock(resource_mock):
+                r = requestor.send_request('isbn', url_params={'number': '9780195325959'})
+        self.assertEqual(200, r.status_code)
+        self.assertTrue(transport.closed)
+
+    def test_closing_a_requestor_leaves_the_default_transport_open(self):
+        other = WSKeyLiteRequest(self.auth, WORLDCAT_RESOURCE_URLS)
+        with WSKeyLiteRequest(self.auth, WORLDCAT_RESOURCE_URLS) as requestor:
+            self.assertIs(other.transport, requestor.transport)
+        self.assertFalse(other.transport.closed)
+        self.assertIs(other.transport, get_default_transport())
+
+    def test_closing_a_requestor_closes_the_transport_it_was_given(self):
+        with WSKeyLiteRequest(self.auth, WORLDCAT_RESOURCE_URLS, transport=Transport()) as requestor:
+            pass
+        self.assertTrue(requestor.transport.closed)
+
+    def test_closed_default_transport_is_replaced(self):
+        transport = get_default_transport()
+        close_default_transport()
+        self.assertTrue(transport.closed)
+        self.assertIsNot(transport, get_default_transport())
+
+
+class TestConditionalRequests(unittest.TestCase):
+
+    def test_not_modified_is_served_from_the_held_response(self):
+        sent = []
+
+        @all_requests
+        def po_mock(url, request):
+            sent.append(request.headers.get('If-None-Match'))
+            if request.headers.get('If-None-Match') == '"v1"':
+                return response(304, b'', headers={'ETag': '"v1"'}, request=request)
+            return response(200, b'{"purchaseOrderNumber": "PO-1"}', headers={'ETag': '"v1"'}, request=request)
+
+        requestor = po_request(Auth(config_object), conditional_cache=ResponseCache(ttl=None))
+        with HTTMock(po_mock):
+            first = requestor.send_request('read', url_params={'order': 'PO-1'})
+            second = requestor.send_request('read', url_params={'order': 'PO-1'})
+        self.assertEqual([None, '"v1"'], sent)
+        self.assertEqual(200, second.status_code)
+        self.assertEqual(first.json(), second.json())
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+from httmock import HTTMock, all_requests, response
+
+from oclc_wrappers.acquisitions import item_request, po_request
+from oclc_wrappers.auth import Auth
+from oclc_wrappers.retry import RetryPolicy, parse_retry_after
+from oclc_wrappers.tests.configTest import config_object
+
+
+def flaky_mock(failures, status_code=503, headers=None):
+    calls = []
+
+    @all_requests
+    def mock(url, request):
+        calls.append(request)
+        if len(calls) <= failures:
+            return response(status_code, b'', headers=headers, request=request)
+        return response(200, b'{}', request=request)
+
+    return mock, calls
+
+
+class TestRetryPolicy(unittest.TestCase):
+
+    def setUp(self):
+        self.auth = Auth(config_object)
+        self.waits = []
+        self.policy = RetryPolicy(max_attempts=3, sleep=self.waits.append)
+
+    def test_get_is_retried_until_it_succeeds(self):
+        mock, calls = flaky_mock(2)
+        with HTTMock(mock):
+            r = po_request(self.auth, retry_policy=self.policy).send_request('read', url_params={'order': 'PO-1'})
+        self.assertEqual(200, r.status_code)
+        self.assertEqual(3, len(calls))
+        self.assertEqual([503, 503, 200], [attempt.status_code for attempt in self.policy.history])
+        self.assertEqual(2, self.policy.retries)
+
+    def test_gives_up_after_max_attempts(self):
+        mock, calls = flaky_mock(5)
+        with HTTMock(mock):
+            r = po_request(self.auth, retry_policy=self.policy).send_request('read', url_params={'order': 'PO-1'})
+        self.assertEqual(503, r.status_code)
+        self.assertEqual(3, len(calls))
+        self.assertEqual(1, self.policy.giveups)
+
+    def test_post_is_not_replayed_on_server_error(self):
+        mock, calls = flaky_mock(1)
+        with HTTMock(mock):
+            r = item_request(self.auth, retry_policy=self.policy).send_request(
+                'create', url_params={'order': 'PO-1'}, data={})
+        self.assertEqual(503, r.status_code)
+        self.assertEqual(1, len(calls))
+
+    def test_post_is_retried_when_throttled_honoring_retry_after(self):
+        mock, calls = flaky_mock(1, status_code=429, headers={'Retry-After': '7'})
+        with HTTMock(mock):
+            r = item_request(self.auth, retry_policy=self.policy).send_request(
+                'create', url_params={'order': 'PO-1'}, data={})
+        self.assertEqual(200, r.status_code)
+        self.assertEqual([7], self.waits)
+
+    def test_parse_retry_after(self):
+        class Response(object):
+            headers = {'Retry-After': 'Wed, 21 Oct 2015 07:28:00 GMT'}
+        self.assertEqual(0, parse_retry_after(Response()))
+        self.assertIsNone(parse_retry_after(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+
+from oclc_wrappers.acquisitions import Item, PurchaseOrder
+from oclc_wrappers.auth import Auth
+from oclc_wrappers.oclc_exceptions import ValidationError
+from oclc_wrappers.tests.configTest import config_object
+from oclc_wrappers.validation import item_problems, po_problems, split_items, validate_item
+
+
+def good_item(auth):
+    item = Item(auth, orderingPrice=25.5)
+    item.oclc_number = '12345'
+    item.first_copy_branch = 128807
+    item.first_copy_shelving = 'MAIN-STACKS'
+    item.first_percentage = 100
+    return item
+
+
+class TestItemValidation(unittest.TestCase):
+
+    def setUp(self):
+        self.auth = Auth(config_object)
+
+    def test_complete_item_passes(self):
+        self.assertEqual([], item_problems(good_item(self.auth)))
+        validate_item(good_item(self.auth))
+
+    def test_missing_and_mistyped_fields_are_all_reported(self):
+        item = good_item(self.auth)
+        item.oclc_number = None
+        item.price = '25.50'
+        item.first_copy_shelving = ''
+        fields = [field for field, _ in item_problems(item)]
+        self.assertEqual(['resource.worldcatResource.oclcNumber', 'orderingPrice',
+                          'copyConfigs.copyConfig[0].shelvingLocationId'], fields)
+
+    def test_booking_percentages_must_add_up_to_100(self):
+        item = good_item(self.auth)
+        item.first_percentage = 60.1
+        item.first_copy['booking'].append({'budgetAccountCode': 'BOOKS', 'percentage': 39.9})
+        self.assertEqual([], item_problems(item))
+        item.first_copy['booking'][1]['percentage'] = 30
+        with self.assertRaises(ValidationError) as raised:
+            validate_item(item)
+        self.assertIn('90.1', str(raised.exception))
+
+    def test_structure_must_match_the_template(self):
+        item = good_item(self.auth)
+        item['copyConfigs'] = {'copyConfig': {'branchId': 1}}
+        self.assertEqual([('copyConfigs.copyConfig', 'expected an array')], item_problems(item))
+
+    def test_bulk_split_keeps_indexes(self):
+        items = [good_item(self.auth), Item(self.auth), good_item(self.auth)]
+        valid, invalid = split_items(items)
+        self.assertEqual([0, 2], [index for index, _ in valid])
+        self.assertEqual(1, invalid[0][0])
+        self.assertIsInstance(invalid[0][2], ValidationError)
+
+    def test_purchase_order(self):
+        po = PurchaseOrder(self.auth)
+        self.assertEqual(['orderName', 'vendor.vendorId'], [field for field, _ in po_problems(po)])
+        po.name = 'Firm orders'
+        po.vendor_id = 'V-1'
+        self.assertEqual([], po_problems(po))
+
+
+if __name__ == '__main__':
+    unittest.main()
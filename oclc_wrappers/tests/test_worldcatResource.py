@@ -1,7 +1,12 @@
+import io
 import os
-from unittest import TestCase
+import pickle
+from unittest import TestCase, skipIf
 
-from oclc_wrappers.worldcat import WorldcatResource, WorldcatHoldings
+from oclc_wrappers.codec import JSONCodec
+from oclc_wrappers.worldcat import (RecordSummary, WorldcatResource, WorldcatHoldings, iter_summaries, read_binary,
+                                    read_jsonl, summarize, write_binary, write_jsonl)
+from oclc_wrappers.xmlbackend import ElementTreeBackend, LxmlBackend, lxml_etree
 
 
 class TestWorldcatResource(TestCase):
@@ -33,6 +38,132 @@ class TestWorldcatResource(TestCase):
     def test_authors(self):
         self.assertEqual('William Kinderman', self.record.authors)
 
+    def test_isbn(self):
+        self.assertEqual('0198043953', self.record.isbn)
+        self.assertEqual(['0198043953'], self.record.isbn_10s)
+
+    def test_fields_by_tag(self):
+        self.assertEqual(6, len(self.record.fields('020')))
+        self.assertEqual('636522330', self.record.subfield('019', 'a'))
+        self.assertIsNone(self.record.subfield('245', 'z'))
+        self.assertIsNone(self.record.field('999'))
+
+    def test_missing_field_raises_attribute_error(self):
+        record = WorldcatResource('1234key', b'<record xmlns="http://www.loc.gov/MARC21/slim">'
+                                             b'<controlfield tag="008">x</controlfield></record>')
+        self.assertEqual('', record.isbn)
+        with self.assertRaises(AttributeError):
+            record.oclc_number
+
+
+class TestWorldcatResourceWithElementTree(TestWorldcatResource):
+
+    def setUp(self):
+        self.default_backend = WorldcatResource.backend
+        WorldcatResource.backend = ElementTreeBackend()
+        super(TestWorldcatResourceWithElementTree, self).setUp()
+
+    def tearDown(self):
+        WorldcatResource.backend = self.default_backend
+
+    def test_find(self):
+        self.assertEqual('eng', self.record.find('subfield[@code="b"]', self.record.field('040')).text)
+        self.assertEqual('320842055', self.record.find('controlfield[@tag="001"]').text)
+
+
+@skipIf(lxml_etree is None, 'lxml is not installed')
+class TestWorldcatResourceWithLxml(TestWorldcatResourceWithElementTree):
+
+    def setUp(self):
+        self.default_backend = WorldcatResource.backend
+        WorldcatResource.backend = LxmlBackend()
+        super(TestWorldcatResourceWithElementTree, self).setUp()
+
+    def test_same_summary_as_element_tree(self):
+        filepath = os.path.join(os.path.dirname(__file__), 'resourceXml.xml')
+        with open(filepath, 'rb') as f:
+            record = f.read()
+        WorldcatResource.backend = ElementTreeBackend()
+        expected = WorldcatResource('1234key', record).summary()
+        self.assertEqual(expected, self.record.summary())
+
+
+class TestRecordSummary(TestCase):
+
+    def setUp(self):
+        filepath = os.path.join(os.path.dirname(__file__), 'resourceXml.xml')
+        with open(filepath, 'rb') as f:
+            self.summary = WorldcatResource('1234key', f.read()).summary()
+        self.sparse = WorldcatResource('1234key', b'<record xmlns="http://www.loc.gov/MARC21/slim">'
+                                                  b'<controlfield tag="001">1</controlfield></record>').summary()
+
+    def test_summary_fields(self):
+        self.assertEqual(RecordSummary('320842055', ('9780198043959', '0198043953'), 'Beethoven',
+                                       'William Kinderman', 'Oxford University Press', '2009',
+                                       '090512s2009    enkafg  ob    001 0deng d', 'eng'), self.summary)
+        self.assertEqual(RecordSummary('1', (), None, None, None, None, None, None), self.sparse)
+
+    def test_record_without_a_publisher_field_has_no_publication_date(self):
+        summary = WorldcatResource('1234key', b'<record xmlns="http://www.loc.gov/MARC21/slim">'
+                                              b'<controlfield tag="001">2</controlfield>'
+                                              b'<datafield tag="245"><subfield code="a">Fidelio /</subfield></datafield>'
+                                              b'</record>').summary()
+        self.assertEqual(('Fidelio', None, None), (summary.title, summary.publisher, summary.publication_date))
+        f = io.BytesIO()
+        write_jsonl([summary], f)
+        self.assertIn(b'"publication_date":null', f.getvalue())
+
+    def test_summaries_are_immutable(self):
+        with self.assertRaises(AttributeError):
+            self.summary.title = 'Mozart'
+        with self.assertRaises(AttributeError):
+            self.summary.extra = 1
+
+    def test_json_lines_round_trip(self):
+        for codec in (None, JSONCodec()):
+            f = io.BytesIO()
+            self.assertEqual(2, write_jsonl([self.summary, self.sparse], f, codec=codec))
+            self.assertEqual(2, f.getvalue().count(b'\n'))
+            f.seek(0)
+            self.assertEqual([self.summary, self.sparse], list(read_jsonl(f, codec=codec)))
+
+    def test_binary_round_trip(self):
+        f = io.BytesIO()
+        self.assertEqual(3, write_binary([self.summary, self.sparse, self.summary], f, chunk_size=2))
+        f.seek(0)
+        self.assertEqual([self.summary, self.sparse, self.summary], list(read_binary(f)))
+        self.assertEqual(self.summary, pickle.loads(pickle.dumps(self.summary)))
+
+
+class TestSummarize(TestCase):
+
+    def setUp(self):
+        filepath = os.path.join(os.path.dirname(__file__), 'resourceXml.xml')
+        with open(filepath, 'rb') as f:
+            record = f.read()
+        self.payloads = [record.replace(b'>320842055<', '>{}<'.format(n).encode('ascii')) for n in range(7)]
+        self.payloads[3] = b'<not xml'
+
+    def test_records_parsed_across_processes_stay_in_order(self):
+        summaries = summarize(self.payloads, max_workers=2, chunk_size=2)
+        self.assertEqual(['0', '1', '2', None, '4', '5', '6'],
+                         [summary and summary.oclc_number for summary in summaries])
+        self.assertEqual('Beethoven', summaries[0].title)
+
+    def test_payloads_that_are_not_marc_records_give_none(self):
+        diagnostic = (b'<searchRetrieveResponse xmlns="http://www.loc.gov/zing/srw/"><numberOfRecords>0'
+                      b'</numberOfRecords><diagnostics><diagnostic xmlns="http://www.loc.gov/zing/srw/diagnostic/">'
+                      b'<uri>info:srw/diagnostic/1/10</uri><message>Query syntax error</message></diagnostic>'
+                      b'</diagnostics></searchRetrieveResponse>')
+        payloads = [None, b'', diagnostic, self.payloads[0]]
+        for max_workers in (1, 2):
+            summaries = summarize(payloads, max_workers=max_workers)
+            self.assertEqual([None, None, None, '0'], [summary and summary.oclc_number for summary in summaries])
+
+    def test_single_worker_parses_in_process(self):
+        summaries = iter_summaries(iter(self.payloads), max_workers=1, chunk_size=3)
+        self.assertEqual(summarize(self.payloads, max_workers=2), list(summaries))
+
 
 class TestWorldcatHoldings(TestCase):
 
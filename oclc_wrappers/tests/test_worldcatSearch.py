@@ -0,0 +1,100 @@
+import os
+import unittest
+
+from httmock import HTTMock, urlmatch
+from six.moves.urllib.parse import parse_qs
+
+from oclc_wrappers.auth import Auth
+from oclc_wrappers.tests.configTest import config_object
+from oclc_wrappers.worldcat import WorldcatResource, search_opensearch, search_sru
+
+
+def marc_record():
+    filepath = os.path.join(os.path.dirname(__file__), 'resourceXml.xml')
+    with open(filepath, 'rb') as f:
+        record = f.read()
+    return record[record.index(b'<record'):]
+
+
+def sru_page(start, count, total):
+    records = b''.join(b'<record><recordSchema>info:srw/schema/1/marcxml</recordSchema><recordData>' +
+                       marc_record().replace(b'>320842055<', '>{}<'.format(n).encode('ascii')) +
+                       b'</recordData><recordPosition>{}</recordPosition></record>'.replace(b'{}', str(n).encode())
+                       for n in range(start, min(start + count, total + 1)))
+    return (b'<?xml version="1.0" encoding="UTF-8"?><searchRetrieveResponse xmlns="http://www.loc.gov/zing/srw/">'
+            b'<version>1.1</version><numberOfRecords>' + str(total).encode() + b'</numberOfRecords><records>' +
+            records + b'</records></searchRetrieveResponse>')
+
+
+ATOM_PAGE = b'''<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom" xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/"
+      xmlns:oclcterms="http://purl.org/oclc/terms/" xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <title>OCLC Worldcat Search: beethoven</title>
+  <opensearch:totalResults>2</opensearch:totalResults>
+  <opensearch:startIndex>1</opensearch:startIndex>
+  <opensearch:itemsPerPage>10</opensearch:itemsPerPage>
+  <entry>
+    <author><name>Kinderman, William.</name></author>
+    <title>Beethoven</title>
+    <link href="http://worldcat.org/oclc/320842055"/>
+    <id>http://worldcat.org/oclc/320842055</id>
+    <summary>A study of the composer.</summary>
+    <dc:identifier>urn:ISBN:9780198043959</dc:identifier>
+    <dc:identifier>urn:ISBN:0198043953</dc:identifier>
+    <oclcterms:recordIdentifier>320842055</oclcterms:recordIdentifier>
+  </entry>
+  <entry>
+    <title>Beethoven's symphonies</title>
+    <oclcterms:recordIdentifier>12345</oclcterms:recordIdentifier>
+  </entry>
+</feed>'''
+
+
+class TestSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.auth = Auth(config_object)
+        self.requests = []
+
+        @urlmatch(netloc=r'www\.worldcat\.org$', path=r'.*/search/sru$')
+        def sru_mock(url, request):
+            query = parse_qs(url.query)
+            self.requests.append(query)
+            return sru_page(int(query['startRecord'][0]), int(query['maximumRecords'][0]), 25)
+
+        @urlmatch(netloc=r'www\.worldcat\.org$', path=r'.*/search/opensearch$')
+        def opensearch_mock(url, request):
+            self.requests.append(parse_qs(url.query))
+            return ATOM_PAGE
+
+        self.mocks = (sru_mock, opensearch_mock)
+
+    def test_sru_pages_through_every_record_in_order(self):
+        with HTTMock(*self.mocks):
+            records = list(search_sru(self.auth, 'srw.ti all "beethoven"', page_size=10))
+        self.assertEqual([str(n) for n in range(1, 26)], [record.oclc_number for record in records])
+        self.assertIsInstance(records[0], WorldcatResource)
+        self.assertEqual('Beethoven', records[-1].title)
+        self.assertEqual(['1', '11', '21'], [query['startRecord'][0] for query in self.requests])
+        self.assertEqual(['srw.ti all "beethoven"'], self.requests[0]['query'])
+
+    def test_sru_stops_at_max_records(self):
+        with HTTMock(*self.mocks):
+            records = list(search_sru(self.auth, 'srw.ti all "beethoven"', page_size=10, max_records=12,
+                                      prefetch=False))
+        self.assertEqual(12, len(records))
+        self.assertEqual(2, len(self.requests))
+
+    def test_opensearch_yields_brief_entries(self):
+        with HTTMock(*self.mocks):
+            entries = list(search_opensearch(self.auth, 'beethoven'))
+        self.assertEqual(['320842055', '12345'], [entry.oclc_number for entry in entries])
+        self.assertEqual(['Kinderman, William.'], entries[0].authors)
+        self.assertEqual(['9780198043959', '0198043953'], entries[0].isbns)
+        self.assertEqual('http://worldcat.org/oclc/320842055', entries[0].link)
+        self.assertEqual([], entries[1].authors)
+        self.assertEqual(['1'], self.requests[0]['start'])
+
+
+if __name__ == '__main__':
+    unittest.main()
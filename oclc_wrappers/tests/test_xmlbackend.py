@@ -0,0 +1,57 @@
+# coding: utf-8
+import io
+import os
+import shutil
+import tempfile
+from unittest import TestCase, skipIf
+
+from oclc_wrappers.xmlbackend import ElementTreeBackend, LxmlBackend, lxml_etree
+
+EXTERNAL_ENTITY = u'''<?xml version="1.0"?>
+<!DOCTYPE record [<!ENTITY secret SYSTEM "file://{path}">]>
+<record><title>&secret;</title></record>'''
+
+
+class TestElementTreeBackend(TestCase):
+
+    backend = ElementTreeBackend()
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, 'secret.txt')
+        with open(path, 'w') as f:
+            f.write('top secret')
+        self.document = EXTERNAL_ENTITY.format(path=path)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def assertNotResolved(self, parse):
+        try:
+            title = parse().find('title')
+        except self.backend.ParseError:
+            return
+        self.assertNotIn('top secret', title.text or '')
+
+    def test_external_entities_are_not_resolved(self):
+        self.assertNotResolved(lambda: self.backend.fromstring(self.document))
+        self.assertNotResolved(lambda: self.backend.fromstring(self.document.encode('utf-8')))
+
+    def test_external_entities_are_not_resolved_while_streaming(self):
+        def parse():
+            for _, element in self.backend.iterparse(io.BytesIO(self.document.encode('utf-8'))):
+                if element.tag == 'record':
+                    return element
+        self.assertNotResolved(parse)
+
+    def test_text_and_bytes_parse_alike(self):
+        document = u'<?xml version="1.0" encoding="ISO-8859-1"?><record><title>Für Elise</title></record>'
+        self.assertEqual(u'Für Elise', self.backend.fromstring(document).find('title').text)
+        self.assertEqual(u'Für Elise',
+                         self.backend.fromstring(document.encode('latin-1')).find('title').text)
+
+
+@skipIf(lxml_etree is None, 'lxml is not installed')
+class TestLxmlBackend(TestElementTreeBackend):
+
+    backend = LxmlBackend() if lxml_etree is not None else None
@@ -0,0 +1,49 @@
+from unittest import TestCase, skipIf
+
+from oclc_wrappers.constants import NS
+from oclc_wrappers.xmlbackend import ElementTreeBackend, LxmlBackend, lxml_etree
+from oclc_wrappers.xmlobject import XMLObject
+
+CLASSIFY = b'''<?xml version="1.0" encoding="UTF-8"?>
+<classify xmlns="http://classify.oclc.org">
+  <response code="4"/>
+  <works><work hyr="2009" owi="1">Beethoven</work><work hyr="1995" owi="2">Beethoven's Symphonies</work></works>
+</classify>'''
+
+
+class Classify(XMLObject):
+
+    def ns(self, elem):
+        return NS['classify']
+
+
+class TestXMLObjectWithElementTree(TestCase):
+
+    backend = ElementTreeBackend()
+
+    def setUp(self):
+        self.default_backend = XMLObject.backend
+        XMLObject.backend = self.backend
+        self.doc = Classify('classify', CLASSIFY)
+
+    def tearDown(self):
+        XMLObject.backend = self.default_backend
+
+    def test_find(self):
+        self.assertEqual('4', self.doc.find_one('response').get('code'))
+        self.assertEqual(['Beethoven', "Beethoven's Symphonies"], [work.text for work in self.doc.find_all('work')])
+        self.assertTrue(self.doc.more_than_one('work'))
+        self.assertFalse(self.doc.element_exists('editions'))
+
+    def test_build(self):
+        doc = Classify('classify')
+        works = doc.get_or_make_elem('works', doc.root)
+        doc.make_subelem('work', works).text = 'Beethoven'
+        self.assertIs(works, doc.get_or_make_elem('works', doc.root))
+        self.assertEqual('Beethoven', doc.find_one('work').text)
+
+
+@skipIf(lxml_etree is None, 'lxml is not installed')
+class TestXMLObjectWithLxml(TestXMLObjectWithElementTree):
+
+    backend = LxmlBackend() if lxml_etree is not None else None
@@ -0,0 +1,152 @@
+from decimal import Decimal, InvalidOperation
+from numbers import Number
+
+import six
+
+from .constants import ITEM_TEMPLATE, PO_TEMPLATE
+from .oclc_exceptions import ValidationError
+
+TEXT = six.string_types
+ID = six.string_types + six.integer_types
+NUMBER = Number
+
+# Fields WMS rejects an item or order without, as (path, allowed types).
+# Copy and booking fields are checked on every copy and booking.
+ITEM_REQUIRED = [
+    (('resource', 'worldcatResource', 'oclcNumber'), ID),
+    (('orderType',), TEXT),
+    (('orderingPrice',), NUMBER),
+]
+COPY_REQUIRED = [
+    (('branchId',), ID),
+    (('shelvingLocationId',), ID),
+]
+BOOKING_REQUIRED = [
+    (('percentage',), NUMBER),
+]
+PO_REQUIRED = [
+    (('orderName',), TEXT),
+    (('vendor', 'vendorId'), ID),
+]
+
+HUNDRED = Decimal(100)
+
+
+def item_problems(item):
+    """
+    Everything that would get an item rejected by WMS, checked locally.
+
+    :param item: An Item or an item dict
+    :return: A list of (field, message) pairs, empty for a valid item
+    """
+    data = getattr(item, '_data', item)
+    problems = []
+    _check_shape(ITEM_TEMPLATE, data, '', problems)
+    if problems:
+        return problems
+    _check_required(ITEM_REQUIRED, data, '', problems)
+    copies = (data.get('copyConfigs') or {}).get('copyConfig') or []
+    if not copies:
+        problems.append(('copyConfigs.copyConfig', 'at least one copy is required'))
+    for c, copy_config in enumerate(copies):
+        prefix = 'copyConfigs.copyConfig[{}].'.format(c)
+        _check_required(COPY_REQUIRED, copy_config, prefix, problems)
+        bookings = copy_config.get('booking') or []
+        if not bookings:
+            problems.append((prefix + 'booking', 'at least one fund booking is required'))
+            continue
+        before = len(problems)
+        for b, booking in enumerate(bookings):
+            _check_required(BOOKING_REQUIRED, booking, '{}booking[{}].'.format(prefix, b), problems)
+        if len(problems) > before:
+            continue
+        total = sum((_decimal(booking['percentage']) for booking in bookings), Decimal(0))
+        if total != HUNDRED:
+            problems.append((prefix + 'booking', 'percentages add up to {}, not 100'.format(total)))
+    return problems
+
+
+def po_problems(po):
+    """
+    Everything that would get a purchase order rejected by WMS, checked locally.
+
+    :param po: A PurchaseOrder or a purchase order dict
+    :return: A list of (field, message) pairs, empty for a valid order
+    """
+    data = getattr(po, '_data', po)
+    problems = []
+    _check_shape(PO_TEMPLATE, data, '', problems)
+    if not problems:
+        _check_required(PO_REQUIRED, data, '', problems)
+    return problems
+
+
+def validate_item(item):
+    """Raise a ValidationError listing every problem with an item."""
+    problems = item_problems(item)
+    if problems:
+        raise ValidationError(problems)
+
+
+def validate_purchase_order(po):
+    """Raise a ValidationError listing every problem with a purchase order."""
+    problems = po_problems(po)
+    if problems:
+        raise ValidationError(problems)
+
+
+def split_items(items):
+    """
+    Sort a batch of items into the ones worth sending and the rejects.
+
+    :param items: An iterable of Item objects or item dicts
+    :return: (valid, invalid) where valid holds (index, item) pairs and
+        invalid (index, item, ValidationError) triples
+    """
+    valid = []
+    invalid = []
+    for index, item in enumerate(items):
+        problems = item_problems(item)
+        if problems:
+            invalid.append((index, item, ValidationError(problems)))
+        else:
+            valid.append((index, item))
+    return valid, invalid
+
+
+def _check_shape(template, data, prefix, problems):
+    """Objects and arrays in the template must stay objects and arrays (or null) in the data."""
+    if not isinstance(data, dict):
+        problems.append((prefix.rstrip('.') or '(root)', 'expected an object'))
+        return
+    for key, default in template.items():
+        value = data.get(key)
+        if value is None or not isinstance(default, (dict, list)):
+            continue
+        field = prefix + key
+        if isinstance(default, dict):
+            _check_shape(default, value, field + '.', problems)
+        elif not isinstance(value, list):
+            problems.append((field, 'expected an array'))
+        elif default and isinstance(default[0], dict):
+            for i, element in enumerate(value):
+                _check_shape(default[0], element, '{}[{}].'.format(field, i), problems)
+
+
+def _check_required(required, data, prefix, problems):
+    for path, types in required:
+        value = data
+        for key in path:
+            value = value.get(key) if isinstance(value, dict) else None
+        field = prefix + '.'.join(path)
+        if value is None or value == '':
+            problems.append((field, 'is required'))
+        elif isinstance(value, bool) or not isinstance(value, types):
+            problems.append((field, 'has the wrong type ({})'.format(type(value).__name__)))
+
+
+def _decimal(value):
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        return Decimal(0)
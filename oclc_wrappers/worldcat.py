@@ -1,129 +1,375 @@
-import xml.etree.ElementTree as ET
+import io
+import itertools
+import multiprocessing
+import pickle
 import re
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 
+from .codec import default_codec
 from .constants import WORLDCAT_RESOURCE_URLS, WORLDCAT_LIBRARY_URLS
+from .paging import prefetching
 from .requestor import WSKeyLiteRequest
+from .xmlbackend import default_backend
+
+
+MARC_NS = '{http://www.loc.gov/MARC21/slim}'
+MARC_NAMESPACES = {'marc': 'http://www.loc.gov/MARC21/slim'}
+FIELD_TAGS = (MARC_NS + 'controlfield', MARC_NS + 'datafield')
+
+SRU_NS = '{http://www.loc.gov/zing/srw/}'
+ATOM_NS = '{http://www.w3.org/2005/Atom}'
+OPENSEARCH_NS = '{http://a9.com/-/spec/opensearch/1.1/}'
+OCLCTERMS_NS = '{http://purl.org/oclc/terms/}'
+DC_NS = '{http://purl.org/dc/elements/1.1/}'
+
+# Largest page the WorldCat Search API serves for either kind of search
+SEARCH_PAGE_SIZE = 100
+# Records handed to a worker process at a time by iter_summaries
+PARSE_CHUNK_SIZE = 250
+
+DIGITS = re.compile(r'\d+')
+ISBN_10 = re.compile(r'^\d{10}$')
 
 
 class WorldcatResource(object):
+    """
+    A MARCXML record from the WorldCat Search API.
+
+    Every control and data field is indexed by tag once, when the record is
+    parsed, so each property is a dict lookup rather than a search of the
+    whole tree. New properties should read fields through field(), fields()
+    and subfield().
+
+    Records are parsed by WorldcatResource.backend (see xmlbackend.py), lxml
+    when it is installed and ElementTree otherwise.
+    """
+
+    backend = default_backend()
 
     def __init__(self, key, xml_response):
+        self._load(key, self.backend.fromstring(xml_response))
+
+    @classmethod
+    def from_element(cls, key, record):
+        """Wrap a MARCXML record element that is already parsed, e.g. one out of a search response."""
+        resource = cls.__new__(cls)
+        resource._load(key, record)
+        return resource
+
+    def _load(self, key, root):
         self.key = key
-        self.root = ET.fromstring(xml_response)
-        self.ns = '{http://www.loc.gov/MARC21/slim}'
+        self.root = root
+        self.ns = MARC_NS
+        self.tags = index_fields(self.root, self.backend)
         self.publisher_field = self.set_publisher_field()
-        self.title_statement = self.find('datafield[@tag="245"]')
+        self.title_statement = self.field('245')
 
     @property
     def oclc_number(self):
         try:
-            return self.find('controlfield[@tag="001"]').text
+            return self.field('001').text
         except AttributeError:
-            field = self.find('datafield[@tag="019"]')
-            return self.find('subfield[@code="a"]', parent=field).text
+            return find_subfield(self.field('019'), 'a').text
 
     @property
     def cataloging_language(self):
-        forty_field = self.find('datafield[@tag="040"]')
-        lan = self.find('subfield[@code="b"]', parent=forty_field)
-        return lan.text
+        return find_subfield(self.field('040'), 'b').text
 
     @property
     def control_field_008(self):
-        return self.find('controlfield[@tag="008"]').text
+        return self.field('008').text
 
     @property
     def publisher(self):
         if self.publisher_field is None:
-            self.publisher_field = self.find('datafield[@tag="264"]')
-        publisher = self.find('subfield[@code="b"]',
-                              parent=self.publisher_field)
+            self.publisher_field = self.field('264')
+        publisher = find_subfield(self.publisher_field, 'b')
         return publisher.text.strip()[:-1]  # remove ISBD comma at end of field
 
     @property
     def publication_date(self):
-        date_regex = re.compile('\d+')
-        pub_date = self.find('subfield[@code="c"]',
-                             parent=self.publisher_field)
+        pub_date = find_subfield(self.publisher_field, 'c')
         try:
-            text = re.search(date_regex, pub_date.text).group().strip()
-        except AttributeError:
+            text = DIGITS.search(pub_date.text).group().strip()
+        except (AttributeError, TypeError):
             text = ''
         return text
 
     @property
     def title(self):
-        sub_a = self.find('subfield[@code="a"]',
-                          parent=self.title_statement).text
+        sub_a = find_subfield(self.title_statement, 'a').text
         try:
-            sub_b = self.find('subfield[@code="b"]', self.title_statement).text
+            sub_b = find_subfield(self.title_statement, 'b').text
         except AttributeError:
             sub_b = ''
         return '{a}{b}'.format(a=sub_a, b=sub_b)[:-2]  # remove ISBD / from end
 
     @property
     def authors(self):
-        authors = self.find('subfield[@code="c"]',
-                            parent=self.title_statement).text
+        authors = find_subfield(self.title_statement, 'c').text
         return authors[:-1]  # remove ISBD period from end
 
     @property
     def isbn(self):
-        isbn_10_regex = re.compile('^\d{10}$')
-        isbn_fields = self.root.findall('.//{ns}{elem}'.format(ns=self.ns, elem='datafield[@tag="020"]'))
-        for isbn in isbn_fields:
-            try:
-                return re.search(isbn_10_regex,
-                                 self.find('subfield[@code="a"]',
-                                           parent=isbn).text
-                                 ).group().strip()
-            except AttributeError:
-                pass
-        else:
-            return ''
+        isbns = self._isbn_10s()
+        return isbns[0] if isbns else ''
 
     @property
     def isbn_10s(self):
-        isbn_10_regex = re.compile('^\d{10}$')
-        isbn_fields = self.root.findall('.//{ns}{elem}'.format(ns=self.ns, elem='datafield[@tag="020"]'))
+        return self._isbn_10s() or ''
+
+    @property
+    def isbns(self):
+        """Every ISBN in a 020 $a, 10 and 13 digit, without qualifiers like (pbk.)."""
         isbns = []
-        for isbn in isbn_fields:
-            try:
-                isbns.append(re.search(isbn_10_regex,
-                                       self.find('subfield[@code="a"]',
-                                                 parent=isbn).text
-                                       ).group().strip())
-            except AttributeError:
-                pass
-        if isbns:
-            return isbns
-        else:
-            return ''
+        for field in self.fields('020'):
+            subfield = find_subfield(field, 'a')
+            if subfield is not None and subfield.text and subfield.text.split():
+                isbns.append(subfield.text.split()[0])
+        return isbns
 
     @property
     def id_code(self):
         return self.isbn
 
+    def summary(self):
+        """A RecordSummary of this record, which doesn't keep the parsed tree alive."""
+        return RecordSummary.from_resource(self)
+
+    def field(self, tag):
+        """The first control or data field with this tag, or None."""
+        fields = self.tags.get(tag)
+        return fields[0] if fields else None
+
+    def fields(self, tag):
+        """Every control or data field with this tag, in record order."""
+        return self.tags.get(tag, [])
+
+    def subfield(self, tag, code):
+        """The text of the first subfield with this code in the first field with this tag, or None."""
+        subfield = find_subfield(self.field(tag), code)
+        return subfield.text if subfield is not None else None
+
     def find(self, elem, parent=None):
-        try:
-            return parent.find('./{ns}{elem}'.format(ns=self.ns, elem=elem))
-        except AttributeError:
-            return self.root.find('.//{ns}{elem}'.format(ns=self.ns, elem=elem))
+        if parent is not None:
+            return self.backend.find(parent, './marc:' + elem, MARC_NAMESPACES)
+        return self.backend.find(self.root, './/marc:' + elem, MARC_NAMESPACES)
 
     def check_for_holdings(self, oclc_symbol):
         return check_holdings_by_oclc_number(self.key, self.oclc_number, oclc_symbol)
 
     def set_publisher_field(self):
-        pf = self.find('datafield[@tag="260"]')
+        pf = self.field('260')
         if pf is None:
-            pf = self.find('datafield[@tag="264"]')
+            pf = self.field('264')
         return pf
 
+    def _isbn_10s(self):
+        isbns = []
+        for field in self.fields('020'):
+            subfield = find_subfield(field, 'a')
+            match = ISBN_10.search(subfield.text or '') if subfield is not None else None
+            if match is not None:
+                isbns.append(match.group().strip())
+        return isbns
+
+
+class RecordSummary(namedtuple('RecordSummary', 'oclc_number isbns title authors publisher publication_date '
+                                                 'control_field_008 cataloging_language')):
+    """
+    The fields of a WorldcatResource most jobs need, as an immutable tuple
+    of strings, a fraction of the size of the record's tree. Fields the
+    record doesn't have are None.
+
+    Write many with write_jsonl or write_binary, and read them back with
+    read_jsonl or read_binary.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_resource(cls, resource):
+        return cls(*[_field_or_none(resource, name) for name in cls._fields])
+
+
+def _field_or_none(resource, name):
+    try:
+        value = getattr(resource, name)
+    except (AttributeError, TypeError):
+        return None
+    if name == 'isbns':
+        return tuple(value)
+    # publication_date is '' rather than missing without a 260 or 264 field
+    return value if value != '' else None
+
+
+def write_jsonl(summaries, f, codec=None):
+    """
+    Write summaries to a file opened in binary mode, one JSON object per line.
+
+    :return: The number of summaries written
+    """
+    codec = codec if codec is not None else default_codec()
+    count = 0
+    for summary in summaries:
+        f.write(codec.encode(summary._asdict()) + b'\n')
+        count += 1
+    return count
+
+
+def read_jsonl(f, codec=None):
+    """Yield the summaries in a JSON lines file opened in binary mode."""
+    codec = codec if codec is not None else default_codec()
+    fields = RecordSummary._fields
+    for line in f:
+        if line.strip():
+            data = codec.decode(line)
+            data['isbns'] = tuple(data['isbns'] or ())
+            yield RecordSummary(*[data.get(name) for name in fields])
+
+
+def write_binary(summaries, f, chunk_size=10000):
+    """
+    Write summaries to a file opened in binary mode as a series of pickled
+    chunks, the fastest format to reload. Only read back files you wrote.
+
+    :return: The number of summaries written
+    """
+    count = 0
+    chunk = []
+    for summary in summaries:
+        chunk.append(tuple(summary))
+        if len(chunk) >= chunk_size:
+            pickle.dump(chunk, f, pickle.HIGHEST_PROTOCOL)
+            count += len(chunk)
+            chunk = []
+    if chunk:
+        pickle.dump(chunk, f, pickle.HIGHEST_PROTOCOL)
+        count += len(chunk)
+    return count
+
+
+def read_binary(f):
+    """Yield the summaries in a file written by write_binary."""
+    make = RecordSummary._make
+    while True:
+        try:
+            chunk = pickle.load(f)
+        except EOFError:
+            return
+        for fields in chunk:
+            yield make(fields)
+
+
+def summarize(payloads, max_workers=None, chunk_size=PARSE_CHUNK_SIZE):
+    """
+    Parse raw MARCXML records across a pool of processes, see iter_summaries.
+
+    :return: A list with a RecordSummary (or None) per payload, in order
+    """
+    return list(iter_summaries(payloads, max_workers=max_workers, chunk_size=chunk_size))
+
+
+def iter_summaries(payloads, max_workers=None, chunk_size=PARSE_CHUNK_SIZE):
+    """
+    Yield a RecordSummary for each raw MARCXML record, parsing them in
+    chunks across a pool of worker processes so every core is used.
+    Payloads that aren't a MARC record (None or empty, unparseable, or a
+    document without a 001 field such as an SRU diagnostic) give None
+    instead, keeping the results in step with the input.
+
+    Payloads are read lazily and only a couple of chunks per worker are in
+    flight at once, so any number of records can be streamed through.
+
+    :param payloads: An iterable of XML bodies, e.g. response contents or
+        values from a RecordStore
+    :param max_workers: Number of worker processes, defaults to the number
+        of CPUs. With 1, records are parsed in this process.
+    :param chunk_size: Records sent to a worker at a time; bigger chunks
+        cost less in inter-process overhead
+    """
+    chunks = _chunked(payloads, chunk_size)
+    if max_workers is None:
+        max_workers = multiprocessing.cpu_count()
+    if max_workers == 1:
+        for chunk in chunks:
+            for summary in _summarize_chunk(chunk):
+                yield summary
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(_summarize_chunk, chunk))
+            if len(in_flight) > 2 * max_workers:
+                for summary in in_flight.popleft().result():
+                    yield summary
+        while in_flight:
+            for summary in in_flight.popleft().result():
+                yield summary
+
+
+def _summarize_chunk(payloads):
+    return [_summarize(payload) for payload in payloads]
+
+
+def _summarize(payload):
+    # Missing, e.g. a RecordStore miss
+    if not payload:
+        return None
+    try:
+        resource = WorldcatResource(None, payload)
+    except WorldcatResource.backend.ParseError:
+        return None
+    # Well-formed but not a MARC record, e.g. an SRU diagnostic
+    if resource.field('001') is None:
+        return None
+    return resource.summary()
+
+
+def _chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def index_fields(root, backend=None):
+    """Map each MARC tag to its control or data fields, in one pass over the record."""
+    if backend is None:
+        backend = WorldcatResource.backend
+    record = root if root.tag == MARC_NS + 'record' else backend.find(root, './/marc:record', MARC_NAMESPACES)
+    if record is not None:
+        fields = backend.children(record, FIELD_TAGS)
+    else:
+        fields = [field for field in root.iter() if field.tag in FIELD_TAGS]
+    index = {}
+    for field in fields:
+        tag = field.get('tag')
+        try:
+            index[tag].append(field)
+        except KeyError:
+            index[tag] = [field]
+    return index
+
+
+def find_subfield(field, code):
+    """A field's first subfield with this code, or None."""
+    if field is None:
+        return None
+    for subfield in field:
+        if subfield.get('code') == code:
+            return subfield
+    return None
+
 
 class WorldcatHoldings(object):
 
     def __init__(self, xml_response):
-        self.root = ET.fromstring(xml_response)
+        self.root = WorldcatResource.backend.fromstring(xml_response)
 
     @property
     def has_holdings(self):
@@ -135,41 +381,187 @@ class WorldcatHoldings(object):
         return are_there_holdings
 
 
-def worldcat_request(auth):
-    return WSKeyLiteRequest(auth, WORLDCAT_RESOURCE_URLS)
+class OpenSearchEntry(object):
+    """
+    One hit of an OpenSearch search: the brief description WorldCat sends
+    in its Atom feed rather than a full record. Fetch the record itself
+    with get_resource_by_oclc_number if more is needed.
+    """
+
+    __slots__ = ('oclc_number', 'title', 'authors', 'isbns', 'summary', 'link')
+
+    def __init__(self, oclc_number=None, title=None, authors=(), isbns=(), summary=None, link=None):
+        self.oclc_number = oclc_number
+        self.title = title
+        self.authors = list(authors)
+        self.isbns = list(isbns)
+        self.summary = summary
+        self.link = link
+
+    @classmethod
+    def from_element(cls, entry):
+        """Read an Atom entry element."""
+        link = entry.find(ATOM_NS + 'link')
+        return cls(oclc_number=entry.findtext(OCLCTERMS_NS + 'recordIdentifier'),
+                   title=entry.findtext(ATOM_NS + 'title'),
+                   authors=[name.text for name in entry.iterfind('{ns}author/{ns}name'.format(ns=ATOM_NS))],
+                   isbns=[identifier.text[len('urn:ISBN:'):] for identifier in entry.iterfind(DC_NS + 'identifier')
+                          if identifier.text and identifier.text.startswith('urn:ISBN:')],
+                   summary=entry.findtext(ATOM_NS + 'summary'),
+                   link=link.get('href') if link is not None else None)
 
+    def __repr__(self):
+        return '<OpenSearchEntry {} {!r}>'.format(self.oclc_number, self.title)
 
-def worldcat_library_request(auth):
-    return WSKeyLiteRequest(auth, WORLDCAT_LIBRARY_URLS)
 
+def worldcat_request(auth, **kwargs):
+    return WSKeyLiteRequest(auth, WORLDCAT_RESOURCE_URLS, **kwargs)
 
-def get_resource_by_isbn(auth, isbn, query_params=None):
+
+def worldcat_library_request(auth, **kwargs):
+    return WSKeyLiteRequest(auth, WORLDCAT_LIBRARY_URLS, **kwargs)
+
+
+def get_resource_by_isbn(auth, isbn, query_params=None, **kwargs):
     if query_params is None:
         query_params = {}
     query_params.update({'servicelevel': 'full'})
     url_params = {'number': isbn}
-    requestor = worldcat_request(auth)
+    requestor = worldcat_request(auth, **kwargs)
     r = requestor.send_request('isbn', url_params=url_params, query_params=query_params)
     return WorldcatResource(auth, r.content)
 
 
-def check_holdings_by_oclc_number(auth, oclc_number, oclc_symbol, query_params=None):
+def get_resource_by_oclc_number(auth, oclc_number, query_params=None, **kwargs):
+    if query_params is None:
+        query_params = {}
+    query_params.update({'servicelevel': 'full'})
+    url_params = {'number': oclc_number}
+    requestor = worldcat_request(auth, **kwargs)
+    r = requestor.send_request('oclc_number', url_params=url_params, query_params=query_params)
+    return WorldcatResource(auth, r.content)
+
+
+def check_holdings_by_oclc_number(auth, oclc_number, oclc_symbol, query_params=None, **kwargs):
     if query_params is None:
         query_params = {}
     query_params.update({'servicelevel': 'full', 'oclcsymbol': oclc_symbol})
     url_params = {'number': oclc_number}
-    requestor = worldcat_library_request(auth)
+    requestor = worldcat_library_request(auth, **kwargs)
     r = requestor.send_request('oclc', url_params=url_params, query_params=query_params)
     holdings = WorldcatHoldings(r.content)
     return holdings.has_holdings
 
 
-def check_holdings_by_isbn(auth, isbn, oclc_symbol, query_params=None):
+def check_holdings_by_isbn(auth, isbn, oclc_symbol, query_params=None, **kwargs):
     if query_params is None:
         query_params = {}
     query_params.update({'servicelevel': 'full', 'oclcsymbol': oclc_symbol})
     url_params = {'number': isbn}
-    requestor = worldcat_library_request(auth)
+    requestor = worldcat_library_request(auth, **kwargs)
     r = requestor.send_request('isbn', url_params=url_params, query_params=query_params)
     holdings = WorldcatHoldings(r.content)
     return holdings.has_holdings
+
+
+def search_sru(auth, query, page_size=SEARCH_PAGE_SIZE, max_records=None, prefetch=True, query_params=None,
+               **kwargs):
+    """
+    Yield a WorldcatResource for every record matching an SRU (CQL) query,
+    e.g. 'srw.ti all "beethoven" and srw.au all "kinderman"'.
+
+    Results are requested page by page with startRecord/maximumRecords and
+    each page is parsed incrementally, dropping every record once it has
+    been handed over, so memory stays bounded however many records match.
+
+    :param query: A CQL query
+    :param page_size: Records requested per page, at most SEARCH_PAGE_SIZE
+    :param max_records: Stop after this many records, None for all of them
+    :param prefetch: Request the next page while the current one is read
+    """
+    params = {'query': query, 'recordSchema': 'info:srw/schema/1/marcxml', 'servicelevel': 'full'}
+    params.update(query_params or {})
+    pages = _search_pages(auth, 'sru', params, 'startRecord', 'maximumRecords', SRU_NS + 'numberOfRecords',
+                          page_size, max_records, **kwargs)
+    return _limited(_records(pages, SRU_NS + 'record', _marc_record(auth), prefetch), max_records)
+
+
+def search_opensearch(auth, query, page_size=SEARCH_PAGE_SIZE, max_records=None, prefetch=True,
+                      query_params=None, **kwargs):
+    """
+    Yield an OpenSearchEntry for every hit of an OpenSearch keyword query,
+    paging and parsing incrementally like search_sru.
+
+    :param query: Keywords, as typed into WorldCat's search box
+    :param page_size: Entries requested per page, at most SEARCH_PAGE_SIZE
+    :param max_records: Stop after this many entries, None for all of them
+    :param prefetch: Request the next page while the current one is read
+    """
+    params = {'q': query, 'format': 'atom', 'servicelevel': 'full'}
+    params.update(query_params or {})
+    pages = _search_pages(auth, 'opensearch', params, 'start', 'count', OPENSEARCH_NS + 'totalResults',
+                          page_size, max_records, **kwargs)
+    return _limited(_records(pages, ATOM_NS + 'entry', OpenSearchEntry.from_element, prefetch), max_records)
+
+
+def _search_pages(auth, action, params, start_param, count_param, total_tag, page_size, max_records, **kwargs):
+    """Yield the raw body of every page of a search, reading the total from the first."""
+    requestor = worldcat_request(auth, **kwargs)
+    page_size = min(page_size, SEARCH_PAGE_SIZE)
+    start = 1
+    total = None
+    while total is None or start <= total:
+        query_params = dict(params)
+        query_params.update({start_param: start, count_param: page_size})
+        content = requestor.send_request(action, query_params=query_params).content
+        if total is None:
+            total = _total_results(content, total_tag)
+            if max_records is not None:
+                total = min(total, max_records)
+        yield content
+        start += page_size
+
+
+def _total_results(content, total_tag):
+    """Read the hit count from the head of a search response without parsing the records."""
+    for _, element in WorldcatResource.backend.iterparse(io.BytesIO(content)):
+        if element.tag == total_tag:
+            return int(element.text or 0)
+    return 0
+
+
+def _records(pages, record_tag, wrap, prefetch):
+    """
+    Parse each page incrementally, yielding wrap(element) for every record
+    element and clearing it from the tree once it has been handed over.
+    """
+    if prefetch:
+        pages = prefetching(pages)
+    for content in pages:
+        open_elements = []
+        for event, element in WorldcatResource.backend.iterparse(io.BytesIO(content), events=('start', 'end')):
+            if event == 'start':
+                open_elements.append(element)
+                continue
+            open_elements.pop()
+            if element.tag == record_tag:
+                record = wrap(element)
+                if record is not None:
+                    yield record
+                element.clear()
+                if open_elements:
+                    open_elements[-1].remove(element)
+
+
+def _marc_record(auth):
+    def wrap(element):
+        for child in element.iter(MARC_NS + 'record'):
+            return WorldcatResource.from_element(auth, child)
+    return wrap
+
+
+def _limited(records, max_records):
+    for count, record in enumerate(records):
+        if max_records is not None and count >= max_records:
+            return
+        yield record
@@ -0,0 +1,104 @@
+import threading
+import xml.etree.ElementTree as ET
+
+import six
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+
+class ElementTreeBackend(object):
+    """
+    Parse and query XML with the standard library's ElementTree.
+
+    Queries are ElementPath expressions with namespace prefixes, e.g.
+    './m:datafield[@tag="245"]', the subset of XPath both backends run.
+    """
+
+    name = 'ElementTree'
+    ParseError = ET.ParseError
+
+    def fromstring(self, data):
+        if six.PY2 and isinstance(data, six.text_type):
+            # Python 2's ElementTree encodes text as ASCII, so give it UTF-8 and ignore the encoding declaration
+            return ET.fromstring(data.encode('utf-8'), ET.XMLParser(encoding='utf-8'))
+        return ET.fromstring(data)
+
+    def iterparse(self, source, events=('end',)):
+        return ET.iterparse(source, events=events)
+
+    def Element(self, tag):
+        return ET.Element(tag)
+
+    def SubElement(self, parent, tag):
+        return ET.SubElement(parent, tag)
+
+    def children(self, node, tags):
+        """The children of node whose tag is one of tags, in document order."""
+        return [child for child in node if child.tag in tags]
+
+    def findall(self, node, path, namespaces=None):
+        return node.findall(path, namespaces)
+
+    def find(self, node, path, namespaces=None):
+        return node.find(path, namespaces)
+
+
+class LxmlBackend(object):
+    """
+    Parse and query XML with lxml, whose parser is faster than
+    ElementTree's. Needs pip install lxml.
+
+    Like ElementTree, it never resolves entities or fetches anything from
+    the network while parsing, whatever lxml's own defaults are. find and
+    findall run through lxml's own ElementPath, which caches each compiled
+    path.
+    """
+
+    name = 'lxml'
+    # What every parser is made with, responses come from remote services
+    PARSER_OPTIONS = {'resolve_entities': False, 'no_network': True}
+
+    def __init__(self):
+        self.ParseError = lxml_etree.XMLSyntaxError
+        self._parsers = threading.local()
+
+    def fromstring(self, data):
+        if isinstance(data, six.text_type):
+            # Text has already been decoded, so its encoding declaration must be ignored, as ElementTree does
+            return lxml_etree.fromstring(data.encode('utf-8'), self._parser('text', encoding='utf-8'))
+        return lxml_etree.fromstring(data, self._parser('bytes'))
+
+    def iterparse(self, source, events=('end',)):
+        return lxml_etree.iterparse(source, events=events, **self.PARSER_OPTIONS)
+
+    def Element(self, tag):
+        return lxml_etree.Element(tag)
+
+    def SubElement(self, parent, tag):
+        return lxml_etree.SubElement(parent, tag)
+
+    def children(self, node, tags):
+        return list(node.iterchildren(*tags))
+
+    def findall(self, node, path, namespaces=None):
+        return node.findall(path, namespaces)
+
+    def find(self, node, path, namespaces=None):
+        return node.find(path, namespaces)
+
+    def _parser(self, kind, **options):
+        # lxml parsers mustn't be shared between threads, so each thread gets its own
+        parser = getattr(self._parsers, kind, None)
+        if parser is None:
+            options.update(self.PARSER_OPTIONS)
+            parser = lxml_etree.XMLParser(**options)
+            setattr(self._parsers, kind, parser)
+        return parser
+
+
+def default_backend():
+    """The fastest XML backend installed."""
+    return LxmlBackend() if lxml_etree is not None else ElementTreeBackend()
@@ -1,26 +1,29 @@
-import xml.etree.ElementTree as ET
-from .constants import NS
+from .xmlbackend import default_backend
 
 
 class XMLObject(object):
+    """
+    Base for objects backed by an XML document. Documents are parsed and
+    queried by XMLObject.backend (see xmlbackend.py), lxml when it is
+    installed and ElementTree otherwise. Lookups are ElementPath
+    expressions either way.
+    """
+
+    backend = default_backend()
 
     def __init__(self, root_name, data=None):
-        try:
-            self.root = ET.fromstring(data)
-        except TypeError:
-            self.root = ET.Element(self.add_namespace(root_name))
+        if data is None:
+            self.root = self.backend.Element(self.add_namespace(root_name))
+        else:
+            self.root = self.backend.fromstring(data)
 
     def find_one(self, elem, node=None):
-        try:
-            return node.find(self._xpath(elem), NS)
-        except AttributeError:
-            return self.root.find(self._xpath(elem), NS)
+        return self.backend.find(node if node is not None else self.root, self._xpath(elem),
+                                 self._namespaces(elem))
 
     def find_all(self, elem, node=None):
-        try:
-            return node.findall(self._xpath(elem), NS)
-        except AttributeError:
-            return self.root.findall(self._xpath(elem), NS)
+        return self.backend.findall(node if node is not None else self.root, self._xpath(elem),
+                                    self._namespaces(elem))
 
     def more_than_one(self, elem):
         return len(list(self.find_all(elem))) > 1
@@ -43,7 +46,7 @@ class XMLObject(object):
             return el
 
     def make_subelem(self, elem, parent):
-        return ET.SubElement(parent, self.add_namespace(elem))
+        return self.backend.SubElement(parent, self.add_namespace(elem))
 
     def get_by_elem(self, elem, parent, comparison):
         for el in parent:
@@ -59,7 +62,10 @@ class XMLObject(object):
             return name
 
     def _xpath(self, elem):
-        return './/{ns_elem}'.format(ns_elem=self.add_namespace(elem))
+        return './/x:{elem}'.format(elem=elem)
+
+    def _namespaces(self, elem):
+        return {'x': self.ns(elem)}
 
     def ns(self, elem):
         raise NotImplementedError
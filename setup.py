@@ -8,6 +8,12 @@ setuptools.setup(
     description="Wrappers around OCLC APIs",
     url="https://github.com/pybrarian/oclc_wrappers",
     packages=setuptools.find_packages(),
+    extras_require={
+        'async': ['aiohttp'],
+        'json': ['orjson'],
+        'analytics': ['numpy', 'pyarrow'],
+        'xml': ['lxml'],
+    },
     classifiers=(
         "Programming Language :: Python :: 3",
         "Programming Language :: Python :: 2",